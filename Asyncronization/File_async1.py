@@ -1,6 +1,8 @@
 import asyncio  # Import asyncio for event loop and coroutines.
 import aiofiles  # Import aiofiles for asynchronous file operations.
 
+from line_counter import LineCounter  # Streaming byte-level line counter.
+
 async def read_file(filename):
     # Define an async function to read a single file.
     try:
@@ -18,6 +20,21 @@ async def read_file(filename):
         return f"{filename} not found."
         # Return an error message.
 
+async def count_files(filenames, counter):
+    # Same summaries as read_file, for many files at once: raw bytes,
+    # fixed size reads, no decoding, on the bounded pool of LineCounter.
+    counts = await counter.acount_many(filenames)
+    # Run the counting on the thread pool and await all results.
+    results = []
+    for filename, lines in counts.items():
+        if isinstance(lines, FileNotFoundError):
+            results.append(f"{filename} not found.")
+        elif isinstance(lines, OSError):
+            results.append(f"{filename}: {lines.strerror}")
+        else:
+            results.append(f"{filename} has {lines} lines.")
+    return results
+
 async def main():
     # Define the main async function.
     files = ['async1.py','async.md']
@@ -33,6 +50,11 @@ async def main():
         print(result)
         # Print each file's summary.
 
+    with LineCounter(workers=4) as counter:
+        # A bounded pool of 4 threads (see line_counter.py).
+        for result in await count_files(files, counter):
+            print(result)
+
 if __name__ == "__main__":
     # Run guard.
     asyncio.run(main())
@@ -1,9 +1,11 @@
 import asyncio  # Import the asyncio module for async operations.
 import aiohttp  # Import aiohttp for asynchronous HTTP requests.
 
-async def fetch_weather(session, city, api_key):
+from weather_client import UpstreamError, WeatherClient  # Cached, coalesced client layer.
+
+async def fetch_weather(session, city, api_key, base_url="http://api.openweathermap.org"):
     # Define an async function to fetch weather for a single city.
-    url = f"http://api.openweathermap.org/data/2.5/weather?q={city}&appid={api_key}"
+    url = f"{base_url}/data/2.5/weather?q={city}&appid={api_key}"
     # Construct the API URL with the city and API key.
     async with session.get(url) as response:
         # Use async with to make a non-blocking GET request.
@@ -18,6 +20,15 @@ async def fetch_weather(session, city, api_key):
             return f"{city}: Error {response.status}"
             # Return an error message.
 
+async def fetch_weather_cached(client, city):
+    # Same result as fetch_weather, but through WeatherClient (weather_client.py):
+    # duplicate cities share one call, answers are cached, calls are limited and retried.
+    try:
+        data = await client.get(city)
+    except UpstreamError as e:
+        return f"{city}: Error {e.status}"
+    return f"{city}: {data['weather'][0]['description']}"
+
 async def main():
     # Define the main async function to orchestrate the tasks.
     api_key = "your_openweathermap_api_key_here"  # Replace with your actual API key.
@@ -27,7 +38,9 @@ async def main():
     
     async with aiohttp.ClientSession() as session:
         # Create an async HTTP session for reusing connections.
-        tasks = [fetch_weather(session, city, api_key) for city in cities]
+        client = WeatherClient(session, api_key, ttl=600, max_concurrency=10)
+        # One client for all requests: cache, single-flight, limit and retry.
+        tasks = [fetch_weather_cached(client, city) for city in cities]
         # Create a list of coroutine tasks, one for each city.
         results = await asyncio.gather(*tasks)
         # Await gather to run all tasks concurrently and collect results.
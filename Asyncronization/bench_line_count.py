@@ -0,0 +1,90 @@
+# Benchmark: read_file (aiofiles + splitlines) vs LineCounter
+# run from this folder:  python bench_line_count.py [n_small_files] [big_file_gib] [n_big_files]
+#
+# Makes n small files (4-64 KiB) and a few big files in a temp folder,
+# then counts their lines with every method.  Every method runs in its
+# own child process, so "max rss" is the peak memory of that method only.
+# The files are read once before timing, so all runs see a warm page cache.
+# The mapped file pages count as rss for "mmap"; they are page cache, not
+# memory of the process.  For multi-GB files:  python bench_line_count.py 5000 4 2
+# (read_file is skipped on files over 1 GiB).
+import asyncio
+import os
+import random
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+from File_async1 import read_file
+from line_counter import LineCounter
+
+LINE = b"2026-01-01 12:00:00,123 - app - INFO - user logged in from 10.0.0.1\n"
+
+
+def make_files(folder, n_small, big_gib, n_big):
+    rng = random.Random(1)
+    small, big = [], []
+    for i in range(n_small):
+        path = os.path.join(folder, f"small_{i}.log")
+        with open(path, "wb") as f:
+            f.write(LINE * (rng.randint(4 * 1024, 64 * 1024) // len(LINE)))
+        small.append(path)
+    block = LINE * (16 * 1024 * 1024 // len(LINE))
+    for i in range(n_big):
+        path = os.path.join(folder, f"big_{i}.log")
+        with open(path, "wb") as f:
+            for _ in range(int(big_gib * 1024 ** 3) // len(block)):
+                f.write(block)
+        big.append(path)
+    return small, big
+
+
+def run_case(method, paths):
+    start = time.perf_counter()
+    if method == "read_file":
+        async def main():
+            return await asyncio.gather(*(read_file(p) for p in paths))
+        asyncio.run(main())
+    else:
+        with LineCounter(workers=8, use_mmap=(method == "mmap")) as counter:
+            if method == "async":
+                asyncio.run(counter.acount_many(paths))
+            else:
+                counter.count_many(paths)
+    elapsed = time.perf_counter() - start
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"{elapsed:.3f} {rss:.0f}")
+
+
+def child(method, paths):
+    out = subprocess.run([sys.executable, __file__, "--case", method, *paths],
+                         capture_output=True, text=True, check=True).stdout.split()
+    return float(out[0]), float(out[1])
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["--case"]:
+        run_case(sys.argv[2], sys.argv[3:])
+        sys.exit()
+
+    n_small = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    big_gib = float(sys.argv[2]) if len(sys.argv) > 2 else 1.0
+    n_big = int(sys.argv[3]) if len(sys.argv) > 3 else 2
+    folder = tempfile.mkdtemp(prefix="linecount-")
+    try:
+        small, big = make_files(folder, n_small, big_gib, n_big)
+        for name, paths in ((f"{n_small} small files", small), (f"{n_big} x {big_gib} GiB", big)):
+            subprocess.run(["cat", *paths], stdout=subprocess.DEVNULL)  # warm the page cache
+            mib = sum(os.path.getsize(p) for p in paths) / 2**20
+            print(f"{name} ({mib:.0f} MiB)")
+            for method in ("read_file", "read", "mmap", "async"):
+                if method == "read_file" and paths is big and big_gib > 1:
+                    print(f"  {method:<10} skipped (needs several times the file size in RAM)")
+                    continue
+                elapsed, rss = child(method, paths)
+                print(f"  {method:<10} {elapsed:7.2f} s  {mib / elapsed:8.0f} MiB/s  max rss {rss:6.0f} MiB")
+    finally:
+        shutil.rmtree(folder)
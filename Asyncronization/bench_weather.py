@@ -0,0 +1,79 @@
+# Benchmark: plain asyncio.gather (api_async.py) vs WeatherClient
+# run from this folder:  python bench_weather.py [n_requests] [n_cities]
+#
+# 10k requests over 100 cities against weather_stub.py (20 ms per call,
+# 5% of calls answer 503).  Requests come in 10 waves, 0.2 s apart, and
+# the client cache has ttl=0.5 s, so later waves see fresh hits, stale
+# hits with background refreshes, and coalesced misses.
+import asyncio
+import random
+import sys
+import time
+
+import aiohttp
+
+from api_async import fetch_weather
+from weather_client import WeatherClient
+from weather_stub import start_weather_stub
+
+WAVES = 10
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(int(len(values) * q), len(values) - 1)]
+
+
+async def timed(coro, latencies):
+    start = time.perf_counter()
+    try:
+        return await coro
+    except Exception as e:
+        return e
+    finally:
+        latencies.append(time.perf_counter() - start)
+
+
+async def run(name, make_call, requests, stub):
+    before = stub.calls
+    latencies = []
+    results = []
+    start = time.perf_counter()
+    wave = len(requests) // WAVES
+    for i in range(WAVES):
+        batch = requests[i * wave:(i + 1) * wave]
+        tasks = [asyncio.ensure_future(timed(make_call(city), latencies)) for city in batch]
+        await asyncio.sleep(0.2)
+        results.extend(await asyncio.gather(*tasks))
+    elapsed = time.perf_counter() - start
+    errors = sum(1 for r in results if isinstance(r, Exception) or "Error" in str(r))
+    print(f"{name:<14} upstream calls {stub.calls - before:>6}  errors {errors:>5}  "
+          f"p50 {percentile(latencies, 0.5) * 1000:7.1f} ms  "
+          f"p99 {percentile(latencies, 0.99) * 1000:7.1f} ms  total {elapsed:5.2f} s")
+
+
+async def main(n, n_cities):
+    rng = random.Random(1)
+    cities = [f"city{i}" for i in range(n_cities)]
+    # a few popular cities, many rare ones
+    requests = rng.choices(cities, weights=[1 / (i + 1) for i in range(n_cities)], k=n)
+    stub = await start_weather_stub(delay=0.02, fail_rate=0.05)
+    base = stub.url.rsplit("/data/", 1)[0]
+    async with aiohttp.ClientSession() as session:
+        def plain(city):
+            # fetch_weather() builds the openweathermap URL, point it at the stub
+            return fetch_weather(session, city, "key", base_url=base)
+        await run("gather", plain, requests, stub)
+
+        client = WeatherClient(session, "key", base_url=stub.url, ttl=0.5, stale_ttl=5,
+                               max_concurrency=20, retries=3, backoff=0.02)
+        await run("WeatherClient", client.get, requests, stub)
+        print("cache:", client.cache.stats)
+        print("client:", client.stats)
+    await stub.close()
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    n_cities = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    asyncio.run(main(n, n_cities))
@@ -0,0 +1,84 @@
+# Load test for web_async.py: 1 worker vs N workers, with and without cache
+# run from this folder:  python bench_web.py [workers] [seconds] [concurrency]
+#
+# Starts "python web_async.py --workers W --delay 0.01 [--cache-ttl 1]"
+# for every setup, sends GET /user<k> (k out of 100 names) from
+# `concurrency` parallel connections for `seconds`, then stops the server
+# with SIGTERM (graceful shutdown).  The load generator runs on this
+# machine too, so it competes with the server for the CPUs.
+import asyncio
+import os
+import random
+import signal
+import socket
+import subprocess
+import sys
+import time
+
+import aiohttp
+
+PORT = 8099
+NAMES = [f"user{i}" for i in range(100)]
+
+
+def wait_for_port(port, timeout=15.0):
+    end = time.monotonic() + timeout
+    while time.monotonic() < end:
+        try:
+            socket.create_connection(("localhost", port), timeout=0.5).close()
+            return
+        except OSError:
+            time.sleep(0.05)
+    raise RuntimeError(f"server on port {port} did not start")
+
+
+async def load(seconds, concurrency):
+    latencies = []
+    errors = 0
+    rng = random.Random(1)
+    end = time.perf_counter() + seconds
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        async def client():
+            nonlocal errors
+            while time.perf_counter() < end:
+                start = time.perf_counter()
+                try:
+                    async with session.get(f"http://localhost:{PORT}/{rng.choice(NAMES)}") as r:
+                        await r.read()
+                        if r.status != 200:
+                            errors += 1
+                except aiohttp.ClientError:
+                    errors += 1
+                latencies.append(time.perf_counter() - start)
+        await asyncio.gather(*(client() for _ in range(concurrency)))
+    return latencies, errors
+
+
+def run(workers, cache_ttl, seconds, concurrency):
+    cmd = [sys.executable, "web_async.py", "--workers", str(workers), "--port", str(PORT),
+           "--delay", "0.01", "--cache-ttl", str(cache_ttl)]
+    server = subprocess.Popen(cmd, stdout=subprocess.DEVNULL)
+    try:
+        wait_for_port(PORT)
+        time.sleep(0.5 * workers)  # let every worker bind the port
+        latencies, errors = asyncio.run(load(seconds, concurrency))
+    finally:
+        server.send_signal(signal.SIGTERM)
+        server.wait(30)
+    latencies.sort()
+    p50 = latencies[len(latencies) // 2] * 1000
+    p99 = latencies[int(len(latencies) * 0.99)] * 1000
+    name = f"{workers} worker(s), {'cache' if cache_ttl else 'no cache'}"
+    print(f"{name:<24} {len(latencies) / seconds:8.0f} req/s  p50 {p50:6.1f} ms  "
+          f"p99 {p99:6.1f} ms  errors {errors}")
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else (os.cpu_count() or 1)
+    seconds = float(sys.argv[2]) if len(sys.argv) > 2 else 5.0
+    concurrency = int(sys.argv[3]) if len(sys.argv) > 3 else 64
+    print(f"{os.cpu_count()} CPUs, {concurrency} connections, {seconds:.0f} s per run")
+    for workers in sorted({1, n}):
+        for cache_ttl in (0, 1):
+            run(workers, cache_ttl, seconds, concurrency)
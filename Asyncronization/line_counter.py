@@ -0,0 +1,163 @@
+# Counting lines (or any byte pattern) in many files
+#
+# read_file() in File_async1.py reads the whole file into one str and
+# calls splitlines() to count the lines: memory grows with the file, the
+# bytes are decoded for nothing, and every aiofiles call is a hop to a
+# thread.  Here:
+#  - files are read as raw bytes into one reused buffer per thread
+#    (readinto, fixed chunk size), or scanned through mmap; newlines are
+#    counted with bytes.count (memchr speed), nothing is decoded
+#  - many files run on a bounded thread pool; small files are handed to
+#    the pool in batches, so a thousand tiny files are not a thousand
+#    thread hops
+#  - the async functions run the same code on the pool through
+#    loop.run_in_executor, for event-loop callers
+#
+#   counter = LineCounter(workers=8)
+#   counter.count_many(paths)              # {path: lines}
+#   await counter.acount_many(paths)       # same, from async code
+#   count_occurrences("app.log", b"ERROR") # any byte string
+#
+# Line count = number of b"\n", plus one when the file does not end with
+# one (same as splitlines() for "\n" files; "\r" alone is not a newline).
+import asyncio
+import mmap
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+CHUNK_SIZE = 1024 * 1024
+SMALL_FILE = 256 * 1024  # files below this go to the pool in batches
+_local = threading.local()
+
+
+def _buffer(size):
+    buf = getattr(_local, "buffer", None)
+    if buf is None or len(buf) != size:
+        buf = _local.buffer = bytearray(size)
+    return buf
+
+
+def count_occurrences(path, needle=b"\n", chunk_size=CHUNK_SIZE, use_mmap=False):
+    """How often `needle` (bytes) occurs in the file; returns (count, last_byte)."""
+    if not needle:
+        raise ValueError("needle must not be empty")
+    keep = len(needle) - 1  # bytes carried over so a match can cross chunks
+    count = 0
+    last = b""
+    with open(path, "rb", buffering=0) as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return 0, b""
+        if use_mmap:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                if hasattr(mm, "madvise"):
+                    mm.madvise(mmap.MADV_SEQUENTIAL)
+                for start in range(0, size, chunk_size):
+                    # the slice copies one chunk, the page cache is read directly
+                    count += mm[max(start - keep, 0):start + chunk_size].count(needle)
+                return count, mm[size - 1:size]
+        if hasattr(os, "posix_fadvise") and size > chunk_size:
+            os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        buf = _buffer(chunk_size)
+        view = memoryview(buf)
+        tail = b""
+        while True:
+            n = f.readinto(buf)
+            if not n:
+                break
+            if n == chunk_size and not keep:
+                count += buf.count(needle)
+            else:
+                data = tail + view[:n] if keep else view[:n].tobytes()
+                count += data.count(needle)
+            if keep:
+                tail = view[max(n - keep, 0):n].tobytes()
+            last = bytes(view[n - 1:n])
+    return count, last
+
+
+def count_lines(path, chunk_size=CHUNK_SIZE, use_mmap=False):
+    newlines, last = count_occurrences(path, b"\n", chunk_size, use_mmap)
+    return newlines + (1 if last and last != b"\n" else 0)
+
+
+def _count_batch(paths, needle, chunk_size, use_mmap, lines):
+    results = []
+    for path in paths:
+        try:
+            if lines:
+                results.append((path, count_lines(path, chunk_size, use_mmap)))
+            else:
+                results.append((path, count_occurrences(path, needle, chunk_size, use_mmap)[0]))
+        except OSError as e:
+            results.append((path, e))
+    return results
+
+
+class LineCounter:
+    def __init__(self, workers=8, chunk_size=CHUNK_SIZE, use_mmap=False, batch=64):
+        self.chunk_size = chunk_size
+        self.use_mmap = use_mmap
+        self.batch = batch
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="line-counter")
+
+    def _jobs(self, paths):
+        # big files one per job, small files `batch` per job
+        small = []
+        for path in paths:
+            try:
+                size = os.path.getsize(path)
+            except OSError:
+                size = 0  # the job reports the error
+            if size >= SMALL_FILE:
+                yield [path]
+            else:
+                small.append(path)
+                if len(small) == self.batch:
+                    yield small
+                    small = []
+        if small:
+            yield small
+
+    def count_many(self, paths, needle=None):
+        """{path: count}; count is an OSError for files that failed.
+
+        Counts lines, or occurrences of `needle` when it is given.
+        """
+        lines = needle is None
+        futures = [
+            self._pool.submit(_count_batch, job, needle, self.chunk_size, self.use_mmap, lines)
+            for job in self._jobs(paths)
+        ]
+        results = {}
+        for future in futures:
+            results.update(future.result())
+        return results
+
+    async def acount_many(self, paths, needle=None):
+        loop = asyncio.get_running_loop()
+        lines = needle is None
+        jobs = [
+            loop.run_in_executor(self._pool, _count_batch, job, needle,
+                                 self.chunk_size, self.use_mmap, lines)
+            for job in self._jobs(paths)
+        ]
+        results = {}
+        for batch in await asyncio.gather(*jobs):
+            results.update(batch)
+        return results
+
+    async def acount_lines(self, path):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._pool, count_lines, path,
+                                          self.chunk_size, self.use_mmap)
+
+    def close(self):
+        self._pool.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,92 @@
+# Response cache middleware for aiohttp.web
+#
+#   app = web.Application(middlewares=[response_cache_middleware(ttl=5)])
+#
+# GET / HEAD answers of the handlers are kept for `ttl` seconds, per
+# method + path + query string.  When many requests for the same key
+# arrive while the handler is still running, only the first one runs it
+# (single-flight); the others wait and get a copy of its answer.
+#
+# Only plain web.Response answers with status 200, a bytes body and no
+# Set-Cookie are cached.  For anything else (errors, streaming responses)
+# the waiting requests run the handler themselves.  A request with
+# "Cache-Control: no-cache" skips the cache.  Every answer gets an
+# X-Cache header: HIT, MISS, COALESCED or BYPASS.
+#
+# The cache lives in one process; with several worker processes (see
+# serving.py) every worker has its own.
+import asyncio
+from collections import OrderedDict
+
+from aiohttp import web
+
+_DROP_HEADERS = frozenset(("Content-Length", "Date", "Server"))
+
+
+def _snapshot(response):
+    if (type(response) is not web.Response or response.status != 200
+            or not isinstance(response.body, bytes) or "Set-Cookie" in response.headers):
+        return None
+    headers = {k: v for k, v in response.headers.items() if k not in _DROP_HEADERS}
+    return response.status, headers, response.body
+
+
+def _response(snapshot, state):
+    status, headers, body = snapshot
+    response = web.Response(status=status, headers=headers, body=body)
+    response.headers["X-Cache"] = state
+    return response
+
+
+def response_cache_middleware(ttl=5.0, max_entries=10_000, methods=("GET", "HEAD")):
+    entries = OrderedDict()  # key -> (expires, snapshot)
+    inflight = {}  # key -> Future of snapshot (None = not cacheable)
+    stats = {"hits": 0, "misses": 0, "coalesced": 0, "bypass": 0}
+
+    @web.middleware
+    async def cache(request, handler):
+        if request.method not in methods or "no-cache" in request.headers.get("Cache-Control", ""):
+            stats["bypass"] += 1
+            response = await handler(request)
+            response.headers["X-Cache"] = "BYPASS"
+            return response
+
+        key = (request.method, request.path_qs)
+        loop = asyncio.get_running_loop()
+        entry = entries.get(key)
+        if entry is not None:
+            if entry[0] > loop.time():
+                stats["hits"] += 1
+                entries.move_to_end(key)
+                return _response(entry[1], "HIT")
+            del entries[key]
+
+        waiting = inflight.get(key)
+        if waiting is not None:
+            snapshot = await asyncio.shield(waiting)
+            if snapshot is not None:
+                stats["coalesced"] += 1
+                return _response(snapshot, "COALESCED")
+            # the leader's answer can not be shared, run the handler ourselves
+            stats["bypass"] += 1
+            return await handler(request)
+
+        stats["misses"] += 1
+        future = inflight[key] = loop.create_future()
+        snapshot = None
+        try:
+            response = await handler(request)
+            snapshot = _snapshot(response)
+            if snapshot is not None:
+                entries[key] = (loop.time() + ttl, snapshot)
+                if len(entries) > max_entries:
+                    entries.popitem(last=False)
+            response.headers["X-Cache"] = "MISS"
+            return response
+        finally:
+            del inflight[key]
+            future.set_result(snapshot)
+
+    cache.stats = stats
+    cache.entries = entries
+    return cache
@@ -0,0 +1,105 @@
+# Serve an aiohttp app from several worker processes on one port
+#
+# web_async.py runs one event loop in one process, so it uses one CPU.
+# run_workers() starts N processes; every process runs its own event loop
+# and binds the same host:port with SO_REUSEPORT, and the kernel spreads
+# new connections over them.
+#
+#   run_workers(make_app, port=8080, workers=4)          # blocks
+#
+# `app_factory(**app_kwargs)` is called in every worker (it must be a
+# module-level function, the workers are started with "spawn").  uvloop
+# is used when it is installed (use_uvloop=None) or when asked for.
+#
+# Shutdown: SIGINT / SIGTERM to the parent is passed on to the workers;
+# each worker stops accepting, lets running requests finish (up to
+# `shutdown_timeout` seconds) and exits.  Workers that are still alive
+# after that are killed.
+import asyncio
+import multiprocessing
+import os
+import signal
+import socket
+from multiprocessing.connection import wait
+
+from aiohttp import web
+
+
+def _use_uvloop(use_uvloop):
+    if use_uvloop is False:
+        return False
+    try:
+        import uvloop
+    except ImportError:
+        if use_uvloop:
+            raise
+        return False
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    return True
+
+
+async def _serve(app_factory, app_kwargs, host, port, reuse_port, shutdown_timeout):
+    app = app_factory(**app_kwargs)
+    runner = web.AppRunner(app, access_log=None, shutdown_timeout=shutdown_timeout)
+    await runner.setup()
+    site = web.TCPSite(runner, host, port, reuse_port=reuse_port, backlog=1024)
+    await site.start()
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+    await stop.wait()
+    # closes the listening socket first, then waits for running handlers
+    await runner.cleanup()
+
+
+def _worker(app_factory, app_kwargs, host, port, reuse_port, use_uvloop, shutdown_timeout):
+    _use_uvloop(use_uvloop)
+    asyncio.run(_serve(app_factory, app_kwargs, host, port, reuse_port, shutdown_timeout))
+
+
+def run_workers(app_factory, host="127.0.0.1", port=8080, workers=None, use_uvloop=None,
+                shutdown_timeout=10.0, **app_kwargs):
+    """Run app_factory() in `workers` processes sharing host:port; blocks."""
+    workers = workers or os.cpu_count() or 1
+    reuse_port = hasattr(socket, "SO_REUSEPORT")
+    if workers > 1 and not reuse_port:
+        raise RuntimeError("SO_REUSEPORT is not available here, use workers=1")
+    if workers == 1:
+        _worker(app_factory, app_kwargs, host, port, reuse_port, use_uvloop, shutdown_timeout)
+        return
+
+    ctx = multiprocessing.get_context("spawn")
+    procs = [
+        ctx.Process(target=_worker, name=f"web-worker-{i}",
+                    args=(app_factory, app_kwargs, host, port, reuse_port, use_uvloop,
+                          shutdown_timeout))
+        for i in range(workers)
+    ]
+    stopping = False
+
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for p in procs:
+            if p.is_alive():
+                os.kill(p.pid, signal.SIGTERM)
+
+    old = {sig: signal.signal(sig, stop) for sig in (signal.SIGINT, signal.SIGTERM)}
+    try:
+        for p in procs:
+            p.start()
+        # a worker that dies (not by our signal) takes the server down
+        while any(p.is_alive() for p in procs) and not stopping:
+            wait([p.sentinel for p in procs if p.is_alive()], timeout=1.0)
+            if any(p.exitcode not in (None, 0) for p in procs):
+                stop(None, None)
+        for p in procs:
+            p.join(shutdown_timeout + 5)
+            if p.is_alive():
+                p.kill()
+                p.join()
+    finally:
+        for sig, handler in old.items():
+            signal.signal(sig, handler)
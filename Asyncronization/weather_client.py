@@ -0,0 +1,144 @@
+# Async client layer for the weather API of api_async.py
+#
+# main() in api_async.py sends one request per city, all at once, with no
+# limit, no retry and no cache; the same city twice means two upstream
+# calls.  WeatherClient puts three things in between:
+#
+#  - SingleFlightCache: concurrent get()s of the same key share ONE
+#    in-flight call (single-flight).  Results are cached for `ttl`
+#    seconds; after that, for another `stale_ttl` seconds, the old value is
+#    returned at once while one background call refreshes it
+#    (stale-while-revalidate).  Errors are never cached.
+#  - an asyncio.Semaphore: at most `max_concurrency` upstream calls at a time
+#  - retries with "full jitter" exponential backoff for connection errors,
+#    timeouts, 429 and 5xx answers; the semaphore slot is given back while
+#    sleeping
+#
+#   async with aiohttp.ClientSession() as session:
+#       client = WeatherClient(session, api_key, ttl=600, max_concurrency=10)
+#       data = await client.get("London")
+#       print(client.stats)
+#
+# weather_stub.py is a local aiohttp server speaking the same API, see
+# bench_weather.py.
+import asyncio
+import random
+from collections import OrderedDict
+
+import aiohttp
+
+API_URL = "http://api.openweathermap.org/data/2.5/weather"
+RETRY_STATUS = frozenset((429, 500, 502, 503, 504))
+
+
+class UpstreamError(Exception):
+    def __init__(self, status, city):
+        super().__init__(f"{city}: HTTP {status}")
+        self.status = status
+        self.city = city
+
+
+class SingleFlightCache:
+    def __init__(self, loader, ttl=60.0, stale_ttl=300.0, max_entries=10_000):
+        self.loader = loader  # async def loader(key) -> value
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # key -> (value, loaded_at)
+        self._inflight = {}  # key -> asyncio.Task
+        self.stats = {"hits": 0, "stale_hits": 0, "misses": 0, "coalesced": 0,
+                      "loads": 0, "refresh_errors": 0}
+
+    async def get(self, key):
+        now = asyncio.get_running_loop().time()
+        entry = self._entries.get(key)
+        if entry is not None:
+            value, loaded_at = entry
+            age = now - loaded_at
+            if age < self.ttl:
+                self.stats["hits"] += 1
+                self._entries.move_to_end(key)
+                return value
+            if age < self.ttl + self.stale_ttl:
+                self.stats["stale_hits"] += 1
+                self._entries.move_to_end(key)
+                if key not in self._inflight:
+                    self._start_load(key).add_done_callback(self._refresh_done)
+                return value
+        self.stats["misses"] += 1
+        task = self._inflight.get(key)
+        if task is None:
+            task = self._start_load(key)
+        else:
+            self.stats["coalesced"] += 1
+        # shield: one waiter being cancelled must not cancel the shared call
+        return await asyncio.shield(task)
+
+    def _start_load(self, key):
+        self.stats["loads"] += 1
+        task = asyncio.ensure_future(self._load(key))
+        self._inflight[key] = task
+        return task
+
+    async def _load(self, key):
+        try:
+            value = await self.loader(key)
+        finally:
+            del self._inflight[key]
+        self._entries[key] = (value, asyncio.get_running_loop().time())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return value
+
+    def _refresh_done(self, task):
+        # nobody awaits a background refresh: keep the stale value and
+        # retrieve the exception so asyncio does not log it
+        if not task.cancelled() and task.exception() is not None:
+            self.stats["refresh_errors"] += 1
+
+    def invalidate(self, key=None):
+        if key is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(key, None)
+
+
+class WeatherClient:
+    def __init__(self, session, api_key, base_url=API_URL, ttl=600.0, stale_ttl=3600.0,
+                 max_concurrency=10, retries=3, backoff=0.1, max_backoff=5.0, timeout=10.0):
+        self.session = session
+        self.api_key = api_key
+        self.base_url = base_url
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        self._limit = asyncio.Semaphore(max_concurrency)
+        self.cache = SingleFlightCache(self._fetch, ttl, stale_ttl)
+        self.stats = {"upstream_calls": 0, "retries": 0, "errors": 0}
+
+    async def get(self, city):
+        """Weather JSON of `city` (a dict), cached and coalesced."""
+        return await self.cache.get(city.strip().lower())
+
+    async def _fetch(self, city):
+        params = {"q": city, "appid": self.api_key}
+        for attempt in range(self.retries + 1):
+            async with self._limit:
+                self.stats["upstream_calls"] += 1
+                try:
+                    async with self.session.get(self.base_url, params=params,
+                                                timeout=self.timeout) as response:
+                        if response.status == 200:
+                            return await response.json()
+                        error = UpstreamError(response.status, city)
+                except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    error = e
+            if isinstance(error, UpstreamError) and error.status not in RETRY_STATUS:
+                break
+            if attempt < self.retries:
+                self.stats["retries"] += 1
+                await asyncio.sleep(random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt)))
+        self.stats["errors"] += 1
+        raise error
@@ -0,0 +1,58 @@
+# Local stand-in for api.openweathermap.org (aiohttp.web)
+#
+#   stub = await start_weather_stub(delay=0.02, fail_rate=0.05)
+#   client = WeatherClient(session, "key", base_url=stub.url)
+#   ...
+#   print(stub.calls)        # upstream calls the server has seen
+#   await stub.close()
+#
+# Every GET /data/2.5/weather?q=CITY waits `delay` seconds and answers
+# like the real API; a `fail_rate` fraction of calls gets a 503.
+import asyncio
+import random
+
+from aiohttp import web
+
+DESCRIPTIONS = ["clear sky", "few clouds", "light rain", "overcast clouds", "snow", "mist"]
+
+
+class WeatherStub:
+    def __init__(self, delay=0.02, fail_rate=0.0, seed=0):
+        self.delay = delay
+        self.fail_rate = fail_rate
+        self.calls = 0
+        self.failures = 0
+        self.per_city = {}
+        self.url = None
+        self._rng = random.Random(seed)
+        self._runner = None
+
+    async def handle(self, request):
+        city = request.query.get("q", "")
+        self.calls += 1
+        self.per_city[city] = self.per_city.get(city, 0) + 1
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        if self._rng.random() < self.fail_rate:
+            self.failures += 1
+            return web.json_response({"cod": 503, "message": "try again"}, status=503)
+        description = DESCRIPTIONS[hash(city) % len(DESCRIPTIONS)]
+        return web.json_response({"name": city, "weather": [{"description": description}]})
+
+    async def start(self, host="127.0.0.1", port=0):
+        app = web.Application()
+        app.router.add_get("/data/2.5/weather", self.handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.url = f"http://{host}:{port}/data/2.5/weather"
+        return self
+
+    async def close(self):
+        await self._runner.cleanup()
+
+
+async def start_weather_stub(delay=0.02, fail_rate=0.0, seed=0):
+    return await WeatherStub(delay, fail_rate, seed).start()
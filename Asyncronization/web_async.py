@@ -1,24 +1,37 @@
 import asyncio  # Import for async support.
+import argparse  # Import for the command line options of the serving mode.
 from aiohttp import web  # Import aiohttp's web module for server setup.
 
+from response_cache import response_cache_middleware  # TTL + single-flight response cache.
+from serving import run_workers  # Multi-process serving on one port.
+
 async def handle(request):
     # Define an async handler for incoming requests.
     name = request.match_info.get('name', "Anonymous")
     # Get the 'name' parameter from the URL, default to "Anonymous".
     text = f"Hello, {name}!"
     # Create a greeting message.
-    await asyncio.sleep(1)  # Simulate a 1-second async delay (e.g., DB query).
+    await asyncio.sleep(request.app["delay"])  # Simulate a 1-second async delay (e.g., DB query).
     # Await sleep to yield control, allowing other requests to process.
     return web.Response(text=text)
     # Return an HTTP response with the text.
 
+def make_app(delay=1.0, cache_ttl=None):
+    # Build the app; module level so every worker process can call it.
+    middlewares = [response_cache_middleware(ttl=cache_ttl)] if cache_ttl else []
+    # Cache the answers of handle for cache_ttl seconds (see response_cache.py).
+    app = web.Application(middlewares=middlewares)
+    app["delay"] = delay
+    # The fake backend delay, read by handle.
+    app.add_routes([web.get('/', handle),
+                    web.get('/{name}', handle)])
+    return app
+
 async def main():
     # Define the main function to set up the server.
-    app = web.Application()
+    app = make_app()
     # Create a new web application instance.
-    app.add_routes([web.get('/', handle),
-                    web.get('/{name}', handle)])
-    # Add routes: '/' and '/{name}' both map to the handle function.
+    # Routes: '/' and '/{name}' both map to the handle function.
     runner = web.AppRunner(app)
     # Create a runner to manage the app.
     await runner.setup()
@@ -34,5 +47,17 @@ async def main():
 
 if __name__ == "__main__":
     # Run guard.
-    asyncio.run(main())
-    # Run the server.
\ No newline at end of file
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int, default=0, help="N processes on one port (SO_REUSEPORT)")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--delay", type=float, default=1.0, help="fake backend delay in seconds")
+    parser.add_argument("--cache-ttl", type=float, default=0, help="cache answers for this many seconds")
+    args = parser.parse_args()
+    if args.workers:
+        # Serving mode: N worker processes, uvloop if installed, graceful shutdown (serving.py).
+        print(f"Server started at http://localhost:{args.port} with {args.workers} workers", flush=True)
+        run_workers(make_app, host="localhost", port=args.port, workers=args.workers,
+                    delay=args.delay, cache_ttl=args.cache_ttl)
+    else:
+        asyncio.run(main())
+        # Run the server.
\ No newline at end of file
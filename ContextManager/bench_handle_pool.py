@@ -0,0 +1,50 @@
+# Benchmark: many small appends, open/close per write vs WriteHandlePool
+# run from this folder:  python bench_handle_pool.py [n_writes]
+import os
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+
+from handle_pool import WriteHandlePool
+
+
+@contextmanager
+def managed_file(name, mode):
+    # the pattern from contextmanager.py
+    try:
+        f = open(name, mode)
+        yield f
+    finally:
+        f.close()
+
+
+def open_per_write(path, n):
+    for _ in range(n):
+        with managed_file(path, "a") as f:
+            f.write("Hello, World! \n")
+
+
+def pooled(path, n, fsync):
+    with WriteHandlePool(fsync=fsync) as pool:
+        for _ in range(n):
+            with pool.open(path) as f:
+                f.write("Hello, World! \n")
+
+
+def run(name, fn, n):
+    path = os.path.join(tempfile.mkdtemp(), "bench.txt")
+    start = time.perf_counter()
+    fn(path, n)
+    elapsed = time.perf_counter() - start
+    with open(path) as f:
+        assert sum(1 for _ in f) == n
+    print(f"{name:<26} {n / elapsed:>12,.0f} writes/s   ({elapsed * 1e6 / n:7.2f} us per write)")
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    run("open/close per write", open_per_write, n)
+    run("pool, fsync=none", lambda p, n: pooled(p, n, "none"), n)
+    run("pool, fsync=batch", lambda p, n: pooled(p, n, "batch"), n)
+    run("pool, fsync=write", lambda p, n: pooled(p, n, "write"), min(n, 2_000))
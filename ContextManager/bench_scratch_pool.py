@@ -0,0 +1,59 @@
+# Benchmark: mkdtemp + rmtree per use vs ScratchPool
+# run from this folder:  python bench_scratch_pool.py [uses] [files_per_use]
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+from scratch_pool import ScratchPool
+
+
+def use(path, files):
+    for i in range(files):
+        with open(os.path.join(path, f"part-{i}.txt"), "w") as f:
+            f.write("This is a temporary file.\n" * 20)
+
+
+def mkdtemp_per_use(uses, files):
+    latencies = []
+    for _ in range(uses):
+        start = time.perf_counter()
+        path = tempfile.mkdtemp()
+        try:
+            use(path, files)
+        finally:
+            shutil.rmtree(path)
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def pooled(uses, files, prefer_memory):
+    latencies = []
+    with ScratchPool(prefer_memory=prefer_memory) as pool:
+        for _ in range(uses):
+            start = time.perf_counter()
+            with pool.workspace() as path:
+                assert not os.listdir(path)
+                use(path, files)
+            latencies.append(time.perf_counter() - start)
+        stats = dict(pool.stats)
+    return latencies, stats
+
+
+def show(name, latencies):
+    us = [x * 1e6 for x in latencies]
+    print(f"{name:<28} median {statistics.median(us):9.1f} us   "
+          f"p99 {statistics.quantiles(us, n=100)[98]:9.1f} us")
+
+
+if __name__ == "__main__":
+    uses = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000
+    files = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    show("mkdtemp + rmtree", mkdtemp_per_use(uses, files))
+    lat, stats = pooled(uses, files, prefer_memory=False)
+    show("ScratchPool (temp dir)", lat)
+    lat, stats = pooled(uses, files, prefer_memory=True)
+    show("ScratchPool (/dev/shm)", lat)
+    print("pool stats:", stats)
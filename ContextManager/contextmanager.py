@@ -1,31 +1,33 @@
 import os 
-import shutil
-import tempfile
 from contextlib import contextmanager   
 
+from handle_pool import WriteHandlePool
+from scratch_pool import ScratchPool
 
 
-try:
-    
 
-     # Get disk usage for the root directory
+# Scratch directories come from a pool (see scratch_pool.py): no
+# mkdtemp / rmtree per use, the folder is wiped in the background and
+# reused, and shutil.disk_usage is checked before one is handed out.
+# The pool is closed (and its folder removed) at the end of the `with`.
+with ScratchPool(size=4) as scratch:
+
+    # Get disk usage for the root directory
     # total, used, free = shutil.disk_usage("/")
 
     # print(f"Total: {total // (2**30)} GB")
     # print(f"Used: {used // (2**30)} GB")
     # print(f"Free: {free // (2**30)} GB")
 
-    print(tempfile.gettempdir())
-    tempDir= tempfile.mkdtemp()
-    print("folder just created =",tempDir ,"exists =",os.path.exists(tempDir))
+    print(scratch.root)
+    with scratch.workspace() as tempDir:
+        print("folder handed out =",tempDir ,"empty =",not os.listdir(tempDir))
 
-    with open (os.path.join(tempDir,"tempfile.txt"),'w') as f:
-        print("temp file has been created , its name is : %s ",f.name)
-        f.write("This is a temporary file.")
+        with open (os.path.join(tempDir,"tempfile.txt"),'w') as f:
+            print("temp file has been created , its name is : %s ",f.name)
+            f.write("This is a temporary file.")
 
-finally:
-    shutil.rmtree (tempDir)
-    print("folder removed =",tempDir ,"exists =",os.path.exists(tempDir))
+    print("folder returned to the pool, it is wiped in the background")
 
 
 
@@ -39,11 +41,23 @@ def managed_file(name, mode):
     finally:
         f.close()   
 
+# Same idea, but the file stays open between `with` blocks and writes are
+# buffered and flushed in groups (see handle_pool.py)
+write_pool = WriteHandlePool(flush_bytes=64 * 1024, flush_interval=1.0, fsync="batch")
+
+
+@contextmanager
+def pooled_file(name):
+    with write_pool.open(name) as f:
+        yield f
+
+
 for i in range(20):
- with managed_file('example.txt', 'a') as f:
+ with pooled_file('example.txt') as f:
     f.write('Hello, World! \n')  
     print("File written successfully.")
     
+write_pool.flush_all()
 
 
 with open("example.txt", 'r') as f :
@@ -0,0 +1,196 @@
+# Pool of open, buffered append handles
+#
+# `with managed_file(name, 'a')` opens and closes the file every time.
+# WriteHandlePool keeps handles to hot paths open across `with` blocks
+# and buffers the writes in memory:
+#  - group commit: the buffer is written when it holds `flush_bytes`, or
+#    when it is older than `flush_interval` seconds (background thread)
+#  - fsync policy: "none" (leave it to the OS), "batch" (fsync after every
+#    group commit) or "write" (write + fsync on every write call)
+#  - at most `max_open` handles; the least recently used idle one is
+#    flushed and closed when another path is needed
+#  - everything is flushed and closed at interpreter exit
+#
+# So a crash loses at most the last `flush_bytes` / `flush_interval` of
+# data (nothing with fsync="write").
+import atexit
+import os
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+FSYNC_POLICIES = ("none", "batch", "write")
+
+
+class _Handle:
+    def __init__(self, path):
+        self.path = path
+        self.fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        self.buffer = []
+        self.pending = 0
+        self.first_pending = None
+        self.users = 0
+        self.lock = threading.Lock()
+
+    def write_out(self, fsync):
+        """Write the buffer to the file (caller holds self.lock)."""
+        if not self.buffer:
+            return
+        data = b"".join(self.buffer)
+        self.buffer.clear()
+        self.pending = 0
+        self.first_pending = None
+        view = memoryview(data)
+        while view:
+            written = os.write(self.fd, view)
+            view = view[written:]
+        if fsync:
+            os.fsync(self.fd)
+
+    def close(self, fsync):
+        with self.lock:
+            self.write_out(fsync)
+            os.close(self.fd)
+            self.fd = None
+
+
+class PooledWriter:
+    """What `with pool.open(path) as f` gives you."""
+
+    def __init__(self, pool, handle):
+        self._pool = pool
+        self._handle = handle
+
+    def write(self, data):
+        if isinstance(data, str):
+            data = data.encode(self._pool.encoding)
+        self._pool._write(self._handle, data)
+        return len(data)
+
+    def flush(self):
+        self._pool._flush(self._handle)
+
+
+class WriteHandlePool:
+    def __init__(self, max_open=64, flush_bytes=64 * 1024, flush_interval=1.0,
+                 fsync="batch", encoding="utf-8"):
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"fsync must be one of {FSYNC_POLICIES}")
+        if max_open < 1:
+            raise ValueError("max_open must be >= 1")
+        self.max_open = max_open
+        self.flush_bytes = flush_bytes
+        self.flush_interval = flush_interval
+        self.fsync = fsync
+        self.encoding = encoding
+        self.stats = {"opens": 0, "evictions": 0, "flushes": 0, "writes": 0}
+
+        self._handles = OrderedDict()  # path -> _Handle, oldest use first
+        self._lock = threading.Lock()
+        self._closed = False
+        self._wakeup = threading.Event()
+        self._flusher = threading.Thread(target=self._flush_loop, name="handle-pool-flusher",
+                                         daemon=True)
+        self._flusher.start()
+        atexit.register(self.close)
+
+    # ---------- handles ----------------------------------------------
+
+    @contextmanager
+    def open(self, path):
+        handle = self._acquire(os.path.abspath(path))
+        try:
+            yield PooledWriter(self, handle)
+        finally:
+            with self._lock:
+                handle.users -= 1
+
+    def _acquire(self, path):
+        with self._lock:
+            if self._closed:
+                raise ValueError("pool is closed")
+            handle = self._handles.get(path)
+            if handle is None:
+                handle = _Handle(path)
+                self.stats["opens"] += 1
+                self._handles[path] = handle
+            self._handles.move_to_end(path)
+            # mark the handle as used before evicting, so it is never a
+            # candidate itself; if every other handle is busy the pool
+            # simply stays above max_open until they are released
+            handle.users += 1
+            self._evict()
+            return handle
+
+    def _evict(self):
+        # close least recently used handles that nobody is using right now
+        for path in list(self._handles):
+            if len(self._handles) <= self.max_open:
+                return
+            handle = self._handles[path]
+            if handle.users == 0:
+                del self._handles[path]
+                handle.close(self.fsync != "none")
+                self.stats["evictions"] += 1
+
+    # ---------- writing ----------------------------------------------
+
+    def _write(self, handle, data):
+        with handle.lock:
+            if handle.fd is None:
+                raise ValueError("handle was closed")
+            self.stats["writes"] += 1
+            handle.buffer.append(data)
+            handle.pending += len(data)
+            if handle.first_pending is None:
+                handle.first_pending = time.monotonic()
+            if self.fsync == "write":
+                handle.write_out(fsync=True)
+            elif handle.pending >= self.flush_bytes:
+                self._commit(handle)
+
+    def _commit(self, handle):
+        handle.write_out(self.fsync == "batch")
+        self.stats["flushes"] += 1
+
+    def _flush(self, handle):
+        with handle.lock:
+            if handle.fd is not None and handle.buffer:
+                self._commit(handle)
+
+    def flush_all(self):
+        with self._lock:
+            handles = list(self._handles.values())
+        for handle in handles:
+            self._flush(handle)
+
+    def _flush_loop(self):
+        # time based group commit
+        while not self._closed:
+            self._wakeup.wait(self.flush_interval / 2)
+            now = time.monotonic()
+            with self._lock:
+                handles = list(self._handles.values())
+            for handle in handles:
+                first = handle.first_pending
+                if first is not None and now - first >= self.flush_interval:
+                    self._flush(handle)
+
+    def close(self):
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            handles = list(self._handles.values())
+            self._handles.clear()
+        self._wakeup.set()
+        for handle in handles:
+            handle.close(self.fsync != "none")
+        atexit.unregister(self.close)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
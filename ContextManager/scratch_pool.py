@@ -0,0 +1,145 @@
+# Pool of reusable scratch directories
+#
+# tempfile.mkdtemp() + shutil.rmtree() on every use means creating and
+# (synchronously) deleting a directory tree each time.  ScratchPool hands
+# out directories from a pool instead:
+#  - lives on a memory backed filesystem (/dev/shm) when there is one
+#  - a returned directory is wiped by a background cleaner thread and
+#    then goes back into the pool, so the caller never waits for rmtree
+#  - quota: before handing out a directory the free space of the
+#    filesystem is checked with shutil.disk_usage
+# Every directory handed out is empty and private (mode 0o700), exactly
+# like a fresh mkdtemp().
+import errno
+import os
+import queue
+import shutil
+import tempfile
+import threading
+from contextlib import contextmanager
+
+MEMORY_DIRS = ("/dev/shm",)
+
+
+def _default_root(prefer_memory):
+    if prefer_memory:
+        for path in MEMORY_DIRS:
+            if os.path.isdir(path) and os.access(path, os.W_OK | os.X_OK):
+                return path
+    return tempfile.gettempdir()
+
+
+def _wipe(path):
+    """Delete everything inside `path`, keep `path` itself.
+
+    Returns True when `path` is empty afterwards.
+    """
+    with os.scandir(path) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                shutil.rmtree(entry.path, ignore_errors=True)
+            else:
+                try:
+                    os.unlink(entry.path)
+                except FileNotFoundError:
+                    pass
+    with os.scandir(path) as entries:
+        return next(entries, None) is None
+
+
+class ScratchPool:
+    def __init__(self, size=8, root=None, prefer_memory=True,
+                 min_free_bytes=0, min_free_fraction=0.05):
+        self.size = size
+        self.min_free_bytes = min_free_bytes
+        self.min_free_fraction = min_free_fraction
+        self.root = root or _default_root(prefer_memory)
+        self.base = tempfile.mkdtemp(prefix="scratch-pool-", dir=self.root)
+        self.stats = {"reused": 0, "created": 0, "wiped": 0}
+
+        self._clean = []  # ready to hand out
+        self._dirty = queue.Queue()  # returned, waiting for the cleaner
+        self._lock = threading.Lock()
+        self._closed = False
+        self._cleaner = threading.Thread(target=self._clean_loop, name="scratch-cleaner",
+                                         daemon=True)
+        self._cleaner.start()
+
+    def _check_quota(self):
+        usage = shutil.disk_usage(self.base)
+        floor = max(self.min_free_bytes, usage.total * self.min_free_fraction)
+        if usage.free >= floor:
+            return
+        # deleted files of returned workspaces may be what is using the space
+        self._dirty.join()
+        usage = shutil.disk_usage(self.base)
+        if usage.free < floor:
+            raise OSError(errno.ENOSPC,
+                          f"scratch space on {self.root} below quota "
+                          f"({usage.free} bytes free, need {int(floor)})")
+
+    def acquire(self):
+        """Return an empty private directory (give it back with release())."""
+        if self._closed:
+            raise ValueError("pool is closed")
+        self._check_quota()
+        with self._lock:
+            path = self._clean.pop() if self._clean else None
+        if path is not None:
+            self.stats["reused"] += 1
+            return path
+        self.stats["created"] += 1
+        return tempfile.mkdtemp(dir=self.base)  # mode 0o700
+
+    def release(self, path):
+        if not self._closed:
+            self._dirty.put(path)
+        else:
+            shutil.rmtree(path, ignore_errors=True)
+
+    @contextmanager
+    def workspace(self):
+        path = self.acquire()
+        try:
+            yield path
+        finally:
+            self.release(path)
+
+    def _clean_loop(self):
+        while True:
+            path = self._dirty.get()
+            try:
+                if path is None:
+                    return
+                if not _wipe(path):
+                    # something survived the wipe: never hand it to the
+                    # next borrower, use a fresh directory instead
+                    shutil.rmtree(path, ignore_errors=True)
+                    path = tempfile.mkdtemp(dir=self.base)
+                    self.stats["created"] += 1
+                os.chmod(path, 0o700)
+                self.stats["wiped"] += 1
+                with self._lock:
+                    keep = not self._closed and len(self._clean) < self.size
+                    if keep:
+                        self._clean.append(path)
+                if not keep:
+                    shutil.rmtree(path, ignore_errors=True)
+            except OSError:
+                shutil.rmtree(path, ignore_errors=True)
+            finally:
+                self._dirty.task_done()
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        self._dirty.put(None)
+        self._cleaner.join()
+        shutil.rmtree(self.base, ignore_errors=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
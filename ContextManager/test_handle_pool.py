@@ -0,0 +1,22 @@
+import os
+
+from handle_pool import WriteHandlePool
+
+
+def test_nested_open_over_max_open(tmp_path):
+    a = tmp_path / "a"
+    b = tmp_path / "b"
+    with WriteHandlePool(max_open=1) as pool:
+        with pool.open(a) as fa:
+            with pool.open(b) as fb:
+                fa.write("a\n")
+                fb.write("b\n")
+            # both handles are busy, so the pool went over max_open
+            assert len(pool._handles) == 2
+        # opening another path now evicts the idle ones
+        with pool.open(tmp_path / "c") as fc:
+            fc.write("c\n")
+        assert len(pool._handles) == 1
+    assert a.read_text() == "a\n"
+    assert b.read_text() == "b\n"
+    assert os.path.exists(tmp_path / "c")
@@ -0,0 +1,38 @@
+import os
+import shutil
+
+import scratch_pool
+from scratch_pool import ScratchPool
+
+
+def test_directory_that_cannot_be_wiped_is_not_reused(tmp_path, monkeypatch):
+    real_rmtree = shutil.rmtree
+
+    def stubborn_rmtree(path, *args, **kwargs):
+        # a subdirectory the wipe cannot delete (like a permission error
+        # swallowed by ignore_errors=True)
+        if os.path.basename(path) == "stuck":
+            return
+        real_rmtree(path, *args, **kwargs)
+
+    with ScratchPool(size=1, root=str(tmp_path)) as pool:
+        with pool.workspace() as path:
+            os.mkdir(os.path.join(path, "stuck"))
+            open(os.path.join(path, "stuck", "secret"), "w").close()
+            monkeypatch.setattr(scratch_pool.shutil, "rmtree", stubborn_rmtree)
+        pool._dirty.join()
+        monkeypatch.setattr(scratch_pool.shutil, "rmtree", real_rmtree)
+        with pool.workspace() as again:
+            assert os.listdir(again) == []
+        assert pool.stats["created"] == 2
+
+
+def test_reused_directory_is_empty(tmp_path):
+    with ScratchPool(size=1, root=str(tmp_path)) as pool:
+        with pool.workspace() as path:
+            open(os.path.join(path, "f"), "w").close()
+        pool._dirty.join()
+        with pool.workspace() as again:
+            assert again == path
+            assert os.listdir(again) == []
+    assert os.listdir(tmp_path) == []
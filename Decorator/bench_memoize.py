@@ -0,0 +1,41 @@
+# Benchmark: plain recursive fib vs memoized fib
+# run from this folder:  python bench_memoize.py
+import time
+
+from decorator import memoize
+
+calls = {"plain": 0, "memo": 0}
+
+
+def plain_fib(n):
+    calls["plain"] += 1
+    if n <= 1:
+        return n
+    return plain_fib(n - 2) + plain_fib(n - 1)
+
+
+@memoize(maxsize=None)
+def memo_fib(n):
+    calls["memo"] += 1
+    if n <= 1:
+        return n
+    return memo_fib(n - 2) + memo_fib(n - 1)
+
+
+def run(fn, name, n):
+    calls[name] = 0
+    start = time.perf_counter()
+    value = fn(n)
+    elapsed = time.perf_counter() - start
+    return value, calls[name], elapsed
+
+
+if __name__ == "__main__":
+    print(f"{'n':>4} | {'plain calls':>12} {'plain s':>10} | {'memo calls':>10} {'memo s':>10}")
+    for n in (5, 10, 15, 20, 25, 30):
+        memo_fib.cache_clear()
+        v1, c1, t1 = run(plain_fib, "plain", n)
+        v2, c2, t2 = run(memo_fib, "memo", n)
+        assert v1 == v2
+        print(f"{n:>4} | {c1:>12} {t1:>10.6f} | {c2:>10} {t2:>10.6f}")
+    print("memo cache:", memo_fib.cache_info())
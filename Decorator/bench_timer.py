@@ -0,0 +1,48 @@
+# Benchmark: per-call overhead of the histogram based @timer
+# run from this folder:  python bench_timer.py
+import asyncio
+import time
+
+import metrics
+from decorator import timer
+
+N = 500_000
+
+
+def work(x):
+    return x + 1
+
+
+timed = timer(work, name="work")
+sampled = timer(work, name="work_every_16", sample_every=16)
+
+
+@timer
+async def async_work(x):
+    return x + 1
+
+
+def per_call_ns(fn):
+    start = time.perf_counter_ns()
+    for i in range(N):
+        fn(i)
+    return (time.perf_counter_ns() - start) / N
+
+
+async def async_per_call_ns(fn):
+    start = time.perf_counter_ns()
+    for i in range(N // 10):
+        await fn(i)
+    return (time.perf_counter_ns() - start) / (N // 10)
+
+
+if __name__ == "__main__":
+    bare = per_call_ns(work)
+    full = per_call_ns(timed)
+    some = per_call_ns(sampled)
+    print(f"bare call            : {bare:8.1f} ns")
+    print(f"@timer               : {full:8.1f} ns  (overhead {full - bare:.1f} ns)")
+    print(f"@timer sample_every=16: {some:8.1f} ns  (overhead {some - bare:.1f} ns)")
+    print(f"async @timer         : {asyncio.run(async_per_call_ns(async_work)):8.1f} ns")
+    print()
+    print(metrics.registry.to_text())
@@ -1,10 +1,20 @@
+import functools
+import inspect
+import itertools
+import threading
+import time
+from collections import OrderedDict
+
+import metrics
+
 
 def logger(func):
     print("its inside logger Funcitons")
 
-    def wrapper(n):
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
         print("inside the wrapper Funciton")
-        v=func(n)
+        v=func(*args, **kwargs)
         print("Wrapper Going To return Reseult v=",v)
         return v
     
@@ -12,7 +22,81 @@ def logger(func):
     return wrapper
 
 
+# Memoization decorator: remembers results of previous calls.
+# - maxsize bounds the cache, least recently used entry is evicted first
+# - ttl (seconds) makes entries expire, None means they never expire
+# - a lock guards the cache so several threads can share one function
+# - stats per function: fn.cache_info() / fn.cache_clear()
+#
+# When stacking with logger / timer put memoize on TOP (outermost),
+# the recursive call fib(n-1) goes through the name `fib`, so it hits the
+# cache first and never re-enters the logger / timer wrapper on a hit.
+_MISSING = object()
+
+
+def memoize(maxsize=128, ttl=None):
+    if callable(maxsize):
+        # used as bare @memoize
+        return memoize()(maxsize)
+    if maxsize is not None and maxsize <= 0:
+        raise ValueError("maxsize must be a positive number or None")
+
+    def decorator(func):
+        cache = OrderedDict()  # key -> (value, expires_at)
+        lock = threading.Lock()
+        stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = args
+            if kwargs:
+                key += (_MISSING,) + tuple(sorted(kwargs.items()))
+
+            with lock:
+                entry = cache.get(key, _MISSING)
+                if entry is not _MISSING:
+                    value, expires_at = entry
+                    if expires_at is None or expires_at > time.monotonic():
+                        cache.move_to_end(key)
+                        stats["hits"] += 1
+                        return value
+                    del cache[key]
+                    stats["evictions"] += 1
+                stats["misses"] += 1
+
+            # compute outside the lock, so slow or recursive calls
+            # do not block (or deadlock) the other callers
+            value = func(*args, **kwargs)
+            expires_at = None if ttl is None else time.monotonic() + ttl
+
+            with lock:
+                cache[key] = (value, expires_at)
+                cache.move_to_end(key)
+                if maxsize is not None:
+                    while len(cache) > maxsize:
+                        cache.popitem(last=False)
+                        stats["evictions"] += 1
+            return value
+
+        def cache_info():
+            with lock:
+                return dict(stats, size=len(cache), maxsize=maxsize, ttl=ttl)
+
+        def cache_clear():
+            with lock:
+                cache.clear()
+                for k in stats:
+                    stats[k] = 0
+
+        wrapper.cache_info = cache_info
+        wrapper.cache_clear = cache_clear
+        return wrapper
+
+    return decorator
+
+
 counter=0
+@memoize(maxsize=1024)
 @logger
 #Syntactic Sugar for logger(fib) decorator which is samwe as logged_fib=logger(fib)
 def fib(n):
@@ -49,15 +133,48 @@ def fib(n):
     
 # fib_decorated=fib_decorated(5)
 # print("Decorated Fib Function =",fib_decorated)
-import time
 
-def timer(func):
+# timer records every call into a latency histogram (see metrics.py)
+# instead of printing, so it is cheap enough to leave on.
+# - sample_every=N only times every Nth call
+# - works for normal and `async def` functions
+# - print(registry.to_text()) / registry.to_json() dumps the numbers
+def timer(func=None, *, name=None, sample_every=1, registry=None):
+    if func is None:
+        return lambda f: timer(f, name=name, sample_every=sample_every, registry=registry)
+    if sample_every < 1:
+        raise ValueError("sample_every must be >= 1")
+
+    hist = (registry or metrics.registry).histogram(name or func.__qualname__)
+    record = hist.record
+    clock = time.perf_counter_ns
+    calls = itertools.count()
+
+    if inspect.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            if sample_every > 1 and next(calls) % sample_every:
+                return await func(*args, **kwargs)
+            start = clock()
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                record(clock() - start)
+
+        async_wrapper.histogram = hist
+        return async_wrapper
+
+    @functools.wraps(func)
     def wrapper(*args, **kwargs):
-        start = time.time()
-        result = func(*args, **kwargs)
-        end = time.time()
-        print(f"Execution time: {end - start:.4f} seconds")
-        return result
+        if sample_every > 1 and next(calls) % sample_every:
+            return func(*args, **kwargs)
+        start = clock()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            record(clock() - start)
+
+    wrapper.histogram = hist
     return wrapper
 
 @timer
@@ -65,6 +182,9 @@ def heavy_computation():
     time.sleep(1.5) # Simulating work
     return "Done!"
 
-heavy_computation()
+if __name__ == "__main__":
+    heavy_computation()
+    print(metrics.registry.to_text())
+    print(fib(30), fib.cache_info())
 
 
@@ -0,0 +1,118 @@
+# Small latency metrics registry used by the `timer` decorator.
+#
+# Every timed function gets one Histogram with FIXED power-of-two buckets:
+# a value of `ns` nanoseconds goes to bucket ns.bit_length(), so bucket i
+# holds [2**(i-1), 2**i).  Recording a call is one bit_length(), one list
+# increment and two integer updates, no lock and no per-call allocation,
+# so the timer can stay on in a hot path.  (Without a lock two threads can
+# very rarely lose an update, which is fine for latency statistics.)
+import json
+import threading
+import time
+
+N_BUCKETS = 65  # enough for anything up to 2**64 ns
+
+
+class Histogram:
+    """Fixed-bucket latency histogram (values in nanoseconds)."""
+
+    __slots__ = ("name", "counts", "total", "max")
+
+    def __init__(self, name):
+        self.name = name
+        self.counts = [0] * N_BUCKETS
+        self.total = 0
+        self.max = 0
+
+    def record(self, ns):
+        self.counts[ns.bit_length()] += 1
+        self.total += ns
+        if ns > self.max:
+            self.max = ns
+
+    @property
+    def count(self):
+        return sum(self.counts)
+
+    def percentile(self, p, counts=None):
+        """Upper bound of the bucket holding the p-th percentile (0-100)."""
+        counts = counts or list(self.counts)
+        total = sum(counts)
+        if total == 0:
+            return 0
+        rank = total * p / 100.0
+        seen = 0
+        for i, c in enumerate(counts):
+            seen += c
+            if c and seen >= rank:
+                return min((1 << i) - 1, self.max)
+        return self.max
+
+    def reset(self):
+        for i in range(len(self.counts)):
+            self.counts[i] = 0
+        self.total = self.max = 0
+
+    def snapshot(self):
+        counts = list(self.counts)
+        count = sum(counts)
+        return {
+            "count": count,
+            "mean_ns": self.total // count if count else 0,
+            "p50_ns": self.percentile(50, counts),
+            "p95_ns": self.percentile(95, counts),
+            "p99_ns": self.percentile(99, counts),
+            "max_ns": self.max,
+        }
+
+
+class MetricsRegistry:
+    """Holds one Histogram per name, created on first use."""
+
+    def __init__(self):
+        self._histograms = {}
+        self._lock = threading.Lock()
+
+    def histogram(self, name):
+        h = self._histograms.get(name)
+        if h is None:
+            with self._lock:
+                h = self._histograms.setdefault(name, Histogram(name))
+        return h
+
+    def reset(self):
+        for h in list(self._histograms.values()):
+            h.reset()
+
+    def snapshot(self):
+        return {name: h.snapshot() for name, h in sorted(self._histograms.items())}
+
+    def to_json(self, indent=2):
+        return json.dumps(
+            {"taken_at": time.time(), "metrics": self.snapshot()}, indent=indent
+        )
+
+    def to_text(self):
+        lines = [
+            f"{'name':<32} {'count':>8} {'p50':>10} {'p95':>10} {'p99':>10} {'max':>10}"
+        ]
+        for name, s in self.snapshot().items():
+            lines.append(
+                f"{name:<32} {s['count']:>8} {_fmt(s['p50_ns']):>10} "
+                f"{_fmt(s['p95_ns']):>10} {_fmt(s['p99_ns']):>10} {_fmt(s['max_ns']):>10}"
+            )
+        return "\n".join(lines)
+
+
+def _fmt(ns):
+    if ns < 1_000:
+        return f"{ns}ns"
+    if ns < 1_000_000:
+        return f"{ns / 1_000:.1f}us"
+    if ns < 1_000_000_000:
+        return f"{ns / 1_000_000:.1f}ms"
+    return f"{ns / 1_000_000_000:.2f}s"
+
+
+# default registry shared by every @timer
+registry = MetricsRegistry()
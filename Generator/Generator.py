@@ -30,28 +30,30 @@ for value in simple_generator():
 squared_number =[y*y for y in range(6)]
 print(f"Comprehension Equivalent : {squared_number}")
 
-import time 
+from follower import FileFollower
 
 # File Tailling 
+# follow() used to readline() in a loop and sleep 0.1 s when nothing was
+# there.  Now it waits on inotify (see follower.py), reads big chunks and
+# also keeps going after the file is truncated or rotated.
 def follow(file):
-    file.seek(0,2)
-    while (True):
-        line = file.readline()
-        if not line :
-            time.sleep(0.1)
-            continue 
-        yield line 
+    path = getattr(file, "name", file)  # an open file or a path
+    with FileFollower([path]) as follower:
+        for _, lines in follower:
+            for line in lines:
+                yield line 
 
 
-file=open("Generator.md")
+if __name__ == "__main__":
+    file=open("Generator.md")
 
-print(follow(file=file))
+    print(follow(file=file))
 
-of=follow(file=file)
+    of=follow(file=file)
 
-print(type(of))
+    print(type(of))
 
-for line in of:
-    print(line)
-    # if line[:1] == '.':
-    #  break
\ No newline at end of file
+    for line in of:
+        print(line)
+        # if line[:1] == '.':
+        #  break
@@ -0,0 +1,76 @@
+# Benchmark: old polling follow() vs FileFollower
+#  - latency: time from writing a line to the follower yielding it
+#  - idle CPU: CPU time burnt while the file does not change
+# run from this folder:  python bench_follow.py
+import os
+import random
+import resource
+import statistics
+import tempfile
+import threading
+import time
+
+from follower import follow_lines
+
+LINES = 50
+IDLE_SECONDS = 3.0
+
+
+def polling_follow(file):
+    # the original implementation from Generator.py
+    file.seek(0, 2)
+    while True:
+        line = file.readline()
+        if not line:
+            time.sleep(0.1)
+            continue
+        yield line
+
+
+def cpu_seconds():
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    return usage.ru_utime + usage.ru_stime
+
+
+def measure(name, make_follower, path):
+    delays = []
+    started = threading.Event()
+
+    def consume():
+        lines = make_follower(path)
+        started.set()
+        for line in lines:
+            if line.startswith("STOP"):
+                return
+            delays.append(time.perf_counter() - float(line))
+
+    t = threading.Thread(target=consume, daemon=True)
+    t.start()
+    started.wait()
+    time.sleep(0.3)  # let the follower reach end of file
+
+    with open(path, "a") as f:
+        for _ in range(LINES):
+            time.sleep(random.uniform(0.01, 0.05))
+            f.write(f"{time.perf_counter()}\n")
+            f.flush()
+
+        cpu = cpu_seconds()
+        time.sleep(IDLE_SECONDS)
+        idle_cpu = cpu_seconds() - cpu
+
+        f.write("STOP\n")
+    t.join()
+
+    delays_ms = sorted(d * 1000 for d in delays)
+    print(f"{name:<14} lines={len(delays_ms):>3}  "
+          f"p50={statistics.median(delays_ms):7.2f} ms  "
+          f"max={delays_ms[-1]:7.2f} ms  "
+          f"idle CPU={idle_cpu * 1000 / IDLE_SECONDS:6.2f} ms/s")
+
+
+if __name__ == "__main__":
+    path = os.path.join(tempfile.mkdtemp(), "bench.log")
+    open(path, "w").close()
+    measure("polling", lambda p: polling_follow(open(p)), path)
+    measure("FileFollower", follow_lines, path)
@@ -0,0 +1,42 @@
+# Benchmark: list comprehension vs lazy Pipeline, peak memory and speed
+# run from this folder:  python bench_pipeline.py [n_items]
+import sys
+import time
+import tracemalloc
+
+from pipeline import Pipeline
+
+
+def eager(n):
+    squared = [y * y for y in range(n)]
+    odd = [y for y in squared if y % 2]
+    return sum(len(str(y)) for y in odd)
+
+
+def lazy(n):
+    p = Pipeline(range(n)).map(lambda y: y * y).filter(lambda y: y % 2).batch(10_000)
+    total = sum(sum(len(str(y)) for y in batch) for batch in p)
+    return total, p
+
+
+def measure(fn, n):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn(n)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+if __name__ == "__main__":
+    top = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000_000
+    n = top // 100
+    while n <= top:
+        r1, t1, m1 = measure(eager, n)
+        (r2, p), t2, m2 = measure(lazy, n)
+        assert r1 == r2
+        print(f"n={n:>10}  list: {t1:6.2f}s {m1 / 2**20:8.1f} MiB   "
+              f"pipeline: {t2:6.2f}s {m2 / 2**20:8.1f} MiB")
+        n *= 10
+    print(p.report())
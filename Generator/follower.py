@@ -0,0 +1,276 @@
+# Event driven file follower (`tail -F` as a generator)
+#
+# The old `follow()` in Generator.py polls readline() and sleeps 100 ms
+# when there is nothing new.  FileFollower instead:
+#  - blocks on inotify (Linux, through ctypes) until a watched file changes,
+#    and falls back to adaptive polling (10 ms .. 1 s) everywhere else
+#  - reads new data with os.read() in big chunks and yields whole batches
+#    of lines: `for path, lines in follower: ...`
+#  - notices truncation (file got shorter) and logrotate style
+#    rename / recreate (path now points to a different inode)
+#  - follows many files from one thread
+#  - `async for path, lines in follower` gives the same output in asyncio;
+#    the files are closed when that loop ends (or use `async with`)
+import asyncio
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+
+# inotify constants from <sys/inotify.h>
+IN_MODIFY = 0x002
+IN_ATTRIB = 0x004
+IN_CLOSE_WRITE = 0x008
+IN_MOVED_FROM = 0x040
+IN_MOVED_TO = 0x080
+IN_CREATE = 0x100
+IN_DELETE = 0x200
+IN_Q_OVERFLOW = 0x4000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+_WATCH_MASK = (IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM
+               | IN_MOVED_TO | IN_CREATE | IN_DELETE)
+_EVENT = struct.Struct("iIII")  # wd, mask, cookie, len
+
+
+class _Inotify:
+    """Minimal inotify wrapper watching the directories of the files."""
+
+    def __init__(self):
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self._add_watch = libc.inotify_add_watch
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._dirs = {}  # wd -> directory
+
+    def watch_dir(self, directory):
+        wd = self._add_watch(self.fd, os.fsencode(directory), _WATCH_MASK)
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), f"inotify_add_watch({directory}) failed")
+        self._dirs[wd] = directory
+
+    def read_events(self):
+        """Return the set of changed paths, or None if everything may have changed."""
+        changed = set()
+        while True:
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                return changed
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, length = _EVENT.unpack_from(data, offset)
+                offset += _EVENT.size
+                name = data[offset:offset + length].rstrip(b"\0")
+                offset += length
+                if mask & IN_Q_OVERFLOW:
+                    changed = None
+                elif changed is not None and wd in self._dirs and name:
+                    changed.add(os.path.join(self._dirs[wd], os.fsdecode(name)))
+            if changed is None:
+                # drain the rest, the caller rescans every file anyway
+                self.read_events()
+                return None
+
+    def close(self):
+        os.close(self.fd)
+
+
+class _TailedFile:
+    """Read position and partial line of one followed path."""
+
+    def __init__(self, path, chunk_size, from_start):
+        self.path = path
+        self.chunk_size = chunk_size
+        self.fd = None
+        self.inode = None
+        self.pos = 0
+        self.partial = b""
+        self._open(from_start)
+
+    def _open(self, from_start):
+        try:
+            fd = os.open(self.path, os.O_RDONLY)
+        except FileNotFoundError:
+            return False
+        st = os.fstat(fd)
+        self.fd = fd
+        self.inode = (st.st_dev, st.st_ino)
+        self.pos = 0 if from_start else st.st_size
+        os.lseek(fd, self.pos, os.SEEK_SET)
+        return True
+
+    def _drain(self, lines):
+        while True:
+            chunk = os.read(self.fd, self.chunk_size)
+            if not chunk:
+                return
+            self.pos += len(chunk)
+            data = self.partial + chunk
+            end = data.rfind(b"\n") + 1
+            self.partial = data[end:]
+            if end:
+                text = data[:end].decode("utf-8", "replace")
+                lines.extend(line + "\n" for line in text.split("\n")[:-1])
+
+    def read_lines(self):
+        lines = []
+        if self.fd is None:
+            # file did not exist yet (or was rotated away), a new one
+            # is read from its first byte
+            if not self._open(from_start=True):
+                return lines
+        self._drain(lines)
+
+        if os.fstat(self.fd).st_size < self.pos:
+            # truncated in place (copytruncate / "> file")
+            os.lseek(self.fd, 0, os.SEEK_SET)
+            self.pos = 0
+            self.partial = b""
+            self._drain(lines)
+
+        try:
+            st = os.stat(self.path)
+            current = (st.st_dev, st.st_ino)
+        except FileNotFoundError:
+            current = None
+        if current is not None and current != self.inode:
+            # rotated: the old file is fully read, move to the new one
+            if self.partial:
+                lines.append(self.partial.decode("utf-8", "replace"))
+                self.partial = b""
+            self.close()
+            if self._open(from_start=True):
+                self._drain(lines)
+        return lines
+
+    def close(self):
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
+
+
+class FileFollower:
+    """Follow one or more files, yielding (path, [lines]) batches."""
+
+    def __init__(self, paths, from_start=False, chunk_size=256 * 1024,
+                 poll_min=0.01, poll_max=1.0, use_inotify=None, rescan_every=5.0):
+        if isinstance(paths, (str, bytes, os.PathLike)):
+            paths = [paths]
+        self.files = {}
+        for p in paths:
+            path = os.path.abspath(os.fsdecode(p))
+            self.files[path] = _TailedFile(path, chunk_size, from_start)
+        self.poll_min = poll_min
+        self.poll_max = poll_max
+        self.rescan_every = rescan_every
+        self._interval = poll_min
+        self._pending = set(self.files)  # read everything on the first round
+
+        self._inotify = None
+        if use_inotify is None:
+            use_inotify = sys.platform.startswith("linux")
+        if use_inotify:
+            try:
+                self._inotify = _Inotify()
+                for directory in {os.path.dirname(p) for p in self.files}:
+                    self._inotify.watch_dir(directory)
+            except (OSError, AttributeError):
+                if self._inotify is not None:
+                    self._inotify.close()
+                self._inotify = None
+
+    @property
+    def uses_inotify(self):
+        return self._inotify is not None
+
+    def read_ready(self):
+        """Read whatever is new right now, without blocking."""
+        if self._inotify is None:
+            names = self.files
+        else:
+            changed = self._inotify.read_events()
+            names = self.files if changed is None else self._pending | (changed & self.files.keys())
+            self._pending = set()
+        batches = []
+        for path in names:
+            lines = self.files[path].read_lines()
+            if lines:
+                batches.append((path, lines))
+        return batches
+
+    def _poll_delay(self, got_data):
+        # adaptive polling: fast while data flows, slower when idle
+        if got_data:
+            self._interval = self.poll_min
+        else:
+            self._interval = min(self._interval * 2, self.poll_max)
+        return self._interval
+
+    def _rescan_all(self):
+        self._pending = set(self.files)
+
+    def __iter__(self):
+        while True:
+            batches = self.read_ready()
+            yield from batches
+            if self._inotify is None:
+                time.sleep(self._poll_delay(bool(batches)))
+            elif not batches:
+                ready, _, _ = select.select([self._inotify.fd], [], [], self.rescan_every)
+                if not ready:
+                    # safety net for filesystems that miss events
+                    self._rescan_all()
+
+    async def __aiter__(self):
+        loop = asyncio.get_running_loop()
+        wakeup = asyncio.Event()
+        if self._inotify is not None:
+            loop.add_reader(self._inotify.fd, wakeup.set)
+        try:
+            while True:
+                batches = self.read_ready()
+                for batch in batches:
+                    yield batch
+                if self._inotify is None:
+                    await asyncio.sleep(self._poll_delay(bool(batches)))
+                elif not batches:
+                    wakeup.clear()
+                    try:
+                        await asyncio.wait_for(wakeup.wait(), self.rescan_every)
+                    except asyncio.TimeoutError:
+                        self._rescan_all()
+        finally:
+            if self._inotify is not None:
+                loop.remove_reader(self._inotify.fd)
+            self.close()
+
+    def close(self):
+        for f in self.files.values():
+            f.close()
+        if self._inotify is not None:
+            self._inotify.close()
+            self._inotify = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        self.close()
+
+
+def follow_lines(path, **kwargs):
+    """Single file convenience: yield new lines one by one, like follow()."""
+    with FileFollower([path], **kwargs) as follower:
+        for _, lines in follower:
+            yield from lines
@@ -0,0 +1,201 @@
+# Lazy streaming pipeline built from generator stages
+#
+# Every stage is a generator that pulls from the previous one, so only a
+# few items (a batch, a window, the in-flight work of parallel_map) are in
+# memory at any time, even when the source never ends (like follow()).
+#
+#   squares = (Pipeline(range(10**9))
+#              .filter(lambda n: n % 2)
+#              .map(lambda n: n * n)
+#              .batch(1000))
+#   for batch in squares: ...
+#   print(squares.report())   # items and items/s per stage
+#
+# The stage functions (map_items, filter_items, batched, windowed,
+# numpy_chunks, parallel_map) can also be used on their own.
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from itertools import islice
+
+
+def map_items(fn, items):
+    for item in items:
+        yield fn(item)
+
+
+def filter_items(predicate, items):
+    for item in items:
+        if predicate(item):
+            yield item
+
+
+def batched(items, size):
+    """Lists of `size` items (the last one may be shorter)."""
+    if size < 1:
+        raise ValueError("size must be >= 1")
+    it = iter(items)
+    while True:
+        batch = list(islice(it, size))
+        if not batch:
+            return
+        yield batch
+
+
+def windowed(items, size, step=1):
+    """Sliding windows (tuples) of `size` items, moving `step` items at a time."""
+    if size < 1 or step < 1:
+        raise ValueError("size and step must be >= 1")
+    window = deque(maxlen=size)
+    skip = 0
+    for item in items:
+        window.append(item)
+        if len(window) < size:
+            continue
+        if skip == 0:
+            yield tuple(window)
+            skip = step
+        skip -= 1
+
+
+def numpy_chunks(items, chunk_size, dtype=None):
+    """NumPy arrays built from `chunk_size` items at a time."""
+    import numpy as np
+
+    for chunk in batched(items, chunk_size):
+        yield np.asarray(chunk, dtype=dtype)
+
+
+def parallel_map(fn, items, workers=4, max_in_flight=None, executor="thread", ordered=True):
+    """Apply fn on a thread or process pool, with at most `max_in_flight`
+    items submitted and not yet yielded (default 2 x workers)."""
+    max_in_flight = max_in_flight or 2 * workers
+    if executor == "thread":
+        pool, own_pool = ThreadPoolExecutor(max_workers=workers), True
+    elif executor == "process":
+        pool, own_pool = ProcessPoolExecutor(max_workers=workers), True
+    else:
+        pool, own_pool = executor, False  # an executor object from the caller
+
+    pending = deque()
+    try:
+        for item in items:
+            pending.append(pool.submit(fn, item))
+            while len(pending) >= max_in_flight:
+                yield from _take_done(pending, ordered)
+        while pending:
+            yield from _take_done(pending, ordered)
+    finally:
+        for future in pending:
+            future.cancel()
+        if own_pool:
+            pool.shutdown(wait=True)
+
+
+def _take_done(pending, ordered):
+    if ordered:
+        yield pending.popleft().result()
+        return
+    # unordered: hand out whatever finished first
+    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+    for future in done:
+        pending.remove(future)
+        yield future.result()
+
+
+class StageStats:
+    """Throughput counters of one stage."""
+
+    __slots__ = ("name", "items", "first", "last")
+
+    def __init__(self, name):
+        self.name = name
+        self.items = 0
+        self.first = None
+        self.last = None
+
+    @property
+    def rate(self):
+        if not self.items:
+            return 0.0
+        end = self.last if self.last is not None else time.perf_counter()
+        return self.items / (end - self.first) if end > self.first else 0.0
+
+    def as_dict(self):
+        return {"stage": self.name, "items": self.items, "items_per_s": self.rate}
+
+
+def _counted(items, stats):
+    # only a counter per item; the clock is read at the first item and
+    # when the stage ends (or when the rate is asked for)
+    try:
+        for item in items:
+            if stats.first is None:
+                stats.first = time.perf_counter()
+            stats.items += 1
+            yield item
+    finally:
+        if stats.first is not None:
+            stats.last = time.perf_counter()
+
+
+class Pipeline:
+    """Chain of lazy generator stages over `source`."""
+
+    def __init__(self, source, name="source", count=True):
+        self.count = count
+        self.stages = []
+        self._it = iter(source)
+        self._wrap(name)
+
+    def _wrap(self, name):
+        if self.count:
+            stats = StageStats(name)
+            self.stages.append(stats)
+            self._it = _counted(self._it, stats)
+        return self
+
+    def _add(self, name, stage):
+        self._it = stage
+        return self._wrap(name)
+
+    def map(self, fn):
+        return self._add(f"map({_name(fn)})", map_items(fn, self._it))
+
+    def filter(self, predicate):
+        return self._add(f"filter({_name(predicate)})", filter_items(predicate, self._it))
+
+    def batch(self, size):
+        return self._add(f"batch({size})", batched(self._it, size))
+
+    def window(self, size, step=1):
+        return self._add(f"window({size},{step})", windowed(self._it, size, step))
+
+    def to_numpy(self, chunk_size, dtype=None):
+        return self._add(f"to_numpy({chunk_size})", numpy_chunks(self._it, chunk_size, dtype))
+
+    def parallel_map(self, fn, workers=4, max_in_flight=None, executor="thread", ordered=True):
+        stage = parallel_map(fn, self._it, workers, max_in_flight, executor, ordered)
+        return self._add(f"parallel_map({_name(fn)})", stage)
+
+    def __iter__(self):
+        return self._it
+
+    def run(self):
+        """Consume the pipeline, return the number of items at the end."""
+        n = 0
+        for _ in self._it:
+            n += 1
+        return n
+
+    def stats(self):
+        return [s.as_dict() for s in self.stages]
+
+    def report(self):
+        return "\n".join(
+            f"{s.name:<32} {s.items:>12} items {s.rate:>14,.0f} items/s" for s in self.stages
+        )
+
+
+def _name(fn):
+    return getattr(fn, "__name__", type(fn).__name__)
@@ -0,0 +1,18 @@
+import asyncio
+
+from follower import FileFollower
+
+
+def test_async_for_closes_files(tmp_path):
+    path = tmp_path / "app.log"
+    path.write_text("first\n")
+
+    async def read_one(follower):
+        async for batch in follower:
+            return batch
+
+    follower = FileFollower([path], from_start=True)
+    # asyncio.run() finalizes the interrupted async generator before returning
+    assert asyncio.run(read_one(follower)) == (str(path), ["first\n"])
+    assert all(f.fd is None for f in follower.files.values())
+    assert not follower.uses_inotify
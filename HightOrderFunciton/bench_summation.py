@@ -0,0 +1,39 @@
+# Benchmark: loop vs vector vs process-pool summation
+# run from this folder:  python bench_summation.py [max_exponent]
+import sys
+import time
+
+from functionVariable import cube, summation
+
+
+def root(n):
+    return n**0.5
+
+
+def run(method, high, mode):
+    start = time.perf_counter()
+    value = summation(1, high, method, mode=mode)
+    return value, time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    max_exp = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    # the plain loop gets slow quickly, so it stops at 10**7
+    limits = {"loop": 10**7, "vector": 10**max_exp, "process": 10**max_exp}
+
+    for method in (cube, root):
+        print(f"method = {method.__name__}")
+        print(f"  {'high':>12} " + " ".join(f"{m:>10}" for m in limits))
+        for exp in range(4, max_exp + 1):
+            high = 10**exp
+            row, results = [], set()
+            for mode, limit in limits.items():
+                if high > limit:
+                    row.append(f"{'-':>10}")
+                    continue
+                value, secs = run(method, high, mode)
+                results.add(round(value, 3) if isinstance(value, float) else value)
+                row.append(f"{secs:>9.3f}s")
+            print(f"  {high:>12} " + " ".join(row))
+            if method is cube:
+                assert len(results) == 1, "exact paths disagree"
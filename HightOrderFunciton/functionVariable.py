@@ -1,13 +1,150 @@
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+
+
 def squre(n):
     return n**n
 def cube(n):
     return n**3
 
-def summation(low,high,method):
-    sum=0
-    for i in range(high):
-       sum += method(i)
-    return sum
 
-print(summation(1,2,squre))
-print(summation(1,2,cube))
\ No newline at end of file
+# summation(low, high, method) adds method(i) for every i in
+# range(low, high) (high is not included, like range()).  `mode` chooses how it is evaluated:
+#   "loop"    plain Python loop, one call per integer
+#   "vector"  method is called on NumPy arrays of `chunk_size` integers,
+#             so memory stays flat even for huge ranges
+#   "process" the range is split over a process pool, each worker runs
+#             the plain loop (for methods that do not accept arrays)
+#   "auto"    vector if method works on arrays, process for big ranges
+#             (when method can be pickled), loop otherwise
+# Integer results stay exact: a vector chunk that could overflow int64
+# (like n**n) is recomputed with Python integers, on the process pool
+# when there is a lot of such work.
+PROCESS_THRESHOLD = 200_000
+_INT64_SAFE = 2.0**62
+_FLOAT_EXACT = 2.0**53  # every integer below this is exact in float64
+
+
+def _loop_sum(low, high, method):
+    total = 0
+    for i in range(low, high):
+        total += method(i)
+    return total
+
+
+def _vector_kind(method, low):
+    """None if method does not work on arrays, else "int" or "float"."""
+    import numpy as np
+
+    sample = np.arange(low, low + 8, dtype=np.int64)
+    with np.errstate(all="ignore"):
+        try:
+            out = method(sample)
+            # both kinds are evaluated on float64 (see _vector_sum), so that
+            # has to give the same values too (bit operations, for one, do not)
+            as_float = method(sample.astype(np.float64))
+        except Exception:
+            return None
+    if not isinstance(out, np.ndarray) or out.shape != sample.shape:
+        return None
+    expected = [method(int(i)) for i in sample]
+    if not all(a == b for a, b in zip(out.tolist(), expected)):
+        return None
+    if out.dtype.kind in "iu":
+        return "int" if as_float.tolist() == expected else None
+    if np.allclose(as_float, expected, rtol=1e-12, atol=0.0, equal_nan=True):
+        return "float"
+    return None
+
+
+def _picklable(method):
+    try:
+        pickle.dumps(method)
+    except Exception:
+        return False
+    return True
+
+
+def _vector_sum(low, high, method, chunk_size, kind):
+    """Returns (total, ranges that must be recomputed with Python ints)."""
+    import numpy as np
+
+    total = 0
+    overflowed = []
+    for start in range(low, high, chunk_size):
+        stop = min(start + chunk_size, high)
+        # evaluate on float64, where nothing wraps around like int64 does
+        # (n**3 overflows int64 long before float64); too big is inf
+        with np.errstate(over="ignore", invalid="ignore"):
+            values = method(np.arange(start, stop, dtype=np.float64))
+        if kind == "float":
+            total += values.sum().item()
+            continue
+        # integer method: below 2**53 the float values are the exact integers
+        largest = np.abs(values).max(initial=0.0)
+        if largest >= _FLOAT_EXACT:
+            overflowed.append((start, stop))
+            continue
+        values = values.astype(np.int64)
+        if largest * len(values) < _INT64_SAFE:
+            total += int(values.sum())
+        else:
+            # values fit but their sum might not: add small blocks in
+            # int64 and combine the block sums as Python ints
+            block = max(1, int(_INT64_SAFE // max(largest, 1.0)))
+            total += sum(np.add.reduceat(values, np.arange(0, len(values), block)).tolist())
+    return total, overflowed
+
+
+def _split(ranges, pieces):
+    size = sum(e - s for s, e in ranges)
+    step = max(1, -(-size // pieces))
+    return [(a, min(a + step, e)) for s, e in ranges for a in range(s, e, step)]
+
+
+def _process_sum(ranges, method, workers):
+    workers = workers or os.cpu_count() or 1
+    # a few pieces per worker so a slow piece does not hold up the rest
+    bounds = _split(ranges, workers * 4)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_loop_sum, s, e, method) for s, e in bounds]
+        return sum(f.result() for f in futures)
+
+
+def summation(low, high, method, mode="auto", chunk_size=1_000_000, workers=None):
+    if mode not in ("auto", "loop", "vector", "process"):
+        raise ValueError(f"unknown mode: {mode!r}")
+    if high <= low:
+        return 0
+
+    kind = None
+    if mode in ("auto", "vector"):
+        try:
+            kind = _vector_kind(method, low)
+        except ImportError:
+            if mode == "vector":
+                raise
+    if mode == "auto":
+        if kind is not None:
+            mode = "vector"
+        elif high - low >= PROCESS_THRESHOLD and _picklable(method):
+            mode = "process"
+        else:
+            mode = "loop"
+
+    if mode == "vector":
+        total, overflowed = _vector_sum(low, high, method, chunk_size, kind or "float")
+        if sum(e - s for s, e in overflowed) >= PROCESS_THRESHOLD and _picklable(method):
+            return total + _process_sum(overflowed, method, workers)
+        return total + sum(_loop_sum(s, e, method) for s, e in overflowed)
+    if mode == "process":
+        return _process_sum([(low, high)], method, workers)
+    return _loop_sum(low, high, method)
+
+
+if __name__ == "__main__":
+    # high is not included, like range(): squre(1) and cube(1)
+    print(summation(1,2,squre))
+    print(summation(1,2,cube))
+    print(summation(1,11,cube))  # 1**3 + ... + 10**3 = 3025
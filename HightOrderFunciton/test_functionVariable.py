@@ -0,0 +1,37 @@
+import math
+import warnings
+
+import pytest
+
+from functionVariable import cube, squre, summation
+
+
+def half_cube(n):
+    return n**3 / 2
+
+
+def test_half_open_range():
+    assert summation(1, 2, squre) == 1
+    assert summation(1, 11, cube) == 3025
+    assert summation(5, 5, cube) == 0
+
+
+def test_unpicklable_method_in_auto_mode_falls_back_to_loop():
+    assert summation(0, 300_000, lambda n: n % 7, mode="auto") == sum(n % 7 for n in range(300_000))
+
+
+def test_float_method_with_large_stop_does_not_overflow():
+    pytest.importorskip("numpy")
+    # n**3 overflows int64 above ~2.1 million, the float result must not
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        value = summation(1, 3_000_000, half_cube)
+    assert math.isclose(value, summation(1, 3_000_000, half_cube, mode="loop"), rel_tol=1e-9)
+
+
+def test_integer_results_stay_exact():
+    pytest.importorskip("numpy")
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        assert summation(1, 500, squre) == summation(1, 500, squre, mode="loop")
+    assert summation(1, 10**6, cube) == sum(n**3 for n in range(1, 10**6))
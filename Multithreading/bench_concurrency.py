@@ -0,0 +1,380 @@
+# Concurrency benchmark suite: sequential vs threads vs asyncio vs processes
+#
+# run from this folder:  python bench_concurrency.py [--quick] [--out FILE] [--no-plot]
+#
+# The same workloads run under every execution model at growing
+# concurrency:
+#   I/O bound   http       GET from the local stub server (10 ms delay)
+#               file       read a 256 KiB file
+#               sleep      wait 10 ms
+#   CPU bound   slow_feb   slow_feb(20) from Ploting/ploting1.py
+#               summation  summation(1, 100_000, cube, mode="loop") from
+#                          HightOrderFunciton/functionVariable.py
+#   models      sequential, thread (ThreadPoolExecutor), asyncio (gather
+#               with a Semaphore), process (ProcessPoolExecutor)
+#
+# For every run it records throughput (tasks/s), task latency p50/p95/p99
+# (time of one task, measured where it runs), peak RSS of this process
+# plus its children and peak OS thread count.  Results go to a JSON
+# report (concurrency_report.json) and one plot per workload
+# (concurrency_<workload>.png).
+#
+# Under asyncio the I/O workloads use aiohttp / aiofiles / asyncio.sleep;
+# the CPU workloads are plain calls on the event loop, which is what
+# asyncio gives you for CPU work (no overlap).  Pools are created and
+# warmed up before the clock starts.
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import aiofiles
+import aiohttp
+import requests
+
+from stub_server import start_stub_server
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+for _folder in ("Ploting", "HightOrderFunciton"):
+    _path = os.path.join(_HERE, "..", _folder)
+    if _path not in sys.path:
+        sys.path.append(_path)
+
+from functionVariable import cube, summation  # noqa: E402
+from ploting1 import slow_feb  # noqa: E402
+
+MODELS = ("sequential", "thread", "asyncio", "process")
+IO_DELAY = 0.01
+FILE_SIZE = 256 * 1024
+N_FILES = 64
+
+
+# ---------------- workloads ---------------------------------------------
+# sync functions run in the calling thread / worker process and return
+# their own duration, so the latency of a process task is measured inside
+# the worker.  `ctx` is a small dict of plain values (picklable).
+
+_local = threading.local()
+
+
+def _session():
+    session = getattr(_local, "session", None)
+    if session is None:
+        session = _local.session = requests.Session()
+    return session
+
+
+def http_task(ctx, i):
+    start = time.perf_counter()
+    _session().get(f"{ctx['url']}/item/{i}").content
+    return time.perf_counter() - start
+
+
+def file_task(ctx, i):
+    start = time.perf_counter()
+    with open(ctx["files"][i % len(ctx["files"])], "rb") as f:
+        f.read()
+    return time.perf_counter() - start
+
+
+def sleep_task(ctx, i):
+    start = time.perf_counter()
+    time.sleep(IO_DELAY)
+    return time.perf_counter() - start
+
+
+def slow_feb_task(ctx, i):
+    start = time.perf_counter()
+    slow_feb(20)
+    return time.perf_counter() - start
+
+
+def summation_task(ctx, i):
+    start = time.perf_counter()
+    summation(1, 100_000, cube, mode="loop")
+    return time.perf_counter() - start
+
+
+async def http_task_async(ctx, i):
+    start = time.perf_counter()
+    async with ctx["session"].get(f"{ctx['url']}/item/{i}") as response:
+        await response.read()
+    return time.perf_counter() - start
+
+
+async def file_task_async(ctx, i):
+    start = time.perf_counter()
+    async with aiofiles.open(ctx["files"][i % len(ctx["files"])], "rb") as f:
+        await f.read()
+    return time.perf_counter() - start
+
+
+async def sleep_task_async(ctx, i):
+    start = time.perf_counter()
+    await asyncio.sleep(IO_DELAY)
+    return time.perf_counter() - start
+
+
+def _on_loop(task):
+    async def run(ctx, i):
+        return task(ctx, i)
+    return run
+
+
+# name -> (kind, sync task, async task, tasks per run)
+WORKLOADS = {
+    "http": ("io", http_task, http_task_async, 400),
+    "file": ("io", file_task, file_task_async, 2000),
+    "sleep": ("io", sleep_task, sleep_task_async, 400),
+    "slow_feb": ("cpu", slow_feb_task, _on_loop(slow_feb_task), 40),
+    "summation": ("cpu", summation_task, _on_loop(summation_task), 40),
+}
+
+
+# ---------------- resource sampling -------------------------------------
+
+def _proc_status(pid):
+    rss = threads = 0
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    rss = int(line.split()[1]) * 1024
+                elif line.startswith("Threads:"):
+                    threads = int(line.split()[1])
+    except OSError:
+        pass
+    return rss, threads
+
+
+def _children(pid):
+    kids = []
+    try:
+        for tid in os.listdir(f"/proc/{pid}/task"):
+            with open(f"/proc/{pid}/task/{tid}/children") as f:
+                kids.extend(int(k) for k in f.read().split())
+    except OSError:
+        pass
+    return kids
+
+
+class Sampler:
+    """Peak RSS (this process + children) and peak thread count of a run."""
+
+    def __init__(self, interval=0.01):
+        self.interval = interval
+        self.peak_rss = 0
+        self.peak_threads = 0
+        self._has_proc = os.path.exists("/proc/self/status")
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def sample(self):
+        if not self._has_proc:
+            # no /proc: this process only
+            rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+            threads = threading.active_count()
+        else:
+            pid = os.getpid()
+            rss, threads = _proc_status(pid)
+            for kid in _children(pid):
+                kid_rss, kid_threads = _proc_status(kid)
+                rss += kid_rss
+                threads += kid_threads
+        self.peak_rss = max(self.peak_rss, rss)
+        self.peak_threads = max(self.peak_threads, threads)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.sample()
+
+    def __enter__(self):
+        self.sample()
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.sample()
+
+
+# ---------------- execution models --------------------------------------
+
+def run_sequential(task, ctx, n, concurrency):
+    return [task(ctx, i) for i in range(n)]
+
+
+def run_thread(task, ctx, n, concurrency, pool):
+    return list(pool.map(task, [ctx] * n, range(n)))
+
+
+def run_process(task, ctx, n, concurrency, pool):
+    chunksize = max(1, n // (concurrency * 4))
+    return list(pool.map(task, [ctx] * n, range(n), chunksize=chunksize))
+
+
+async def _run_asyncio(task, ctx, n, concurrency):
+    limit = asyncio.Semaphore(concurrency)
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        actx = dict(ctx, session=session)
+
+        async def one(i):
+            async with limit:
+                return await task(actx, i)
+        return await asyncio.gather(*(one(i) for i in range(n)))
+
+
+def run_asyncio(task, ctx, n, concurrency):
+    return asyncio.run(_run_asyncio(task, ctx, n, concurrency))
+
+
+def _noop(x):
+    return x
+
+
+def measure(workload, model, concurrency, ctx, n):
+    kind, sync_task, async_task, _ = WORKLOADS[workload]
+    pool = None
+    if model == "thread":
+        pool = ThreadPoolExecutor(concurrency)
+    elif model == "process":
+        # spawn: forked workers would share the keep-alive sockets and
+        # locks of this process
+        pool = ProcessPoolExecutor(concurrency, mp_context=multiprocessing.get_context("spawn"))
+    if pool is not None:
+        list(pool.map(_noop, range(concurrency * 2)))  # start the workers
+    try:
+        with Sampler() as sampler:
+            start = time.perf_counter()
+            if model == "sequential":
+                latencies = run_sequential(sync_task, ctx, n, concurrency)
+            elif model == "thread":
+                latencies = run_thread(sync_task, ctx, n, concurrency, pool)
+            elif model == "process":
+                latencies = run_process(sync_task, ctx, n, concurrency, pool)
+            else:
+                latencies = run_asyncio(async_task, ctx, n, concurrency)
+            elapsed = time.perf_counter() - start
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    latencies = sorted(latencies)
+
+    def pct(q):
+        return latencies[min(int(len(latencies) * q), len(latencies) - 1)] * 1000
+
+    return {
+        "workload": workload, "kind": kind, "model": model, "concurrency": concurrency,
+        "tasks": n, "seconds": elapsed, "throughput": n / elapsed,
+        "p50_ms": pct(0.50), "p95_ms": pct(0.95), "p99_ms": pct(0.99),
+        "peak_rss_mib": sampler.peak_rss / 2**20, "peak_threads": sampler.peak_threads,
+    }
+
+
+# ---------------- report ------------------------------------------------
+
+def plot(results, prefix):
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    files = []
+    for workload in dict.fromkeys(r["workload"] for r in results):
+        rows = [r for r in results if r["workload"] == workload]
+        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(11, 4))
+        for model in MODELS:
+            points = [r for r in rows if r["model"] == model]
+            if not points:
+                continue
+            xs = [r["concurrency"] for r in points]
+            ax1.plot(xs, [r["throughput"] for r in points], marker="o", label=model)
+            ax2.plot(xs, [r["p99_ms"] for r in points], marker="o", label=model)
+        for ax, label in ((ax1, "tasks / s"), (ax2, "p99 task latency (ms)")):
+            ax.set_xscale("log", base=2)
+            ax.set_yscale("log")
+            ax.set_xlabel("concurrency")
+            ax.set_ylabel(label)
+            ax.grid(True, which="both", alpha=0.3)
+        ax1.legend()
+        fig.suptitle(f"{workload} ({rows[0]['kind']} bound)")
+        fig.tight_layout()
+        name = f"{prefix}_{workload}.png"
+        fig.savefig(name)
+        plt.close(fig)
+        files.append(name)
+    return files
+
+
+def format_table(results):
+    out = [f"{'workload':<10} {'model':<10} {'conc':>4} {'tasks/s':>9} {'p50 ms':>8} "
+           f"{'p99 ms':>8} {'rss MiB':>8} {'threads':>7}"]
+    for r in results:
+        out.append(f"{r['workload']:<10} {r['model']:<10} {r['concurrency']:>4} "
+                   f"{r['throughput']:>9.1f} {r['p50_ms']:>8.2f} {r['p99_ms']:>8.2f} "
+                   f"{r['peak_rss_mib']:>8.0f} {r['peak_threads']:>7}")
+    return "\n".join(out)
+
+
+def make_files(folder):
+    files = []
+    for i in range(N_FILES):
+        path = os.path.join(folder, f"data_{i}.bin")
+        with open(path, "wb") as f:
+            f.write(os.urandom(FILE_SIZE))
+        files.append(path)
+    return files
+
+
+def run_suite(workloads, levels, quick=False):
+    server = start_stub_server(delay=IO_DELAY, body_size=10_000)
+    results = []
+    with tempfile.TemporaryDirectory(prefix="concurrency-") as folder:
+        ctx = {"url": server.url, "files": make_files(folder)}
+        for workload in workloads:
+            n = WORKLOADS[workload][3] // (4 if quick else 1)
+            for model in MODELS:
+                # concurrency means nothing for sequential: run it once
+                for concurrency in ([1] if model == "sequential" else levels):
+                    if model == "process" and concurrency > 4 * (os.cpu_count() or 1):
+                        continue
+                    r = measure(workload, model, concurrency, ctx, n)
+                    print(f"  {workload:<10} {model:<10} x{concurrency:<3} "
+                          f"{r['throughput']:9.1f} tasks/s  p99 {r['p99_ms']:8.2f} ms", flush=True)
+                    results.append(r)
+    server.shutdown()
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--quick", action="store_true", help="fewer tasks and levels")
+    parser.add_argument("--workloads", default=",".join(WORKLOADS))
+    parser.add_argument("--out", default="concurrency_report.json")
+    parser.add_argument("--no-plot", action="store_true")
+    args = parser.parse_args()
+
+    levels = [1, 4, 16] if args.quick else [1, 4, 16, 64]
+    results = run_suite(args.workloads.split(","), levels, args.quick)
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "gil": getattr(sys, "_is_gil_enabled", lambda: True)(),
+        "results": results,
+    }
+    with open(args.out, "w") as f:
+        json.dump(report, f, indent=2)
+    print(format_table(results))
+    print(f"report written to {args.out}")
+    if not args.no_plot:
+        print("plots:", ", ".join(plot(results, os.path.splitext(args.out)[0])))
@@ -0,0 +1,67 @@
+# Benchmark: unsafe global counter vs one shared Lock vs ShardedCounter
+# run from this folder:  python bench_counter.py [increments_per_thread]
+import sys
+import threading
+import time
+
+from sharded_counter import ShardedCounter
+
+
+def run_threads(n_threads, target):
+    threads = [threading.Thread(target=target) for _ in range(n_threads)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return time.perf_counter() - start
+
+
+def unsafe(n_threads, n):
+    box = {"count": 0}
+
+    def work():
+        for _ in range(n):
+            box["count"] += 1
+    return run_threads(n_threads, work), box["count"]
+
+
+def shared_lock(n_threads, n):
+    box = {"count": 0}
+    lock = threading.Lock()
+
+    def work():
+        for _ in range(n):
+            with lock:
+                box["count"] += 1
+    return run_threads(n_threads, work), box["count"]
+
+
+def sharded(n_threads, n, exact):
+    counter = ShardedCounter(exact=exact)
+
+    def work():
+        add = counter.add
+        for _ in range(n):
+            add()
+    return run_threads(n_threads, work), counter.value
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    kinds = {
+        "unsafe": unsafe,
+        "shared Lock": shared_lock,
+        "sharded relaxed": lambda t, n: sharded(t, n, False),
+        "sharded exact": lambda t, n: sharded(t, n, True),
+    }
+    gil = getattr(sys, "_is_gil_enabled", lambda: True)()
+    print(f"GIL enabled: {gil}, {n} increments per thread")
+    print(f"{'threads':>7} " + " ".join(f"{k:>22}" for k in kinds))
+    for n_threads in (1, 2, 4, 8, 16, 32, 64):
+        row = []
+        for fn in kinds.values():
+            elapsed, value = fn(n_threads, n)
+            ok = "ok" if value == n_threads * n else "LOST"
+            row.append(f"{n_threads * n / elapsed / 1e6:8.2f} M/s {ok:>4}")
+        print(f"{n_threads:>7} " + " ".join(f"{r:>22}" for r in row))
@@ -0,0 +1,51 @@
+# Benchmark: sequential vs thread-per-URL vs Fetcher, against a local stub
+# run from this folder:  python bench_fetcher.py [n_urls]
+import sys
+import threading
+import time
+
+import requests
+
+from fetcher import Fetcher
+from stub_server import start_stub_server
+
+
+def sequential(urls):
+    for url in urls:
+        len(requests.get(url).content)
+
+
+def thread_per_url(urls):
+    # the threading5.py way
+    threads = [threading.Thread(target=lambda u=url: len(requests.get(u).content)) for url in urls]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+
+def pooled(urls, workers, per_host):
+    with Fetcher(workers=workers, per_host=per_host) as fetcher:
+        results = list(fetcher.fetch_all(urls))
+    assert all(r.status == 200 for r in results)
+
+
+def run(name, fn, urls, server):
+    before = server.requests
+    start = time.perf_counter()
+    fn(urls)
+    elapsed = time.perf_counter() - start
+    print(f"{name:<30} {elapsed:7.2f} s  {len(urls) / elapsed:8.0f} req/s  "
+          f"(server saw {server.requests - before})")
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    server = start_stub_server(delay=0.01, body_size=10_000)
+    urls = [f"{server.url}/page/{i}" for i in range(n)]
+    run("sequential", sequential, urls[: n // 10], server)
+    run("thread per URL", thread_per_url, urls, server)
+    for workers in (8, 32):
+        run(f"Fetcher workers={workers} per_host={workers}",
+            lambda u: pooled(u, workers, workers), urls, server)
+    server.shutdown()
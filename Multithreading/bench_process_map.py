@@ -0,0 +1,76 @@
+# Benchmark: sequential vs threads vs ProcessMap (process_map.py)
+# run from this folder:  python bench_process_map.py [workers]
+#
+#  slow_feb   slow_feb(22) x 120 (CPU bound, a few ms per item)
+#  cube       cube(i) for 1M items (cheap: IPC cost decides)
+#  kernel     a NumPy kernel returning an 8 MiB array, x 64 (result passing)
+#
+# The ProcessMap pool is started before timing and reused by every run.
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from process_map import ProcessMap
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+for _folder in ("Ploting", "HightOrderFunciton"):
+    _path = os.path.join(_HERE, "..", _folder)
+    if _path not in sys.path:
+        sys.path.append(_path)
+
+from functionVariable import cube  # noqa: E402
+from ploting1 import slow_feb  # noqa: E402
+
+
+def slow_feb_22(_):
+    return slow_feb(22)
+
+
+def kernel(seed):
+    rng = np.random.default_rng(seed)
+    x = rng.random(1024 * 1024)  # 8 MiB of float64
+    return np.sqrt(x) * np.sin(x)
+
+
+def run(name, fn):
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    print(f"  {name:<34} {elapsed:7.3f} s")
+    return result
+
+
+if __name__ == "__main__":
+    workers = int(sys.argv[1]) if len(sys.argv) > 1 else (os.cpu_count() or 1)
+    print(f"{os.cpu_count()} CPUs, {workers} workers")
+    pm = ProcessMap(workers).start()
+    no_shm = ProcessMap(workers, shm_threshold=None).start()
+    threads = ThreadPoolExecutor(workers)
+
+    cases = {
+        "slow_feb": (slow_feb_22, range(120)),
+        "cube": (cube, range(1_000_000)),
+        "kernel": (kernel, range(64)),
+    }
+    for name, (fn, items) in cases.items():
+        print(name)
+        expected = run("sequential", lambda: [fn(x) for x in items])
+        # one task per item is so slow for cube that it only gets 10k items
+        few = items if name != "cube" else range(10_000)
+        suffix = "" if name != "cube" else " (10k items)"
+        run("threads" + suffix, lambda: list(threads.map(fn, few)))
+        run("ProcessMap chunksize=1" + suffix, lambda: list(pm.map(fn, few, chunksize=1)))
+        got = run("ProcessMap adaptive", lambda: list(pm.map(fn, items)))
+        run("ProcessMap adaptive, unordered", lambda: sum(1 for _ in pm.map(fn, items, ordered=False)))
+        if name == "kernel":
+            run("ProcessMap without shared memory", lambda: list(no_shm.map(fn, items)))
+            assert all(np.array_equal(a, b) for a, b in zip(got, expected))
+        else:
+            assert got == expected
+    print("stats:", pm.stats)
+    threads.shutdown()
+    pm.close()
+    no_shm.close()
@@ -0,0 +1,107 @@
+# Benchmark: thread per task vs ThreadPoolExecutor vs TaskScheduler
+# run from this folder:  python bench_scheduler.py [n_tasks]
+#
+# "short" tasks do a little work, "delayed" tasks must run after a random
+# delay of 0-1 s.  Thread per task and ThreadPoolExecutor wait for the
+# delay with time.sleep() inside the task (like threading1-3.py); the
+# scheduler uses call_later(), so a waiting task holds no thread.
+# "max rss" is the peak of the whole process so far, so the runs are
+# ordered from small to big.
+import random
+import resource
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from scheduler import TaskScheduler
+
+
+def work(x):
+    return sum(range(x % 50))
+
+
+def sleepy(delay, x):
+    time.sleep(delay)
+    return time.monotonic()
+
+
+def thread_per_task(delays):
+    threads = [threading.Thread(target=sleepy, args=(d, i)) for i, d in enumerate(delays)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+
+# the short task runs keep no futures: the executor queue grows to n
+# items, the scheduler blocks the producer at max_pending
+
+def executor_short(n, workers):
+    with ThreadPoolExecutor(workers) as pool:
+        for i in range(n):
+            pool.submit(work, i)
+
+
+def executor_delayed(delays, workers):
+    with ThreadPoolExecutor(workers) as pool:
+        for f in [pool.submit(sleepy, d, i) for i, d in enumerate(delays)]:
+            f.result()
+
+
+def scheduler_short(n, workers):
+    with TaskScheduler(workers, max_pending=1000) as scheduler:
+        for i in range(n):
+            scheduler.submit(work, i)
+
+
+def scheduler_delayed(delays, workers):
+    lateness = []
+    with TaskScheduler(workers) as scheduler:
+        futures = [(time.monotonic() + d, scheduler.call_later(d, time.monotonic)) for d in delays]
+        for due, f in futures:
+            lateness.append(f.result() - due)
+    lateness.sort()
+    p50 = lateness[len(lateness) // 2] * 1000
+    p99 = lateness[int(len(lateness) * 0.99)] * 1000
+    return f"lateness p50 {p50:.1f} ms  p99 {p99:.1f} ms"
+
+
+def peak_threads(fn, *args):
+    peak = [threading.active_count()]
+    done = threading.Event()
+
+    def watch():
+        while not done.wait(0.005):
+            peak[0] = max(peak[0], threading.active_count())
+
+    watcher = threading.Thread(target=watch)
+    watcher.start()
+    start = time.perf_counter()
+    extra = fn(*args)
+    elapsed = time.perf_counter() - start
+    done.set()
+    watcher.join()
+    return elapsed, peak[0] - 1, extra
+
+
+def run(name, fn, *args):
+    elapsed, threads, extra = peak_threads(fn, *args)
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"{name:<34} {elapsed:7.2f} s  threads {threads:>5}  max rss {rss:6.0f} MiB  {extra or ''}")
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    workers = 12
+    rng = random.Random(1)
+    delays = [rng.random() for _ in range(n)]
+    small = delays[:200]
+
+    print(f"{n} short tasks")
+    run("ThreadPoolExecutor", executor_short, n, workers)
+    run("TaskScheduler", scheduler_short, n, workers)
+    print("delayed tasks (0-1 s)")
+    run("thread per task (200 tasks)", thread_per_task, small)
+    run("ThreadPoolExecutor (200 tasks)", executor_delayed, small, workers)
+    run(f"TaskScheduler ({n} tasks)", scheduler_delayed, delays, workers)
@@ -0,0 +1,140 @@
+# Pooled, bounded concurrency HTTP fetcher
+#
+# threading5.py starts one Thread per URL and calls requests.get() without
+# a Session: no connection reuse, no limit on concurrency, and the whole
+# body is loaded into memory.  Fetcher instead:
+#  - runs a fixed size pool of worker threads
+#  - gives every worker its own requests.Session, so keep-alive
+#    connections are reused between requests to the same host
+#  - allows at most `per_host` requests to one host at a time; URLs for a
+#    busy host wait in a queue without holding a worker thread
+#  - streams bodies in chunks (`on_chunk` callback), with timeouts and an
+#    optional size limit
+#  - returns a Future per URL; fetch_all() yields results in completion order
+#
+#   with Fetcher(workers=16, per_host=4) as fetcher:
+#       for result in fetcher.fetch_all(urls):
+#           print(result.url, result.status, result.nbytes)
+import threading
+import time
+from collections import defaultdict, deque, namedtuple
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+FetchResult = namedtuple("FetchResult", "url status nbytes elapsed body error")
+
+
+class Fetcher:
+    def __init__(self, workers=16, per_host=4, timeout=(3.05, 10), chunk_size=64 * 1024,
+                 max_bytes=None, keep_body=False, headers=None):
+        if workers < 1 or per_host < 1:
+            raise ValueError("workers and per_host must be >= 1")
+        self.per_host = per_host
+        self.timeout = timeout
+        self.chunk_size = chunk_size
+        self.max_bytes = max_bytes
+        self.keep_body = keep_body
+        self.headers = headers or {}
+
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="fetcher")
+        self._local = threading.local()
+        self._sessions = []
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        self._outstanding = 0
+        self._active = defaultdict(int)  # host -> requests running
+        self._waiting = defaultdict(deque)  # host -> [(url, future, on_chunk)]
+
+    def _session(self):
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=16, pool_maxsize=self.per_host)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            session.headers.update(self.headers)
+            self._local.session = session
+            with self._lock:
+                self._sessions.append(session)
+        return session
+
+    def fetch(self, url, on_chunk=None):
+        """Schedule one GET; returns a Future of FetchResult."""
+        future = Future()
+        host = urlsplit(url).netloc
+        with self._lock:
+            self._outstanding += 1
+            if self._active[host] < self.per_host:
+                self._active[host] += 1
+                start_now = True
+            else:
+                self._waiting[host].append((url, future, on_chunk))
+                start_now = False
+        if start_now:
+            self._pool.submit(self._run, host, url, future, on_chunk)
+        return future
+
+    def _run(self, host, url, future, on_chunk):
+        try:
+            if future.set_running_or_notify_cancel():
+                try:
+                    future.set_result(self._get(url, on_chunk))
+                except BaseException as e:  # e.g. raised by on_chunk
+                    future.set_exception(e)
+        finally:
+            # hand the host slot to the next URL waiting for this host
+            with self._lock:
+                waiting = self._waiting[host]
+                nxt = waiting.popleft() if waiting else None
+                if nxt is None:
+                    self._active[host] -= 1
+                self._outstanding -= 1
+                self._idle.notify_all()
+            if nxt is not None:
+                self._pool.submit(self._run, host, *nxt)
+
+    def _get(self, url, on_chunk):
+        start = time.perf_counter()
+        nbytes = 0
+        parts = [] if self.keep_body else None
+        try:
+            with self._session().get(url, stream=True, timeout=self.timeout) as resp:
+                for chunk in resp.iter_content(self.chunk_size):
+                    nbytes += len(chunk)
+                    if on_chunk is not None:
+                        on_chunk(chunk)
+                    if parts is not None:
+                        parts.append(chunk)
+                    if self.max_bytes is not None and nbytes >= self.max_bytes:
+                        break
+                status = resp.status_code
+        except requests.RequestException as e:
+            return FetchResult(url, None, nbytes, time.perf_counter() - start, None, e)
+        body = b"".join(parts) if parts is not None else None
+        return FetchResult(url, status, nbytes, time.perf_counter() - start, body, None)
+
+    def fetch_all(self, urls, on_chunk=None):
+        """Fetch every URL, yield FetchResults as they complete."""
+        futures = [self.fetch(url, on_chunk) for url in urls]
+        for future in as_completed(futures):
+            yield future.result()
+
+    def close(self):
+        # queued URLs are started by finishing ones, so wait for all of
+        # them before the pool stops accepting work
+        with self._idle:
+            self._idle.wait_for(lambda: self._outstanding == 0)
+        self._pool.shutdown(wait=True)
+        with self._lock:
+            sessions, self._sessions = self._sessions, []
+        for session in sessions:
+            session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,211 @@
+# Parallel map on a process pool (the way past the GIL)
+#
+# threading4.py shows that threads do not make CPU bound Python code
+# faster: only one thread runs Python at a time.  ProcessMap runs a pure,
+# module-level function on a pool of worker processes:
+#
+#   with ProcessMap(workers=4) as pm:
+#       fibs = list(pm.map(slow_feb, range(30)))              # in order
+#       for cube_value in pm.map(cube, data, ordered=False):  # as they finish
+#           ...
+#
+#   parallel_map(slow_feb, range(30))   # one shared pool, started once
+#
+#  - items are sent in chunks, so a cheap function does not pay one IPC
+#    round trip per item.  The chunk size adapts: the first chunks are
+#    small, every finished chunk reports how long its items took, and the
+#    next chunks are sized to run about `target_chunk_time` seconds
+#  - at most 2 chunks per worker are in flight, so the input can be a
+#    (long) generator
+#  - a NumPy result of at least `shm_threshold` bytes is not pickled: the
+#    worker copies it into multiprocessing.shared_memory and only the
+#    name, shape and dtype go through the pipe; the parent copies it out
+#    and frees the segment
+#  - the pool stays up between map() calls (worker start-up is paid once)
+#
+# Workers are started with "spawn", so `fn` must be importable (defined at
+# module level, not a lambda).
+import atexit
+import math
+import multiprocessing
+import os
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from multiprocessing import resource_tracker, shared_memory
+
+
+class _SharedArray:
+    """What goes through the pipe instead of a big array."""
+
+    __slots__ = ("name", "shape", "dtype")
+
+    def __init__(self, name, shape, dtype):
+        self.name = name
+        self.shape = shape
+        self.dtype = dtype
+
+
+def _to_shared(array):
+    try:
+        shm = shared_memory.SharedMemory(create=True, size=array.nbytes, track=False)
+    except TypeError:  # Python < 3.13 has no track=
+        shm = shared_memory.SharedMemory(create=True, size=array.nbytes)
+        # the parent unlinks the segment, do not let this process track it
+        resource_tracker.unregister(shm._name, "shared_memory")
+    import numpy as np
+
+    np.ndarray(array.shape, array.dtype, buffer=shm.buf)[...] = array
+    ref = _SharedArray(shm.name, array.shape, array.dtype.str)
+    shm.close()
+    return ref
+
+
+def _from_shared(ref):
+    import numpy as np
+
+    shm = shared_memory.SharedMemory(name=ref.name)
+    try:
+        return np.ndarray(ref.shape, ref.dtype, buffer=shm.buf).copy()
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+def _run_chunk(fn, items, shm_threshold):
+    # runs in the worker process
+    start = time.perf_counter()
+    results = [fn(item) for item in items]
+    elapsed = time.perf_counter() - start
+    if shm_threshold is not None:
+        for i, result in enumerate(results):
+            if (getattr(result, "nbytes", 0) >= shm_threshold and hasattr(result, "dtype")
+                    and not result.dtype.hasobject):
+                results[i] = _to_shared(result)
+    return results, elapsed
+
+
+def _release(ref):
+    try:
+        shm = shared_memory.SharedMemory(name=ref.name)
+    except FileNotFoundError:
+        return
+    shm.close()
+    shm.unlink()
+
+
+def _unpack(results):
+    try:
+        return [_from_shared(r) if type(r) is _SharedArray else r for r in results]
+    except BaseException:
+        _release_all(results)
+        raise
+
+
+def _release_all(results):
+    for r in results:
+        if type(r) is _SharedArray:
+            _release(r)
+
+
+class ProcessMap:
+    def __init__(self, workers=None, target_chunk_time=0.05, max_chunk=10_000,
+                 shm_threshold=1024 * 1024):
+        self.workers = workers or os.cpu_count() or 1
+        self.target_chunk_time = target_chunk_time
+        self.max_chunk = max_chunk
+        self.shm_threshold = shm_threshold
+        self.stats = {"chunks": 0, "items": 0, "shared_arrays": 0}
+        self._pool = None
+
+    def _executor(self):
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                self.workers, mp_context=multiprocessing.get_context("spawn"))
+        return self._pool
+
+    def start(self):
+        """Start the workers now instead of on the first map()."""
+        pool = self._executor()
+        for future in [pool.submit(os.getpid) for _ in range(self.workers)]:
+            future.result()
+        return self
+
+    def map(self, fn, items, ordered=True, chunksize=None):
+        """Yield fn(item) for every item; in input order unless ordered=False.
+
+        chunksize=None adapts the chunk size to the run time of fn.
+        """
+        pool = self._executor()
+        try:
+            n = len(items)
+        except TypeError:
+            n = None
+        # with a known length, keep >= 4 chunks per worker for the tail
+        cap = self.max_chunk if n is None else max(1, min(self.max_chunk, n // (4 * self.workers)))
+        size = chunksize or 1
+        per_item = None
+
+        it = iter(items)
+        pending = deque()  # futures, in submit order
+        try:
+            while True:
+                while len(pending) < 2 * self.workers:
+                    chunk = [item for _, item in zip(range(size), it)]
+                    if not chunk:
+                        break
+                    pending.append(pool.submit(_run_chunk, fn, chunk, self.shm_threshold))
+                if not pending:
+                    break
+                if ordered:
+                    finished = [pending[0]]  # result() below waits for it
+                else:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    finished = [f for f in pending if f in done]
+                for future in finished:
+                    pending.remove(future)
+                    raw, elapsed = future.result()
+                    self.stats["chunks"] += 1
+                    self.stats["items"] += len(raw)
+                    self.stats["shared_arrays"] += sum(type(r) is _SharedArray for r in raw)
+                    if chunksize is None:
+                        # moving average of the time per item -> next chunk size
+                        item_time = elapsed / len(raw)
+                        per_item = item_time if per_item is None else 0.7 * per_item + 0.3 * item_time
+                        wanted = self.target_chunk_time / per_item if per_item > 0 else cap
+                        size = max(1, min(cap, math.ceil(wanted)))
+                    yield from _unpack(raw)
+        finally:
+            # stopped early (break, close() or an exception): chunks that
+            # already ran or are running still made shared segments, and
+            # only this process can unlink them
+            running = [future for future in pending if not future.cancel()]
+            for future in running:
+                try:
+                    raw, _ = future.result()
+                except BaseException:
+                    continue
+                _release_all(raw)
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+_shared = None
+
+
+def parallel_map(fn, items, ordered=True, chunksize=None):
+    """ProcessMap.map() on one pool shared by all calls (closed at exit)."""
+    global _shared
+    if _shared is None:
+        _shared = ProcessMap()
+        atexit.register(_shared.close)
+    return _shared.map(fn, items, ordered, chunksize)
@@ -0,0 +1,305 @@
+# Task scheduler: fixed worker pool + timer wheel
+#
+# threading1.py - threading3.py start one OS thread per task, and those
+# threads mostly sit in time.sleep().  TaskScheduler runs every task on a
+# fixed pool of worker threads instead:
+#  - submit() puts a task in a priority queue (lower number runs first)
+#    and returns a concurrent.futures.Future (result / exception / cancel)
+#  - call_later() and call_every() put the task in a timer wheel; one
+#    timer thread moves it to the queue when it is due, so a delayed task
+#    holds no thread while it waits
+#  - deadline=seconds: a task that waited longer than that in the queue
+#    (after it was due) is not run, its future gets DeadlineExceeded
+#  - max_pending=N: submit() blocks while N tasks are queued or waiting in
+#    the wheel, so memory stays bounded however many tasks you push
+#
+#   with TaskScheduler(workers=12) as scheduler:
+#       future = scheduler.submit(task, "A", priority=0)
+#       later = scheduler.call_later(2.0, task, "B")
+#       ticker = scheduler.call_every(1.0, print, "tick")
+#       ...
+#       ticker.cancel()
+#
+# The timer wheel has `wheel_size` slots of `tick` seconds each; a timer
+# further away than one turn of the wheel waits for the right number of
+# turns (`rounds`).  Adding and firing a timer is O(1), timers fire at
+# most one tick late (plus scheduling delay).
+import heapq
+import itertools
+import math
+import threading
+import time
+from concurrent.futures import Future
+
+
+class DeadlineExceeded(TimeoutError):
+    pass
+
+
+class _Task:
+    __slots__ = ("fn", "args", "kwargs", "future", "priority", "deadline", "rounds", "periodic")
+
+    def __init__(self, fn, args, kwargs, future, priority, deadline, periodic=None):
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.future = future
+        self.priority = priority
+        self.deadline = deadline  # seconds allowed in the queue, or None
+        self.rounds = 0
+        self.periodic = periodic
+
+
+class Periodic:
+    """Handle of a call_every() task."""
+
+    def __init__(self, interval):
+        self.interval = interval
+        self.runs = 0
+        self.errors = 0
+        self.last_exception = None
+        self.cancelled = False
+        self.next_due = None
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class TaskScheduler:
+    def __init__(self, workers=12, max_pending=None, tick=0.01, wheel_size=512):
+        if workers < 1:
+            raise ValueError("workers must be >= 1")
+        self.tick = tick
+        self.wheel_size = wheel_size
+        self.stats = {"submitted": 0, "completed": 0, "failed": 0,
+                      "cancelled": 0, "expired": 0, "timers": 0}
+        self._slots = threading.BoundedSemaphore(max_pending) if max_pending else None
+        self._seq = itertools.count()
+
+        # ready queue: heap of (priority, seq, due, task)
+        self._ready = []
+        self._work = threading.Condition()
+        self._shutdown = False
+
+        # timer wheel
+        self._wheel = [[] for _ in range(wheel_size)]
+        self._timers = 0
+        self._start = time.monotonic()
+        self._current = 0  # next tick to process
+        self._timer_cond = threading.Condition()
+
+        self._threads = [
+            threading.Thread(target=self._worker, name=f"scheduler-{i}", daemon=True)
+            for i in range(workers)
+        ]
+        self._threads.append(
+            threading.Thread(target=self._timer_loop, name="scheduler-timer", daemon=True)
+        )
+        for t in self._threads:
+            t.start()
+
+    # ---------------- public api ----------------------------------------
+
+    def submit(self, fn, *args, priority=0, deadline=None, **kwargs):
+        """Run fn(*args, **kwargs) on a worker; returns a Future."""
+        task = self._new_task(fn, args, kwargs, priority, deadline)
+        self._push(task, time.monotonic())
+        return task.future
+
+    def call_later(self, delay, fn, *args, priority=0, deadline=None, **kwargs):
+        """Run fn after `delay` seconds; returns a Future."""
+        task = self._new_task(fn, args, kwargs, priority, deadline)
+        self._add_timer(task, time.monotonic() + delay)
+        return task.future
+
+    def call_every(self, interval, fn, *args, priority=0, first_delay=None, **kwargs):
+        """Run fn every `interval` seconds until the handle is cancelled.
+
+        The next run is planned when the previous one has finished, so runs
+        of one periodic task never overlap; missed runs are skipped.
+        """
+        if interval <= 0:
+            raise ValueError("interval must be > 0")
+        handle = Periodic(interval)
+        task = _Task(fn, args, kwargs, None, priority, None, handle)
+        with self._work:
+            if self._shutdown:
+                raise RuntimeError("scheduler is shut down")
+        handle.next_due = time.monotonic() + (interval if first_delay is None else first_delay)
+        self._add_timer(task, handle.next_due)
+        return handle
+
+    def shutdown(self, wait=True, cancel_pending=False):
+        """Stop the scheduler.
+
+        Timers that have not fired yet are cancelled.  Queued tasks still
+        run unless cancel_pending is True.
+        """
+        with self._timer_cond:
+            timers = [entry[0] for slot in self._wheel for entry in slot]
+            self._wheel = [[] for _ in range(self.wheel_size)]
+            self._timers = 0
+        with self._work:
+            self._shutdown = True
+            if cancel_pending:
+                timers.extend(task for _, _, _, task in self._ready)
+                self._ready.clear()
+            self._work.notify_all()
+        with self._timer_cond:
+            self._timer_cond.notify_all()
+        for task in timers:
+            self._cancel(task)
+        if wait:
+            for t in self._threads:
+                t.join()
+
+    def pending(self):
+        """Number of tasks queued or waiting in the timer wheel."""
+        return len(self._ready) + self._timers
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+
+    # ---------------- internals -----------------------------------------
+
+    def _new_task(self, fn, args, kwargs, priority, deadline):
+        if self._slots is not None:
+            self._slots.acquire()
+        if self._shutdown:
+            self._release()
+            raise RuntimeError("scheduler is shut down")
+        self.stats["submitted"] += 1
+        return _Task(fn, args, kwargs, Future(), priority, deadline)
+
+    def _cancel(self, task):
+        if task.future is None:  # periodic
+            return
+        if task.future.cancel():
+            self.stats["cancelled"] += 1
+        self._release()
+
+    def _release(self):
+        if self._slots is not None:
+            self._slots.release()
+
+    def _push(self, task, due):
+        with self._work:
+            heapq.heappush(self._ready, (task.priority, next(self._seq), due, task))
+            self._work.notify()
+
+    def _push_many(self, fired):
+        with self._work:
+            if self._shutdown:
+                # the workers may be gone already
+                for task, _ in fired:
+                    self._cancel(task)
+                return
+            for task, due in fired:
+                heapq.heappush(self._ready, (task.priority, next(self._seq), due, task))
+            self._work.notify(len(fired))
+
+    def _worker(self):
+        while True:
+            with self._work:
+                while not self._ready and not self._shutdown:
+                    self._work.wait()
+                if not self._ready:
+                    return
+                _, _, due, task = heapq.heappop(self._ready)
+            if task.periodic is not None:
+                self._run_periodic(task)
+            else:
+                self._run(task, due)
+
+    def _run(self, task, due):
+        future = task.future
+        try:
+            if not future.set_running_or_notify_cancel():
+                self.stats["cancelled"] += 1
+                return
+            if task.deadline is not None and time.monotonic() - due > task.deadline:
+                self.stats["expired"] += 1
+                future.set_exception(DeadlineExceeded(f"waited more than {task.deadline}s"))
+                return
+            try:
+                result = task.fn(*task.args, **task.kwargs)
+            except BaseException as e:
+                self.stats["failed"] += 1
+                future.set_exception(e)
+            else:
+                self.stats["completed"] += 1
+                future.set_result(result)
+        finally:
+            self._release()
+
+    def _run_periodic(self, task):
+        handle = task.periodic
+        if handle.cancelled:
+            return
+        try:
+            task.fn(*task.args, **task.kwargs)
+        except Exception as e:
+            handle.errors += 1
+            handle.last_exception = e
+        handle.runs += 1
+        if handle.cancelled or self._shutdown:
+            return
+        now = time.monotonic()
+        due = handle.next_due + handle.interval
+        if due < now:  # skip the runs we are too late for
+            due += math.ceil((now - due) / handle.interval) * handle.interval
+        handle.next_due = due
+        self._add_timer(task, due)
+
+    # ---------------- timer wheel ---------------------------------------
+
+    def _add_timer(self, task, due):
+        with self._timer_cond:
+            if self._shutdown:
+                self._cancel(task)
+                return
+            now_tick = int((time.monotonic() - self._start) / self.tick)
+            if not self._timers:
+                # nothing in the wheel: no need to walk the idle ticks
+                self._current = max(self._current, now_tick)
+            tick = max(math.ceil((due - self._start) / self.tick), self._current)
+            task.rounds = (tick - self._current) // self.wheel_size
+            self._wheel[tick % self.wheel_size].append((task, due))
+            self._timers += 1
+            self.stats["timers"] += 1
+            if self._timers == 1:
+                self._timer_cond.notify()
+
+    def _timer_loop(self):
+        while True:
+            fired = []
+            with self._timer_cond:
+                if self._shutdown:
+                    return
+                if not self._timers:
+                    self._timer_cond.wait()
+                    continue
+                now_tick = int((time.monotonic() - self._start) / self.tick)
+                while self._current <= now_tick and self._timers:
+                    index = self._current % self.wheel_size
+                    slot = self._wheel[index]
+                    if slot:
+                        keep = []
+                        for entry in slot:
+                            task = entry[0]
+                            if task.rounds:
+                                task.rounds -= 1
+                                keep.append(entry)
+                            else:
+                                fired.append(entry)
+                        self._wheel[index] = keep
+                        self._timers -= len(slot) - len(keep)
+                    self._current += 1
+                if not fired:
+                    next_tick = self._start + self._current * self.tick
+                    self._timer_cond.wait(max(next_tick - time.monotonic(), 0))
+            if fired:
+                self._push_many(fired)
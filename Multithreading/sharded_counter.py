@@ -0,0 +1,102 @@
+# Sharded counter / accumulator
+#
+# threading4.py shows two ways to count from several threads: without a
+# lock (wrong result) and with a lock (right result, but every increment
+# of every thread fights for the same lock).  ShardedCounter gives every
+# thread its own shard (found through threading.local), so add() only
+# touches memory of the calling thread; reading the value sums the shards.
+#
+#   hits = ShardedCounter()                 # relaxed (default)
+#   hits.add()        # from any thread
+#   hits.value        # sum of all shards
+#
+# exact=False (relaxed): add() takes no lock at all.  Each shard has one
+#   writer (its own thread), so no update is ever lost, also on
+#   free-threaded (no-GIL) CPython; a read while threads are still adding
+#   may miss the adds that are in progress.
+# exact=True: every shard has its own lock (never contended by other
+#   adders); a read takes all shard locks, so it returns a consistent
+#   snapshot of every add() that finished before it.
+#
+# Shards of threads that have ended stay in the list, so their counts
+# are never lost.
+import threading
+
+
+class _Shard:
+    __slots__ = ("value", "lock")
+
+    def __init__(self, exact):
+        self.value = 0
+        self.lock = threading.Lock() if exact else None
+
+
+class ShardedCounter:
+    def __init__(self, exact=False):
+        self.exact = exact
+        self._local = threading.local()
+        self._shards = []
+        self._shards_lock = threading.Lock()
+
+    def _new_shard(self):
+        shard = _Shard(self.exact)
+        with self._shards_lock:
+            self._shards.append(shard)
+        self._local.shard = shard
+        return shard
+
+    def add(self, n=1):
+        try:
+            shard = self._local.shard
+        except AttributeError:
+            shard = self._new_shard()
+        if shard.lock is None:
+            shard.value += n
+        else:
+            with shard.lock:
+                shard.value += n
+
+    increment = add
+
+    @property
+    def value(self):
+        with self._shards_lock:
+            shards = list(self._shards)
+        if not self.exact:
+            return sum(shard.value for shard in shards)
+        for shard in shards:
+            shard.lock.acquire()
+        try:
+            return sum(shard.value for shard in shards)
+        finally:
+            for shard in shards:
+                shard.lock.release()
+
+    def reset(self):
+        """Set the counter back to 0, returns the value it had.
+
+        In relaxed mode only call this while no thread is adding.
+        """
+        with self._shards_lock:
+            shards = list(self._shards)
+        total = 0
+        for shard in shards:
+            if shard.lock is None:
+                total += shard.value
+                shard.value = 0
+            else:
+                with shard.lock:
+                    total += shard.value
+                    shard.value = 0
+        return total
+
+    @property
+    def shards(self):
+        return len(self._shards)
+
+    def __int__(self):
+        return int(self.value)
+
+    def __repr__(self):
+        mode = "exact" if self.exact else "relaxed"
+        return f"<ShardedCounter {mode} value={self.value} shards={self.shards}>"
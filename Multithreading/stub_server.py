@@ -0,0 +1,62 @@
+# Local HTTP stand-in for benchmarks (instead of google.com / python.org)
+#
+#   server = start_stub_server(delay=0.01, body_size=10_000)
+#   url = server.url + "/page/1"
+#   ...
+#   server.shutdown()
+#
+# Every GET waits `delay` seconds (a slow upstream) and returns
+# `body_size` bytes.  HTTP/1.1 with Content-Length, so clients can keep
+# the connection alive.
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        # headers and body go out in two writes; without this Nagle and
+        # delayed ACKs add ~40 ms to every keep-alive request
+        self.request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def do_GET(self):
+        server = self.server
+        with server.stats_lock:
+            server.requests += 1
+        if server.delay:
+            time.sleep(server.delay)
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain")
+        self.send_header("Content-Length", str(len(server.body)))
+        self.end_headers()
+        self.wfile.write(server.body)
+
+    def log_message(self, *args):
+        pass  # keep benchmark output clean
+
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024
+
+    def __init__(self, delay, body_size, port=0):
+        super().__init__(("127.0.0.1", port), _Handler)
+        self.delay = delay
+        self.body = b"x" * body_size
+        self.requests = 0
+        self.stats_lock = threading.Lock()
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+
+def start_stub_server(delay=0.01, body_size=10_000, port=0):
+    server = StubServer(delay, body_size, port)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
@@ -22,3 +22,22 @@ thread1.join()
 thread2.join()
 
 print("Main thread: all done.")
+
+
+# ---------- Same tasks on a worker pool (see scheduler.py) ----------
+# "finishing" is planned 2 seconds later with call_later(), so no
+# thread sleeps while the I/O is pending
+from scheduler import TaskScheduler
+
+def finish(name):
+    print(f"Task {name}: finishing.")
+
+with TaskScheduler(workers=2) as scheduler:
+    futures = []
+    for name in ("A", "B"):
+        print(f"Task {name}: starting...")
+        futures.append(scheduler.call_later(2, finish, name))
+    print("Main thread: doing other work concurrently.")
+    for f in futures:
+        f.result()
+print("Main thread: all done.")
@@ -26,7 +26,18 @@ for i in range(5):
  thread.append(t) 
 
 for i in thread:
-  t.join()
+  i.join()
 
 
+# ----------- Worker pool (see scheduler.py) ----------------------
+# the 5 sleeps wait in the timer wheel of the scheduler, no thread
+# is sleeping; gist_done runs on one of 2 workers when it is due
+from scheduler import TaskScheduler
 
+def gist_done(i):
+    print(f" Sleep {i} done")
+    return i
+
+with TaskScheduler(workers=2) as scheduler:
+    futures = [scheduler.call_later(5, gist_done, i) for i in range(5)]
+    print("results:", [f.result() for f in futures])
@@ -39,3 +39,18 @@ t2.join()
 t3.join()
 #-------------main thread work ----------------
 print(" Main thread is doing other work ")
+
+
+#---------- Same activities on a worker pool (see scheduler.py) -------------
+# 3 timers in the timer wheel and 1 worker thread, still max(8,5,3)=8 seconds
+from scheduler import TaskScheduler
+
+with TaskScheduler(workers=1) as scheduler:
+    done = [
+        scheduler.call_later(8, print, " Walking is done "),
+        scheduler.call_later(5, print, " Running is done "),
+        scheduler.call_later(3, print, " Swimming is done "),
+    ]
+    print(" Main thread is doing other work ")
+    for f in done:
+        f.result()
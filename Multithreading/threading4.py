@@ -19,13 +19,34 @@ print("Final counter without lock:", counter)  # Likely incorrect
 
 # ----------------With Lock ----------------------
 
+# ONE lock shared by all threads (a new Lock() per iteration protects nothing)
+lock = threading.Lock()
+counter = 0
+
 def with_lock():
     global counter 
     for _ in range(100000):
-        with threading.Lock():
+        with lock:
             counter += 1
 
 threads=[threading.Thread(target=with_lock) for _ in range(3)]
 for t in threads : t.start()
 for t in threads : t.join()
-print("Final counter with lock:", counter)  # Should be correct
\ No newline at end of file
+print("Final counter with lock:", counter)  # Should be correct
+
+
+# ---------------- Sharded counter ----------------------
+# every thread adds to its own shard, no lock to fight over,
+# the shards are summed when the value is read (sharded_counter.py)
+from sharded_counter import ShardedCounter
+
+hits = ShardedCounter()
+
+def with_shards():
+    for _ in range(100000):
+        hits.add()
+
+threads=[threading.Thread(target=with_shards) for _ in range(3)]
+for t in threads : t.start()
+for t in threads : t.join()
+print("Final counter with shards:", hits.value)  # Always correct
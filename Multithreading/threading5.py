@@ -28,4 +28,15 @@ for url in urls:
 # Wait for all workers to finish
 for t in threads:
     t.join()
-print(f"Multithreaded Time: {time.time() - start:.2f}s")
\ No newline at end of file
+print(f"Multithreaded Time: {time.time() - start:.2f}s")
+
+# --- VERSION 3: Worker pool + keep-alive sessions (see fetcher.py) ---
+# a fixed number of threads, at most 4 requests per host at a time,
+# connections are reused and bodies are streamed in chunks
+from fetcher import Fetcher
+
+start = time.time()
+with Fetcher(workers=8, per_host=4) as fetcher:
+    for result in fetcher.fetch_all(urls):
+        print(f"Finished {result.url}: {result.nbytes} bytes (status {result.status})")
+print(f"Pooled Time: {time.time() - start:.2f}s")
@@ -0,0 +1,302 @@
+# Appendable, memory-mapped array store (np.save / np.load for big data)
+#
+# np.save writes a whole array at once and np.load reads the whole file
+# into RAM.  ArrayStore keeps ONE growing .npy file on disk:
+#
+#   store = ArrayStore.create("data.npy", dtype="float32", row_shape=(8,))
+#   store.append(rows)                 # rows.shape == (n, 8), any n, many times
+#   store.close()
+#
+#   store = ArrayStore("data.npy")     # opening reads only the header
+#   store[10_000_000]                  # one row, read through mmap
+#   store[5:9, 2]                      # slices are views of the file (no copy)
+#   store.take([7, 3, 99])             # random rows
+#   store.reduce("mean")               # sum / mean / min / max, per column
+#   np.load("data.npy", mmap_mode="r") # still a normal .npy file
+#
+#  - the .npy header is written with room to spare, so after every append
+#    only the shape in the header is rewritten and the file stays valid
+#  - a small index (data.npy.index.npz) keeps per block (`block_rows`
+#    rows) the count, sum, min and max of every column.  Row i lives in
+#    block i // block_rows at byte header + i * row_bytes; reductions use
+#    the stats of whole blocks and only read the partial blocks at the
+#    edges, so reducing 10 GB takes milliseconds.  scan=True reads
+#    everything in chunks instead (memory stays at one chunk)
+#  - the index is written on flush() / close(); when it is missing or
+#    behind the data it is rebuilt from the file on open
+import os
+import struct
+
+import numpy as np
+
+HEADER_SIZE = 256  # bytes, multiple of 64 so the data is aligned
+MAGIC = b"\x93NUMPY\x01\x00"
+OPS = ("sum", "mean", "min", "max")
+
+
+def _header(dtype, shape):
+    text = repr({"descr": np.lib.format.dtype_to_descr(dtype), "fortran_order": False,
+                 "shape": tuple(shape)}).encode("latin1")
+    pad = HEADER_SIZE - len(MAGIC) - 2 - len(text) - 1
+    if pad < 0:
+        raise ValueError("row_shape too long for the header")
+    return MAGIC + struct.pack("<H", HEADER_SIZE - len(MAGIC) - 2) + text + b" " * pad + b"\n"
+
+
+def _read_header(f):
+    version = np.lib.format.read_magic(f)
+    if version == (1, 0):
+        shape, fortran, dtype = np.lib.format.read_array_header_1_0(f)
+    else:
+        shape, fortran, dtype = np.lib.format.read_array_header_2_0(f)
+    if fortran:
+        raise ValueError("Fortran ordered .npy files can not be appended to")
+    return shape, dtype, f.tell()
+
+
+def _acc_dtype(dtype):
+    # sums are kept in 64 bit so they do not overflow / lose precision
+    if dtype.kind in "fc":
+        return np.complex128 if dtype.kind == "c" else np.float64
+    if dtype.kind == "u":
+        return np.uint64
+    if dtype.kind in "ib":
+        return np.int64
+    return None  # no stats for strings / records
+
+
+class ArrayStore:
+    def __init__(self, path, mode="r+", block_rows=65536):
+        """Open an existing .npy file (written by ArrayStore or np.save)."""
+        self.path = os.fspath(path)
+        self.mode = mode
+        self._file = open(self.path, "rb" if mode == "r" else "r+b")
+        shape, self.dtype, self.offset = _read_header(self._file)
+        if not shape:
+            raise ValueError("0-d arrays can not be appended to")
+        self.rows = shape[0]
+        self.row_shape = tuple(shape[1:])
+        self.row_bytes = self.dtype.itemsize * int(np.prod(self.row_shape, dtype=np.int64))
+        self.block_rows = block_rows
+        self._acc = _acc_dtype(self.dtype)
+        self._mmap = None
+        if mode != "r":
+            self._make_appendable()
+        self._load_index()
+
+    @classmethod
+    def create(cls, path, dtype, row_shape=(), block_rows=65536):
+        dtype = np.dtype(dtype)
+        with open(path, "wb") as f:
+            f.write(_header(dtype, (0, *row_shape)))
+        index = os.fspath(path) + ".index.npz"
+        if os.path.exists(index):
+            os.remove(index)  # left over from an older file
+        return cls(path, "r+", block_rows)
+
+    # ---------------- writing -------------------------------------------
+
+    def _make_appendable(self):
+        # np.save pads the header only to the next 64 bytes; move the data
+        # once if the header has no room for bigger shapes
+        data_end = self.offset + self.rows * self.row_bytes
+        if os.path.getsize(self.path) > data_end:
+            self._file.truncate(data_end)  # rows of an append that did not finish
+        if self.offset == HEADER_SIZE:
+            return
+        tmp = self.path + ".tmp"
+        with open(tmp, "wb") as out:
+            out.write(_header(self.dtype, (self.rows, *self.row_shape)))
+            self._file.seek(self.offset)
+            while True:
+                buf = self._file.read(64 * 1024 * 1024)
+                if not buf:
+                    break
+                out.write(buf)
+        self._file.close()
+        os.replace(tmp, self.path)
+        self._file = open(self.path, "r+b")
+        self.offset = HEADER_SIZE
+
+    def append(self, rows):
+        """Append rows (shape (n, *row_shape), or one row of shape row_shape)."""
+        if self.mode == "r":
+            raise ValueError("store is opened read only")
+        rows = np.ascontiguousarray(rows, dtype=self.dtype)
+        if rows.shape == self.row_shape:
+            rows = rows[np.newaxis]
+        elif rows.ndim != len(self.row_shape) + 1 or rows.shape[1:] != self.row_shape:
+            raise ValueError(f"expected a block of shape (n, *{self.row_shape}) or one row "
+                             f"of shape {self.row_shape}, got {rows.shape}")
+        if not len(rows):
+            return
+        self._file.seek(self.offset + self.rows * self.row_bytes)
+        self._file.write(rows.reshape(-1).view(np.uint8))
+        self._add_stats(self.rows, rows)
+        self.rows += len(rows)
+        # the new shape goes into the header only after the data is written
+        self._file.seek(0)
+        self._file.write(_header(self.dtype, (self.rows, *self.row_shape)))
+        self._file.flush()
+        self._mmap = None
+
+    def flush(self):
+        if self.mode != "r":
+            self._file.flush()
+            self._save_index()
+
+    def close(self):
+        if self._file.closed:
+            return
+        self.flush()
+        self._mmap = None
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ---------------- index ---------------------------------------------
+
+    @property
+    def index_path(self):
+        return self.path + ".index.npz"
+
+    def _new_stats(self, rows):
+        return (len(rows), rows.sum(axis=0, dtype=self._acc), rows.min(axis=0), rows.max(axis=0))
+
+    def _add_stats(self, first_row, rows):
+        if self._acc is None:
+            return
+        pos = 0
+        while pos < len(rows):
+            block, in_block = divmod(first_row + pos, self.block_rows)
+            piece = rows[pos:pos + self.block_rows - in_block]
+            stats = self._new_stats(piece)
+            if block < len(self._blocks):
+                n, s, lo, hi = self._blocks[block]
+                stats = (n + stats[0], s + stats[1], np.minimum(lo, stats[2]), np.maximum(hi, stats[3]))
+                self._blocks[block] = stats
+            else:
+                self._blocks.append(stats)
+            pos += len(piece)
+
+    def _load_index(self):
+        self._blocks = []  # per block: (count, sum, min, max)
+        if self._acc is None:
+            return
+        indexed = 0
+        try:
+            with np.load(self.index_path) as idx:
+                if int(idx["block_rows"]) == self.block_rows and int(idx["counts"].sum()) <= self.rows:
+                    self._blocks = [
+                        (int(n), s, lo, hi)
+                        for n, s, lo, hi in zip(idx["counts"], idx["sums"], idx["mins"], idx["maxs"])
+                    ]
+                    indexed = int(idx["counts"].sum())
+        except (OSError, KeyError, ValueError):
+            pass
+        if indexed < self.rows:
+            # missing or stale index: rebuild the blocks from `indexed` on
+            start = indexed - indexed % self.block_rows
+            del self._blocks[start // self.block_rows:]
+            for lo, rows in self.iter_chunks(None, start, use_mmap=False):
+                self._add_stats(lo, rows)
+
+    def _save_index(self):
+        if self._acc is None or not self._blocks:
+            return
+        counts, sums, mins, maxs = zip(*self._blocks)
+        tmp = self.index_path + ".tmp.npz"
+        np.savez(tmp, block_rows=self.block_rows, counts=np.array(counts, dtype=np.int64),
+                 sums=np.stack(sums), mins=np.stack(mins), maxs=np.stack(maxs))
+        os.replace(tmp, self.index_path)
+
+    # ---------------- reading -------------------------------------------
+
+    @property
+    def shape(self):
+        return (self.rows, *self.row_shape)
+
+    def __len__(self):
+        return self.rows
+
+    def array(self):
+        """The whole store as a read only np.memmap (no data is read)."""
+        if self._mmap is None or len(self._mmap) != self.rows:
+            if self.rows == 0:
+                return np.empty(self.shape, self.dtype)
+            self._file.flush()
+            self._mmap = np.memmap(self.path, self.dtype, "r", self.offset, self.shape)
+        return self._mmap
+
+    def __getitem__(self, key):
+        return self.array()[key]
+
+    def take(self, indices):
+        """Rows at `indices` (any order), in that order, as a new array."""
+        indices = np.asarray(indices, dtype=np.int64)
+        order = np.argsort(indices, kind="stable")  # read the file front to back
+        out = np.empty((len(indices), *self.row_shape), self.dtype)
+        out[order] = self.array()[indices[order]]
+        return out
+
+    def iter_chunks(self, chunk_rows=None, start=0, stop=None, use_mmap=True):
+        """Yield (first_row, rows) for at most chunk_rows rows at a time.
+
+        use_mmap=True gives views of the file (no copy, but the pages read
+        stay mapped); False reads every chunk into a new array, so memory
+        stays at one chunk.
+        """
+        chunk_rows = chunk_rows or self.block_rows
+        stop = self.rows if stop is None else min(stop, self.rows)
+        data = self.array() if use_mmap else None
+        for lo in range(start, stop, chunk_rows):
+            hi = min(lo + chunk_rows, stop)
+            if data is not None:
+                yield lo, data[lo:hi]
+            else:
+                self._file.seek(self.offset + lo * self.row_bytes)
+                count = (hi - lo) * self.row_bytes // self.dtype.itemsize
+                rows = np.fromfile(self._file, self.dtype, count)
+                yield lo, rows.reshape((hi - lo, *self.row_shape))
+
+    def reduce(self, op, start=0, stop=None, scan=False, chunk_rows=None):
+        """sum / mean / min / max over rows start:stop, per column."""
+        if op not in OPS:
+            raise ValueError(f"op must be one of {OPS}")
+        stop = self.rows if stop is None else min(stop, self.rows)
+        if stop <= start:
+            raise ValueError("empty range")
+        # (count, value) per piece of the range; value is the sum for
+        # sum / mean, else the min or max
+        field = {"sum": 1, "mean": 1, "min": 2, "max": 3}[op]
+        parts = []
+        pieces = [(start, stop)]
+        if not scan and self._acc is not None:
+            first = -(-start // self.block_rows)  # first whole block
+            last = stop // self.block_rows  # end of the whole blocks
+            if first < last:
+                parts = [(b[0], b[field]) for b in self._blocks[first:last]]
+                pieces = [(start, first * self.block_rows), (last * self.block_rows, stop)]
+        for lo, hi in pieces:
+            for _, rows in self.iter_chunks(chunk_rows, lo, hi, use_mmap=False):
+                if field == 1:
+                    value = rows.sum(axis=0, dtype=self._acc)
+                else:
+                    value = rows.min(axis=0) if op == "min" else rows.max(axis=0)
+                parts.append((len(rows), value))
+
+        if field == 1:
+            total = sum(value for _, value in parts)
+            return total if op == "sum" else total / sum(n for n, _ in parts)
+        combine = np.minimum if op == "min" else np.maximum
+        result = parts[0][1]
+        for _, value in parts[1:]:
+            result = combine(result, value)
+        return result
+
+    def __repr__(self):
+        return f"<ArrayStore {self.path!r} shape={self.shape} dtype={self.dtype}>"
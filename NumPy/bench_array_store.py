@@ -0,0 +1,124 @@
+# Benchmark: np.load vs np.load(mmap_mode="r") vs ArrayStore on a big array
+# run from this folder:  python bench_array_store.py [size_gib] [folder]
+#
+# Writes a float32 array of 16 columns (64 byte rows) with ArrayStore in
+# 1M row appends, then measures in a fresh child process each:
+#   open        time to get an array / store you can index
+#   row access  10k random rows
+#   mean        the mean of every column over all rows
+# and the memory of the child: peak RSS, which also counts file pages
+# mapped by mmap (page cache that the kernel can drop at any time), and
+# private memory (what really has to fit in RAM).  np.load has to read
+# everything into private memory; it runs with an address space limit of
+# 80% of the RAM, so on arrays bigger than that it fails with MemoryError
+# instead of swapping or being killed.  Default size 12 GiB (needs that
+# much free disk).
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from array_store import ArrayStore
+
+COLS = 16
+APPEND_ROWS = 1_000_000
+
+
+def write(path, size_gib):
+    rows = int(size_gib * 1024**3) // (COLS * 4)
+    rng = np.random.default_rng(1)
+    block = rng.random((APPEND_ROWS, COLS), dtype=np.float32)
+    start = time.perf_counter()
+    with ArrayStore.create(path, np.float32, (COLS,)) as store:
+        done = 0
+        while done < rows:
+            n = min(APPEND_ROWS, rows - done)
+            store.append(block[:n] + np.float32(done % 7))  # not all the same rows
+            done += n
+    elapsed = time.perf_counter() - start
+    print(f"append: {rows:,} rows, {rows * COLS * 4 / 2**30:.1f} GiB in {elapsed:.1f} s "
+          f"({rows * COLS * 4 / 2**20 / elapsed:.0f} MiB/s)")
+
+
+def _ram_bytes():
+    with open("/proc/meminfo") as f:
+        for line in f:
+            if line.startswith("MemTotal:"):
+                return int(line.split()[1]) * 1024
+    return None
+
+
+def _memory_mib():
+    # VmHWM: peak RSS, including file pages mapped by mmap (page cache the
+    # kernel can drop); RssAnon: private memory of the process right now
+    found = {}
+    with open("/proc/self/status") as f:
+        for line in f:
+            key = line.split(":")[0]
+            if key in ("VmHWM", "RssAnon"):
+                found[key] = int(line.split()[1]) / 1024
+    return found.get("VmHWM", 0), found.get("RssAnon", 0)
+
+
+def child(method, path):
+    # runs in a fresh process; prints "open_s rows_s mean_s peak_mib anon_mib"
+    t0 = time.perf_counter()
+    if method == "np.load":
+        ram = _ram_bytes()
+        if ram:
+            limit = int(ram * 0.8)
+            resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+        try:
+            data = np.load(path)
+        except MemoryError:
+            print("MemoryError")
+            return
+    elif method == "np.load mmap":
+        data = np.load(path, mmap_mode="r")
+    else:
+        data = ArrayStore(path, "r")
+    t1 = time.perf_counter()
+    idx = np.random.default_rng(2).integers(0, len(data), 10_000)
+    if method.startswith("ArrayStore"):
+        data.take(idx)
+    else:
+        data[np.sort(idx)]
+    t2 = time.perf_counter()
+    if method == "ArrayStore":
+        data.reduce("mean")
+    elif method == "ArrayStore scan":
+        data.reduce("mean", scan=True, chunk_rows=1_000_000)
+    else:
+        data.mean(axis=0, dtype=np.float64)
+    t3 = time.perf_counter()
+    peak, anon = _memory_mib()
+    print(f"{t1 - t0:.4f} {t2 - t1:.4f} {t3 - t2:.4f} {peak:.0f} {anon:.0f}")
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["--child"]:
+        child(sys.argv[2], sys.argv[3])
+        sys.exit()
+
+    size_gib = float(sys.argv[1]) if len(sys.argv) > 1 else 12.0
+    folder = sys.argv[2] if len(sys.argv) > 2 else tempfile.gettempdir()
+    path = os.path.join(folder, "bench_array_store.npy")
+    try:
+        write(path, size_gib)
+        print(f"{'method':<16} {'open':>9} {'10k rows':>9} {'mean':>9} {'peak rss':>10} {'private':>10}")
+        for method in ("np.load", "np.load mmap", "ArrayStore", "ArrayStore scan"):
+            out = subprocess.run([sys.executable, __file__, "--child", method, path],
+                                 capture_output=True, text=True).stdout.split()
+            if len(out) != 5:
+                print(f"{method:<16} failed: {' '.join(out) or 'no output'}")
+                continue
+            o, r, m, peak, anon = map(float, out)
+            print(f"{method:<16} {o:8.3f}s {r:8.3f}s {m:8.3f}s {peak:6.0f} MiB {anon:6.0f} MiB")
+    finally:
+        for p in (path, path + ".index.npz"):
+            if os.path.exists(p):
+                os.remove(p)
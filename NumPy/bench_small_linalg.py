@@ -0,0 +1,84 @@
+# Benchmark: Python loop of np.linalg vs stacked np.linalg vs small_linalg
+# run from this folder:  python bench_small_linalg.py [n_matrices]
+#
+# The loop is timed on the first 100k matrices and scaled up to N (a
+# loop over millions of matrices takes too long to wait for).  "max err"
+# is the largest |A @ inv(A) - I| (inverse) or |A @ x - b| (solve).
+import sys
+import time
+
+import numpy as np
+
+from small_linalg import det, eigvals, inv, solve
+
+LOOP_N = 100_000
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def row(name, seconds, n, err=None):
+    extra = f"  max err {err:.1e}" if err is not None else ""
+    print(f"  {name:<32} {seconds:8.3f} s  {n / seconds / 1e6:8.2f} M matrices/s{extra}")
+
+
+def inv_error(a, a_inv, ok):
+    eye = np.eye(a.shape[-1])
+    return np.abs(np.matmul(a[ok], a_inv[ok]) - eye).max()
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    rng = np.random.default_rng(1)
+    for size in (2, 3):
+        a = rng.standard_normal((n, size, size))
+        b = rng.standard_normal((n, size))
+        a[::1000, -1] = a[::1000, 0]  # every 1000th matrix is singular
+        loop_n = min(n, LOOP_N)
+        print(f"{n:,} matrices of {size}x{size}")
+
+        def loop_inv():
+            out = np.empty((loop_n, size, size))
+            for i in range(loop_n):
+                try:
+                    out[i] = np.linalg.inv(a[i])
+                except np.linalg.LinAlgError:
+                    out[i] = np.nan
+            return out
+        seconds, _ = timed(loop_inv)
+        row("inv: loop of np.linalg.inv", seconds * n / loop_n, n)
+
+        # stacked np.linalg.inv raises on the first singular matrix
+        ok = np.ones(n, bool)
+        ok[::1000] = False
+        seconds, stacked = timed(lambda: np.linalg.inv(a[ok]))
+        row("inv: stacked np.linalg.inv", seconds, n)
+        seconds, (a_inv, singular) = timed(lambda: inv(a))
+        row("inv: small_linalg.inv", seconds, n, inv_error(a, a_inv, ~singular))
+        print(f"  singular found: {singular.sum()} (expected {(~ok).sum()})")
+
+        seconds, _ = timed(lambda: np.linalg.det(a))
+        row("det: stacked np.linalg.det", seconds, n)
+        seconds, _ = timed(lambda: det(a))
+        row("det: small_linalg.det", seconds, n)
+
+        good = a[ok]
+        seconds, _ = timed(lambda: np.linalg.solve(good, b[ok][..., None]))
+        row("solve: stacked np.linalg.solve", seconds, n)
+        seconds, (x, singular) = timed(lambda: solve(a, b))
+        err = np.abs(np.matmul(a[~singular], x[~singular][..., None])[..., 0] - b[~singular]).max()
+        row("solve: small_linalg.solve", seconds, n, err)
+
+        seconds, _ = timed(lambda: np.linalg.eigvals(a))
+        row("eigvals: stacked np.linalg", seconds, n)
+        if size == 2:
+            seconds, _ = timed(lambda: eigvals(a))
+            row("eigvals: small_linalg", seconds, n)
+        sym = a + np.swapaxes(a, -1, -2)
+        seconds, _ = timed(lambda: np.linalg.eigvalsh(sym))
+        row("eigvalsh: stacked np.linalg", seconds, n)
+        seconds, _ = timed(lambda: eigvals(sym, symmetric=True))
+        row("eigvals symmetric: small_linalg", seconds, n)
@@ -123,6 +123,26 @@ loaded_arr = np.load('array.npy')  # Load array from the .npy file
 
 print("Loaded Array:", loaded_arr)
 
+#%% [markdown]
+# # Arrays Bigger than Memory
+# np.load reads the whole file into RAM and np.save can not append.
+# np.load(..., mmap_mode='r') maps the file instead: slicing it reads only
+# the rows you touch.  ArrayStore (array_store.py) keeps one growing .npy
+# file: append rows in chunks, index rows, reduce with a small index.
+
+mapped = np.load('array.npy', mmap_mode='r')  # nothing is read yet
+print("Memory mapped slice:", mapped[1:3])
+
+from array_store import ArrayStore
+
+store = ArrayStore.create('growing.npy', dtype=np.float64, row_shape=(2,))
+for i in range(3):
+    store.append(np.full((4, 2), i))  # 4 new rows each time
+print("Rows:", len(store), "row 5:", store[5])
+print("Column mean:", store.reduce("mean"), "column max:", store.reduce("max"))
+store.close()
+print("Still a normal .npy file:", np.load('growing.npy').shape)
+
 # %% [markdown]
 # # Linear Algebra with NumPy
 
@@ -154,6 +174,21 @@ A_inv = np .linalg.inv(A)
 # where A = [[a, b], [c, d]]
 print("Inverse of Matrix A:\n", A_inv)
 
+#%% [markdown]
+# # Many Small Matrices at Once
+# Calling np.linalg.inv in a loop over a million 2x2 matrices takes
+# seconds.  small_linalg.py takes a stack of matrices, shape (N, 2, 2),
+# and uses the formula above on all of them together.  A singular matrix
+# does not raise: its inverse is NaN and `singular` is True for it.
+from small_linalg import det, eigvals, inv
+
+stack = np.array([A, B, [[1, 2], [2, 4]]])  # the last one is singular
+stack_inv, singular = inv(stack)
+print("Determinants:", det(stack))
+print("Singular:", singular)
+print("Inverse of A again:\n", stack_inv[0])
+print("Eigenvalues:\n", eigvals(stack))
+
 #%% [markdown]  
 # # Eigenvalues and Eigenvectors
 # The eigenvalues and eigenvectors of a matrix A are calculated by solving the characteristic equation:
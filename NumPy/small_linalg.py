@@ -0,0 +1,187 @@
+# Batched linear algebra for many tiny matrices
+#
+# np.linalg.inv(A) on one 2x2 matrix costs a few microseconds, almost all
+# of it call overhead; in a Python loop over a million matrices that is
+# seconds.  These functions take a stack of matrices, shape (..., n, n),
+# and work on all of them at once:
+#
+#   inv(a)          -> (inverse, singular)    singular is a bool mask
+#   solve(a, b)     -> (x, singular)          b: (..., n) or (..., n, k)
+#   det(a)          -> determinants
+#   eigvals(a)      -> eigenvalues (..., n)
+#
+# For 2x2 and 3x3 the closed forms are written out with NumPy array
+# operations (the 2x2 inverse is the formula from numpy1.py:
+# 1/(ad-bc) * [[d, -b], [-c, a]]; the 3x3 one is the adjugate / det).
+# Other sizes use the stacked np.linalg functions.
+#
+# A matrix counts as singular when |det| <= rtol * max|a_ij|**n (default
+# rtol = n * machine epsilon) or det is not finite.  Nothing raises: the
+# rows of a singular matrix are NaN and its entry in the mask is True.
+#
+# Eigenvalues: 2x2 in closed form (real or complex pairs); 3x3 with
+# symmetric=True in closed form (trigonometric solution of the cubic);
+# general 3x3 and bigger go to np.linalg.eigvals, because the cubic
+# formula loses too much accuracy on non-symmetric matrices.
+import numpy as np
+
+
+def _as_stack(a):
+    a = np.asarray(a)
+    if a.ndim < 2 or a.shape[-1] != a.shape[-2]:
+        raise ValueError(f"expected a stack of square matrices (..., n, n), got {a.shape}")
+    if a.dtype.kind not in "fc":
+        a = a.astype(np.float64)
+    return a
+
+
+def _det2(a):
+    return a[..., 0, 0] * a[..., 1, 1] - a[..., 0, 1] * a[..., 1, 0]
+
+
+def _cofactors3(a):
+    # c[i][j]: cofactor of a[..., i, j]
+    a00, a01, a02 = a[..., 0, 0], a[..., 0, 1], a[..., 0, 2]
+    a10, a11, a12 = a[..., 1, 0], a[..., 1, 1], a[..., 1, 2]
+    a20, a21, a22 = a[..., 2, 0], a[..., 2, 1], a[..., 2, 2]
+    return (
+        (a11 * a22 - a12 * a21, a12 * a20 - a10 * a22, a10 * a21 - a11 * a20),
+        (a02 * a21 - a01 * a22, a00 * a22 - a02 * a20, a01 * a20 - a00 * a21),
+        (a01 * a12 - a02 * a11, a02 * a10 - a00 * a12, a00 * a11 - a01 * a10),
+    )
+
+
+def det(a):
+    """Determinants of a stack of square matrices, shape (...)."""
+    a = _as_stack(a)
+    n = a.shape[-1]
+    if n == 1:
+        return a[..., 0, 0].copy()
+    if n == 2:
+        return _det2(a)
+    if n == 3:
+        c = _cofactors3(a)
+        return a[..., 0, 0] * c[0][0] + a[..., 0, 1] * c[0][1] + a[..., 0, 2] * c[0][2]
+    return np.linalg.det(a)
+
+
+def _singular(a, d, rtol):
+    n = a.shape[-1]
+    if rtol is None:
+        rtol = n * np.finfo(a.dtype).eps
+    scale = np.abs(a).max(axis=(-2, -1)) ** n
+    with np.errstate(invalid="ignore", over="ignore"):
+        return ~np.isfinite(d) | (np.abs(d) <= rtol * scale)
+
+
+def inv(a, rtol=None):
+    """Inverses of a stack of matrices; returns (inverse, singular mask)."""
+    a = _as_stack(a)
+    n = a.shape[-1]
+    if n > 3:
+        return _inv_stacked(a, rtol)
+    d = det(a)
+    singular = _singular(a, d, rtol)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        r = np.where(singular, np.nan, 1.0 / np.where(singular, 1.0, d))
+    out = np.empty_like(a, dtype=np.result_type(a, r))
+    if n == 1:
+        out[..., 0, 0] = r
+    elif n == 2:
+        out[..., 0, 0] = a[..., 1, 1] * r
+        out[..., 0, 1] = -a[..., 0, 1] * r
+        out[..., 1, 0] = -a[..., 1, 0] * r
+        out[..., 1, 1] = a[..., 0, 0] * r
+    else:
+        c = _cofactors3(a)
+        for i in range(3):
+            for j in range(3):
+                out[..., i, j] = c[j][i] * r  # adjugate = transposed cofactors
+    return out, singular
+
+
+def _inv_stacked(a, rtol):
+    sign, logdet = np.linalg.slogdet(a)
+    n = a.shape[-1]
+    if rtol is None:
+        rtol = n * np.finfo(a.dtype).eps
+    with np.errstate(divide="ignore"):
+        log_scale = n * np.log(np.abs(a).max(axis=(-2, -1)))
+    singular = (sign == 0) | ~np.isfinite(logdet) | (logdet <= np.log(rtol) + log_scale)
+    out = np.full_like(a, np.nan)
+    ok = ~singular
+    if ok.any():
+        out[ok] = np.linalg.inv(a[ok])
+    return out, singular
+
+
+def solve(a, b, rtol=None):
+    """Solve a @ x = b for a stack; b is (..., n) or (..., n, k).
+
+    A 1-d b of shape (n,) is one right-hand side shared by the whole stack.
+    Returns (x, singular mask); x is NaN where a is singular.
+    """
+    a = _as_stack(a)
+    b = np.asarray(b)
+    vector = b.ndim == 1 or b.ndim == a.ndim - 1
+    if vector:
+        b = b[..., None]
+    if a.shape[-1] <= 3:
+        a_inv, singular = inv(a, rtol)
+        # x = a_inv @ b written out: np.matmul is slow on stacks of tiny matrices
+        x = sum(a_inv[..., :, j, None] * b[..., None, j, :] for j in range(a.shape[-1]))
+    else:
+        _, singular = _inv_stacked(a, rtol)
+        x = np.full(np.broadcast_shapes(a.shape[:-2], b.shape[:-2]) + b.shape[-2:],
+                    np.nan, dtype=np.result_type(a, b, np.float64))
+        ok = ~singular
+        if ok.any():
+            bb = np.broadcast_to(b, a.shape[:-2] + b.shape[-2:])
+            x[ok] = np.linalg.solve(a[ok], bb[ok])
+    return (x[..., 0] if vector else x), singular
+
+
+def eigvals(a, symmetric=False):
+    """Eigenvalues of a stack of matrices, shape (..., n).
+
+    Real (ascending) when all of them are real, complex otherwise.
+    """
+    a = _as_stack(a)
+    n = a.shape[-1]
+    if n == 2 and a.dtype.kind == "f":
+        return _eigvals2(a)
+    if n == 3 and symmetric and a.dtype.kind == "f":
+        return _eigvals3_symmetric(a)
+    if symmetric:
+        return np.linalg.eigvalsh(a)
+    return np.linalg.eigvals(a)
+
+
+def _eigvals2(a):
+    mean = (a[..., 0, 0] + a[..., 1, 1]) / 2
+    # written as ((a - d) / 2)**2 + b*c instead of mean**2 - det, which
+    # cancels badly when the eigenvalues are close
+    disc = ((a[..., 0, 0] - a[..., 1, 1]) / 2) ** 2 + a[..., 0, 1] * a[..., 1, 0]
+    if (disc >= 0).all():
+        root = np.sqrt(disc)
+        return np.stack([mean - root, mean + root], axis=-1)
+    root = np.sqrt(disc.astype(np.complex128))
+    return np.stack([mean - root, mean + root], axis=-1)
+
+
+def _eigvals3_symmetric(a):
+    # trigonometric solution of the characteristic cubic (real roots only)
+    a00, a11, a22 = a[..., 0, 0], a[..., 1, 1], a[..., 2, 2]
+    a01, a02, a12 = a[..., 0, 1], a[..., 0, 2], a[..., 1, 2]
+    q = (a00 + a11 + a22) / 3
+    p1 = a01**2 + a02**2 + a12**2
+    p2 = (a00 - q) ** 2 + (a11 - q) ** 2 + (a22 - q) ** 2 + 2 * p1
+    p = np.sqrt(p2 / 6)
+    safe_p = np.where(p == 0, 1.0, p)
+    b = (a - q[..., None, None] * np.eye(3, dtype=a.dtype)) / safe_p[..., None, None]
+    r = np.clip(det(b) / 2, -1.0, 1.0)
+    phi = np.arccos(r) / 3
+    high = q + 2 * p * np.cos(phi)
+    low = q + 2 * p * np.cos(phi + 2 * np.pi / 3)
+    mid = 3 * q - high - low
+    return np.stack([low, mid, high], axis=-1)  # p == 0: all three are q
@@ -0,0 +1,26 @@
+import numpy as np
+import pytest
+
+from array_store import ArrayStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    with ArrayStore.create(tmp_path / "rows.npy", dtype=np.float64, row_shape=(2,)) as s:
+        yield s
+
+
+def test_append_block_and_single_row(store):
+    store.append(np.arange(6).reshape(3, 2))
+    store.append([7, 8])
+    assert len(store) == 4
+    assert store[3].tolist() == [7, 8]
+
+
+def test_append_shape_mismatch_raises(store):
+    store.append(np.ones((1, 2)))
+    for bad in (np.zeros((4, 3)), np.zeros(6), np.zeros((2, 1, 2))):
+        with pytest.raises(ValueError):
+            store.append(bad)
+    assert len(store) == 1
+    assert np.load(store.path).shape == (1, 2)
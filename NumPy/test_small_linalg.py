@@ -0,0 +1,27 @@
+import numpy as np
+import pytest
+
+from small_linalg import solve
+
+
+@pytest.mark.parametrize("n", [2, 3, 4])
+def test_solve_shared_vector_rhs(n):
+    rng = np.random.default_rng(n)
+    a = rng.random((6, n, n)) + n * np.eye(n)
+    b = rng.random(n)
+    x, singular = solve(a, b)
+    assert x.shape == (6, n)
+    assert not singular.any()
+    assert np.allclose(np.einsum("sij,sj->si", a, x), b)
+
+
+@pytest.mark.parametrize("n", [2, 3, 4])
+def test_solve_stacked_rhs(n):
+    rng = np.random.default_rng(n)
+    a = rng.random((6, n, n)) + n * np.eye(n)
+    vectors = rng.random((6, n))
+    x, _ = solve(a, vectors)
+    assert np.allclose(np.einsum("sij,sj->si", a, x), vectors)
+    matrices = rng.random((6, n, 2))
+    x, _ = solve(a, matrices)
+    assert np.allclose(a @ x, matrices)
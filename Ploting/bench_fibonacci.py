@@ -0,0 +1,25 @@
+# Benchmark for fibonacci.py
+# run from this folder:  python bench_fibonacci.py
+import numpy as np
+
+from benchmark import bench
+from fibonacci import fib, fib_array
+
+
+def report(title, fn, sizes, **kwargs):
+    print(title)
+    for n in sizes:
+        s = bench(fn, n, **kwargs)
+        print(f"  n={n:<22} median {s['median_ns'] / 1e6:10.3f} ms   (+-{s['mad_ns'] / 1e6:.3f})")
+
+
+if __name__ == "__main__":
+    report("exact fib(n)", fib, [10**k for k in range(1, 7)], repeat=5, warmup=1)
+    report("fib(n, mod=1e9+7)", lambda n: fib(n, mod=1_000_000_007), [10**k for k in range(3, 19, 3)])
+
+    # one vectorized call over the whole array vs a Python loop
+    ns = np.random.default_rng(0).integers(0, 10**18, size=100_000)
+    loop = bench(lambda a: [fib(int(n), mod=1_000_000_007) for n in a], ns, repeat=3, warmup=1)
+    vec = bench(lambda a: fib_array(a, mod=1_000_000_007), ns, repeat=3, warmup=1)
+    print(f"100k values mod p: loop {loop['median_ns'] / 1e6:.1f} ms, "
+          f"fib_array {vec['median_ns'] / 1e6:.1f} ms")
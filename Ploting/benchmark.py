@@ -0,0 +1,164 @@
+# Small benchmark harness (replacement for the old `timeIt` in ploting1.py)
+#
+#  - warmup runs before measuring
+#  - every sample loops the function `number` times (auto calibrated) and
+#    is timed with time.perf_counter_ns, nothing is printed while timing
+#  - statistics are outlier robust: median, MAD and IQR, outliers are
+#    dropped with Tukey fences before mean / stdev are computed
+#  - results can be saved as a JSON baseline and compared later
+#  - plot_scaling() draws a log-log "time vs input size" chart
+import json
+import platform
+import statistics
+import time
+
+
+def _time_once(fn, arg, number):
+    clock = time.perf_counter_ns
+    start = clock()
+    for _ in range(number):
+        fn(arg)
+    return (clock() - start) / number
+
+
+def calibrate(fn, arg, min_sample_ns=2_000_000, max_number=1_000_000):
+    """Smallest loop count (1, 2, 5, 10, 20 ...) whose run takes >= min_sample_ns."""
+    number = 1
+    while True:
+        for m in (1, 2, 5):
+            n = number * m
+            if n >= max_number or _time_once(fn, arg, n) * n >= min_sample_ns:
+                return min(n, max_number)
+        number *= 10
+
+
+def summarize(samples):
+    """Outlier robust statistics over a list of per-call times (ns)."""
+    data = sorted(samples)
+    median = statistics.median(data)
+    if len(data) >= 4:
+        q1, _, q3 = statistics.quantiles(data, n=4)
+    else:
+        q1, q3 = data[0], data[-1]
+    iqr = q3 - q1
+    low, high = q1 - 1.5 * iqr, q3 + 1.5 * iqr
+    kept = [x for x in data if low <= x <= high] or data
+    return {
+        "samples": len(data),
+        "outliers": len(data) - len(kept),
+        "min_ns": data[0],
+        "median_ns": median,
+        "mad_ns": statistics.median(abs(x - median) for x in data),
+        "iqr_ns": iqr,
+        "mean_ns": statistics.fmean(kept),
+        "stdev_ns": statistics.stdev(kept) if len(kept) > 1 else 0.0,
+    }
+
+
+def bench(fn, arg, warmup=3, repeat=15, number=None):
+    """Benchmark fn(arg); returns the summary dict of summarize()."""
+    if number is None:
+        number = calibrate(fn, arg)
+    for _ in range(warmup):
+        _time_once(fn, arg, number)
+    samples = [_time_once(fn, arg, number) for _ in range(repeat)]
+    result = summarize(samples)
+    result["number"] = number
+    return result
+
+
+def bench_sizes(implementations, sizes, **kwargs):
+    """Run bench() for every implementation (dict name -> fn) and every size.
+
+    Returns {name: {size: summary}}.
+    """
+    results = {}
+    for name, fn in implementations.items():
+        results[name] = {n: bench(fn, n, **kwargs) for n in sizes}
+    return results
+
+
+# ---------------- baseline files -----------------------------------------
+
+def save_baseline(results, path):
+    data = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "created": time.time(),
+        # json keys must be strings
+        "results": {
+            name: {str(n): s for n, s in per_size.items()}
+            for name, per_size in results.items()
+        },
+    }
+    with open(path, "w") as f:
+        json.dump(data, f, indent=2)
+
+
+def load_baseline(path):
+    with open(path) as f:
+        data = json.load(f)
+    return {
+        name: {int(n): s for n, s in per_size.items()}
+        for name, per_size in data["results"].items()
+    }
+
+
+def compare(results, baseline, threshold=0.10):
+    """Compare medians against a baseline.
+
+    A case is a regression when it got slower by more than `threshold`
+    (relative) AND by more than the noise (3 x MAD) of both runs.
+    Returns a list of dicts, one per (name, size) present in both.
+    """
+    report = []
+    for name, per_size in results.items():
+        for n, new in per_size.items():
+            old = baseline.get(name, {}).get(n)
+            if old is None:
+                continue
+            ratio = new["median_ns"] / old["median_ns"] if old["median_ns"] else float("inf")
+            noise = 3 * max(new["mad_ns"], old["mad_ns"])
+            slower = new["median_ns"] - old["median_ns"]
+            report.append({
+                "name": name,
+                "size": n,
+                "old_ns": old["median_ns"],
+                "new_ns": new["median_ns"],
+                "ratio": ratio,
+                "regression": ratio > 1 + threshold and slower > noise,
+            })
+    return report
+
+
+def format_report(report):
+    lines = [f"{'name':<16} {'n':>8} {'old':>12} {'new':>12} {'ratio':>7}"]
+    for r in report:
+        flag = "  <-- REGRESSION" if r["regression"] else ""
+        lines.append(
+            f"{r['name']:<16} {r['size']:>8} {r['old_ns']:>10.0f}ns "
+            f"{r['new_ns']:>10.0f}ns {r['ratio']:>7.2f}{flag}"
+        )
+    return "\n".join(lines)
+
+
+# ---------------- plotting -----------------------------------------------
+
+def plot_scaling(results, path=None, title="Time vs input size"):
+    """Log-log plot of median time vs input size for every implementation."""
+    import matplotlib.pyplot as plt
+
+    plt.figure()
+    for name, per_size in results.items():
+        sizes = sorted(per_size)
+        medians = [per_size[n]["median_ns"] for n in sizes]
+        plt.loglog(sizes, medians, marker="o", label=name)
+    plt.xlabel("input size n")
+    plt.ylabel("median time per call (ns)")
+    plt.title(title)
+    plt.grid(True, which="both", alpha=0.3)
+    plt.legend()
+    if path:
+        plt.savefig(path)
+    else:
+        plt.show()
@@ -0,0 +1,81 @@
+# Fibonacci engine (supersedes slow_feb / fast_feb in ploting1.py)
+#
+# Fast doubling uses the identities
+#     F(2k)   = F(k) * (2*F(k+1) - F(k))
+#     F(2k+1) = F(k)**2 + F(k+1)**2
+# walking over the bits of n, so F(n) needs only O(log n) steps.
+#
+#  fib(n)            exact big integer F(n)
+#  fib(n, mod=p)     F(n) % p, works for huge n such as 10**18
+#  fib_array(ns)     NumPy path, evaluates a whole array of n at once
+
+
+def fib(n, mod=None):
+    """Return F(n) (or F(n) % mod) using fast doubling."""
+    if n < 0:
+        raise ValueError("n must be >= 0")
+    if mod is not None and mod <= 0:
+        raise ValueError("mod must be a positive integer")
+
+    a, b = 0, 1  # F(0), F(1)
+    for bit in bin(n)[2:]:
+        c = a * (2 * b - a)
+        d = a * a + b * b
+        if mod is not None:
+            c %= mod
+            d %= mod
+        if bit == "1":
+            a, b = d, c + d
+            if mod is not None:
+                b %= mod
+        else:
+            a, b = c, d
+    return a
+
+
+# largest n whose F(n) still fits in a signed 64 bit integer
+MAX_INT64_N = 92
+# keep products of two residues below 2**63
+MAX_INT64_MOD = 2**31
+
+
+def fib_array(ns, mod=None):
+    """Vectorized fast doubling over an array of n values.
+
+    Without `mod` the result is int64 when every n <= 92, otherwise an
+    object array of exact Python integers.  With `mod` (< 2**31) the result
+    is always int64.
+    """
+    import numpy as np
+
+    ns = np.asarray(ns, dtype=np.int64)
+    if ns.size and ns.min() < 0:
+        raise ValueError("n must be >= 0")
+    if mod is not None and not 0 < mod < MAX_INT64_MOD:
+        raise ValueError(f"mod must be in 1..{MAX_INT64_MOD - 1}")
+
+    top = int(ns.max()) if ns.size else 0
+    exact_fits = mod is None and top <= MAX_INT64_N
+    dtype = np.int64 if (mod is not None or exact_fits) else object
+
+    a = np.zeros(ns.shape, dtype=dtype)
+    b = np.ones(ns.shape, dtype=dtype)
+    # every element starts at (F(0), F(1)); leading zero bits of a small n
+    # keep it there, because doubling (0, 1) gives (0, 1) again
+    for shift in range(top.bit_length() - 1, -1, -1):
+        c = a * (2 * b - a)
+        d = a * a + b * b
+        if mod is not None:
+            c %= mod
+            d %= mod
+        bit = ((ns >> shift) & 1).astype(bool)
+        a = np.where(bit, d, c)
+        b = np.where(bit, c + d, d)
+        if mod is not None:
+            b %= mod
+    return a
+
+
+if __name__ == "__main__":
+    print("F(100) =", fib(100))
+    print("F(10**18) mod 1_000_000_007 =", fib(10**18, mod=1_000_000_007))
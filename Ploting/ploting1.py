@@ -1,6 +1,10 @@
+import os
+
 import matplotlib.pyplot as plt
 import numpy as np
-from datetime import datetime 
+
+from benchmark import bench_sizes, compare, format_report, load_baseline, plot_scaling, save_baseline
+from fibonacci import fib
 
 
 def slow_feb(x):
@@ -19,32 +23,28 @@ def fast_feb(x):
         for i in range(1,x+1):
             a,b=b,a+b
 
-            return a
+        return a
         
 
-def timeIt(fn,X):
-    
-    times=[]
-
-
-    for i in  X:
-     st_time=datetime.now()
-    
-     f=fn(i)
-     print(f" fabonachi of {i} is = {f}")
-
-     tim=datetime.now()-st_time
-     times.append(tim)
-
-    return times
+# ------- benchmark (see benchmark.py) ---------------------------------
+# bench_sizes() does warmup + repeated perf_counter_ns runs and prints
+# nothing while timing.  The first run writes a baseline JSON file, later
+# runs are compared against it and regressions are flagged.
 
+if __name__ == "__main__":
+    sizes = [1, 2, 4, 8, 12, 16, 20]
 
-y=range(1,20)
+    for i in sizes:
+        assert slow_feb(i) == fast_feb(i) == fib(i)
+        print(f" fabonachi of {i} is = {fib(i)}")
 
-R=[ i for i in range(20)]
-slow=timeIt(slow_feb,R)
-fast=timeIt(fast_feb,R)
+    results = bench_sizes({"slow_feb": slow_feb, "fast_feb": fast_feb, "fib": fib}, sizes, repeat=7)
 
-print(slow)
-print(fast)
+    baseline_file = "fib_baseline.json"
+    if os.path.exists(baseline_file):
+        print(format_report(compare(results, load_baseline(baseline_file))))
+    else:
+        save_baseline(results, baseline_file)
+        print(f"baseline saved to {baseline_file}")
 
+    plot_scaling(results, title="slow_feb vs fast_feb vs fast doubling")
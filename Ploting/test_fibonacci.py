@@ -0,0 +1,83 @@
+import importlib.util
+import os
+import sys
+
+import pytest
+
+from fibonacci import fib, fib_array
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+DECORATOR_DIR = os.path.join(HERE, os.pardir, "Decorator")
+
+# F(n) for a few n, beyond what slow_feb can reach
+KNOWN = {50: 12586269025, 90: 2880067194370816120, 100: 354224848179261915075}
+
+
+@pytest.fixture(scope="module")
+def ploting1():
+    pytest.importorskip("matplotlib")
+    pytest.importorskip("numpy")
+    import ploting1
+
+    return ploting1
+
+
+@pytest.fixture(scope="module")
+def decorated_fib():
+    # load by path: "decorator" is also the name of a PyPI package
+    sys.path.insert(0, DECORATOR_DIR)
+    try:
+        spec = importlib.util.spec_from_file_location(
+            "_decorator_example", os.path.join(DECORATOR_DIR, "decorator.py"))
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+    finally:
+        sys.path.remove(DECORATOR_DIR)
+    return module.fib
+
+
+def test_small_n_match_reference_versions(ploting1, decorated_fib):
+    for n in range(25):
+        assert ploting1.slow_feb(n) == ploting1.fast_feb(n) == fib(n) == decorated_fib(n)
+
+
+def test_early_return_for_zero_and_one(ploting1):
+    assert ploting1.fast_feb(0) == ploting1.slow_feb(0) == fib(0) == 0
+    assert ploting1.fast_feb(1) == ploting1.slow_feb(1) == fib(1) == 1
+    # fast_feb used to return from inside its loop, giving 1 for every n
+    assert ploting1.fast_feb(2) == 1
+    assert ploting1.fast_feb(10) == 55
+
+
+def test_known_large_values(decorated_fib):
+    for n, value in KNOWN.items():
+        assert fib(n) == value
+    assert decorated_fib(90) == KNOWN[90]
+
+
+def test_against_iterative_definition():
+    a, b = 0, 1
+    for n in range(300):
+        assert fib(n) == a
+        a, b = b, a + b
+
+
+def test_mod():
+    for n in range(100):
+        assert fib(n, mod=97) == fib(n) % 97
+    assert fib(10**18, mod=1_000_000_007) == fib(10**18 % 2_000_000_016, mod=1_000_000_007)
+
+
+def test_invalid_arguments():
+    with pytest.raises(ValueError):
+        fib(-1)
+    with pytest.raises(ValueError):
+        fib(5, mod=0)
+
+
+def test_fib_array():
+    pytest.importorskip("numpy")
+    expected = [fib(n) for n in range(25)]
+    assert list(fib_array(range(25))) == expected
+    assert list(fib_array(range(25), mod=97)) == [x % 97 for x in expected]
+    assert list(fib_array([100, 3, 200])) == [fib(100), 2, fib(200)]
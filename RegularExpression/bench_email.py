@@ -0,0 +1,35 @@
+# Benchmark: `needle` / pattern_email regex vs linear extract_emails()
+# on pathological lines (long, many '@' and '.', no clean match)
+# run from this folder:  python bench_email.py
+import re
+import time
+
+from emailRegEx import extract_emails, needle, pattern_email
+
+CASES = {
+    # many '@' and '.' on one long line
+    "'a@b.' repeated": lambda n: " " + "a@b." * (n // 4) + "x",
+    # long username-like run that never reaches an '@'
+    "username run, no @": lambda n: "a" * n + " @b.com",
+}
+
+
+def timed(fn, text):
+    start = time.perf_counter()
+    fn(text)
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    needle_re = re.compile(needle)
+    email_re = re.compile(pattern_email)
+    for name, make in CASES.items():
+        print(name)
+        print(f"  {'n':>7} {'needle':>10} {'pattern_email':>14} {'extract_emails':>15}")
+        for n in (1_000, 2_000, 4_000, 8_000, 16_000):
+            text = make(n)
+            t1 = timed(needle_re.findall, text)
+            t2 = timed(email_re.findall, text)
+            t3 = timed(extract_emails, text)
+            assert email_re.findall(text) == extract_emails(text)
+            print(f"  {n:>7} {t1:>9.4f}s {t2:>13.4f}s {t3:>14.4f}s")
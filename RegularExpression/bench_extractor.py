@@ -0,0 +1,66 @@
+# Benchmark: one re.findall per pattern vs Extractor (single pass)
+# run from this folder:  python bench_extractor.py [size_in_MiB]
+import os
+import random
+import re
+import sys
+import tempfile
+import time
+
+from extractor import DEFAULT_PATTERNS, Extractor
+
+WORDS = ["uzair", "phone", "number", "is", "123-456-7890", "email", "uzair@gmail.com",
+         "another", "987-654-3210", "abc@gmail.com", ",", "the", "quick", "brown", "fox\n"]
+
+
+def make_file(size_mib):
+    rng = random.Random(0)
+    path = os.path.join(tempfile.mkdtemp(), "text.txt")
+    line = " ".join(rng.choice(WORDS) for _ in range(50_000)) + "\n"
+    with open(path, "w") as f:
+        for _ in range(max(1, size_mib * 2**20 // len(line))):
+            f.write(line)
+    return path
+
+
+def timed(name, fn, size):
+    start = time.perf_counter()
+    found = fn()
+    elapsed = time.perf_counter() - start
+    print(f"{name:<34} {elapsed:7.3f} s  {size / elapsed / 2**20:8.1f} MiB/s  {found}")
+
+
+def separate_passes(text):
+    # what re1.py does: one findall per pattern over the same text
+    return {name: len(re.findall(p, text)) for name, p in DEFAULT_PATTERNS.items()}
+
+
+def separate_spans(path):
+    # same output as Extractor (typed, sorted spans), one pass per pattern,
+    # reading the file again for every pattern
+    spans = []
+    for name, p in DEFAULT_PATTERNS.items():
+        with open(path) as f:
+            text = f.read()
+        spans.extend((m.start(), name, m.group()) for m in re.finditer(p, text))
+    spans.sort()
+    counts = dict.fromkeys(DEFAULT_PATTERNS, 0)
+    for _, name, _ in spans:
+        counts[name] += 1
+    return counts
+
+
+if __name__ == "__main__":
+    size_mib = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    path = make_file(size_mib)
+    size = os.path.getsize(path)
+    with open(path) as f:
+        text = f.read()
+
+    ex = Extractor()
+    timed("re.findall per pattern (str)", lambda: separate_passes(text), size)
+    timed("re.finditer per pattern, spans", lambda: separate_spans(path), size)
+    timed("Extractor.extract (str)", lambda: ex.counts(ex.extract(text)), size)
+    timed("Extractor.extract_file (mmap)", lambda: ex.counts(ex.extract_file(path)), size)
+    timed("Extractor.extract_file (chunks)",
+          lambda: ex.counts(ex.extract_file(path, use_mmap=False)), size)
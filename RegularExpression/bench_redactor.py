@@ -0,0 +1,51 @@
+# Benchmark: re.sub on the whole text vs streaming Redactor (1 and N processes)
+# run from this folder:  python bench_redactor.py [size_in_MiB]
+import os
+import re
+import sys
+import tempfile
+import time
+
+from bench_extractor import make_file
+from redactor import Redactor
+
+RULES = {
+    r"\d{3}-\d{3}-\d{4}": "[hide PHONE]",
+    r"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}": "[hide EMAIL]",
+}
+
+
+def re_sub_in_memory(src, dst):
+    # the re1.py way: whole text in memory, one re.sub per rule
+    with open(src) as f:
+        text = f.read()
+    for pattern, placeholder in RULES.items():
+        text = re.sub(pattern, placeholder, text)
+    with open(dst, "w") as f:
+        f.write(text)
+
+
+def timed(name, fn, size):
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    print(f"{name:<28} {elapsed:7.2f} s  {size / elapsed / 2**20:8.1f} MiB/s")
+
+
+if __name__ == "__main__":
+    size_mib = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    src = make_file(size_mib)
+    size = os.path.getsize(src)
+    out_dir = tempfile.mkdtemp()
+    expected = os.path.join(out_dir, "re_sub.txt")
+
+    timed("re.sub in memory", lambda: re_sub_in_memory(src, expected), size)
+    for workers in sorted({1, os.cpu_count() or 1}):
+        dst = os.path.join(out_dir, f"redacted_{workers}.txt")
+        redactor = Redactor(RULES, workers=workers)
+        stats = {}
+        timed(f"Redactor, {workers} process(es)",
+              lambda: stats.update(redactor.redact_file(src, dst)), size)
+        with open(dst, "rb") as a, open(expected, "rb") as b:
+            assert a.read() == b.read(), "output differs from re.sub"
+        print("   hits:", list(stats["hits"].values()))
@@ -47,7 +47,64 @@ needle= "\s" + emial_str + "\s"
 
 email_matchs=re.findall(needle,dummy_text)
 
-for email in email_matchs:
-    print(f"Found email address: {email}")
+#---------------------------------------------------------
+# Linear time extraction
+#
+# `needle` has unbounded .* on both sides of the @, so on long lines with
+# many '@' and '.' the regex engine backtracks over the same characters
+# again and again.  Even pattern_email is quadratic on a long run of
+# username characters with no '@' in it.
+#
+# extract_emails() gives the same result as re.findall(pattern_email, text)
+# but finds every '@' with str.find and scans outward from it:
+#   - left : username characters, never past the previous '@' or match
+#   - right: domain characters, then the last '.' followed by 2+ letters
+# Every character is looked at a bounded number of times -> O(n).
+
+USERNAME_CHARS=frozenset("abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789._%+-")
+DOMAIN_RUN=re.compile(r"[a-zA-Z0-9.-]*")  # one class, no backtracking
+LETTER_RUN=re.compile(r"[a-zA-Z]*")
+
+
+def _domain_end(text,start,stop):
+    # end of  [a-zA-Z0-9.-]+\.[a-zA-Z]{2,}  inside text[start:stop], or -1
+    hi=stop
+    while True:
+        dot=text.rfind(".",start+1,hi)
+        if dot<0:
+            return -1
+        tld_end=LETTER_RUN.match(text,dot+1,stop).end()
+        if tld_end-(dot+1)>=2:
+            return tld_end
+        hi=dot
+
+
+def extract_emails(text):
+    emails=[]
+    last_end=0  # matches never overlap
+    at=text.find("@")
+    while at>=0:
+        # walk left over username characters
+        start=at
+        while start>last_end and text[start-1] in USERNAME_CHARS:
+            start-=1
+        stop=DOMAIN_RUN.match(text,at+1).end()
+        end=_domain_end(text,at+1,stop) if start<at else -1
+        if end>=0:
+            emails.append(text[start:end])
+            last_end=end
+            at=text.find("@",end)
+        else:
+            last_end=max(last_end,at+1)
+            at=text.find("@",at+1)
+    return emails
+
+
+if __name__ == "__main__":
+    for email in email_matchs:
+        print(f"Found email address: {email}")
+
+    for email in extract_emails(dummy_text):
+        print(f"Found email address (linear): {email}")
 
 
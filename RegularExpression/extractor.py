@@ -0,0 +1,128 @@
+# Single pass, multi pattern extractor
+#
+# re1.py runs re.search / re.findall / re.sub once per pattern, so the
+# text is scanned again for every pattern.  Extractor joins a set of named
+# patterns into ONE compiled regex
+#
+#     (?P<phone>\d{3}-\d{3}-\d{4})|(?P<email>...)
+#
+# and walks the input once; every match comes back as a Span telling
+# which pattern matched.  Compiled regexes are cached by pattern set.
+#
+# Files are read through mmap (the OS pages the file in, it never has to
+# fit in memory) or, for streams, in big chunks that overlap by
+# `max_match` bytes so a match crossing a chunk boundary is still found,
+# and found only once.
+#
+# Note: at one position the first pattern (in dict order) wins, like any
+# regex alternation, so overlapping matches of two patterns give one span.
+import mmap
+import re
+from collections import namedtuple
+from functools import lru_cache
+
+Span = namedtuple("Span", "kind start end text")
+
+DEFAULT_PATTERNS = {
+    "phone": r"\d{3}-\d{3}-\d{4}",
+    "email": r"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}",
+}
+
+
+@lru_cache(maxsize=64)
+def compile_patterns(items, as_bytes, flags):
+    """One regex for ((name, pattern), ...); returns (regex, {group index: name})."""
+    parts = []
+    for name, pattern in items:
+        if not name.isidentifier():
+            raise ValueError(f"pattern name must be an identifier: {name!r}")
+        parts.append(f"(?P<{name}>{pattern})")
+    source = "|".join(parts)
+    regex = re.compile(source.encode() if as_bytes else source, flags)
+    # a wrapping group closes after any group inside it, so m.lastindex is
+    # always the index of the wrapping group of the pattern that matched
+    kinds = {regex.groupindex[name]: name for name, _ in items}
+    return regex, kinds
+
+
+class Extractor:
+    def __init__(self, patterns=None, flags=0, max_match=4096, chunk_size=16 * 1024 * 1024):
+        patterns = DEFAULT_PATTERNS if patterns is None else patterns
+        if not patterns:
+            raise ValueError("need at least one pattern")
+        self._items = tuple(patterns.items())
+        self.flags = flags
+        self.max_match = max_match
+        self.chunk_size = chunk_size
+
+    def _regex(self, as_bytes):
+        return compile_patterns(self._items, as_bytes, self.flags)
+
+    def _spans(self, data, regex, kinds, decode=False):
+        # hot loop: local names and tuple.__new__ instead of Span(...)
+        new, span_type = tuple.__new__, Span
+        for m in regex.finditer(data):
+            start, end = m.span()
+            text = m.group()
+            if decode:
+                text = text.decode("utf-8", "replace")
+            yield new(span_type, (kinds[m.lastindex], start, end, text))
+
+    def extract(self, text):
+        """All spans in a str (or bytes) already in memory."""
+        as_bytes = isinstance(text, (bytes, bytearray, memoryview, mmap.mmap))
+        regex, kinds = self._regex(as_bytes)
+        return self._spans(text, regex, kinds, decode=as_bytes)
+
+    def extract_file(self, path, use_mmap=True):
+        """Spans of a file on disk; start / end are byte offsets."""
+        with open(path, "rb") as f:
+            if use_mmap:
+                try:
+                    mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                except ValueError:  # empty file
+                    return
+                with mm:
+                    regex, kinds = self._regex(True)
+                    yield from self._spans(mm, regex, kinds, decode=True)
+            else:
+                yield from self.extract_stream(f)
+
+    def extract_stream(self, stream):
+        """Spans of a binary stream read in overlapping chunks."""
+        regex, kinds = self._regex(True)
+        new, span_type = tuple.__new__, Span
+        # keep `max_match` bytes (plus a little look-ahead) of every chunk
+        # for the next round, and some context before the resume point so
+        # look-behinds and \b still see the previous bytes
+        overlap = self.max_match + 64
+        context = 64
+        buf = b""
+        base = 0  # file offset of buf[0]
+        pos = 0  # where scanning resumes inside buf
+        while True:
+            chunk = stream.read(self.chunk_size)
+            final = not chunk
+            buf += chunk
+            cut = len(buf) if final else max(pos, len(buf) - overlap)
+            resume = cut
+            for m in regex.finditer(buf, pos):
+                if m.start() >= cut:
+                    break
+                start, end = m.span()
+                if end > resume:
+                    resume = end
+                yield new(span_type, (kinds[m.lastindex], base + start, base + end,
+                                      m.group().decode("utf-8", "replace")))
+            if final:
+                return
+            keep_from = max(0, resume - context)
+            base += keep_from
+            buf = buf[keep_from:]
+            pos = resume - keep_from
+
+    def counts(self, spans):
+        result = {name: 0 for name, _ in self._items}
+        for span in spans:
+            result[span.kind] += 1
+        return result
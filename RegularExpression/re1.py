@@ -48,6 +48,14 @@ redacted_text=re.sub(pattern,"[hide PHONE]",stringText)
 print("Redacted Text:")
 print(redacted_text)
 
+# For big files / streams: Redactor (see redactor.py) redacts chunks of
+# the input on a process pool and writes them back in order
+from redactor import Redactor
+
+redactor=Redactor({pattern: "[hide PHONE]", pattern_email: "[hide EMAIL]"})
+print(redactor.redact_text(stringText))
+# stats=redactor.redact_file("big.log","big.redacted.log")  # hits per rule, bytes/s
+
 #-----------------------------------
 # Splitting the text based on commas
 parts=re.split(r",\s*",stringText)
@@ -73,4 +81,12 @@ else:
 # Compiling a regex pattern for better performance
 compiled_pattern=re.compile(r"\d{3}-\d{3}-\d{4}")
 for match in compiled_pattern.finditer(stringText):
-    print(f"Found phone number using compiled pattern: {match.group(0)}")
\ No newline at end of file
+    print(f"Found phone number using compiled pattern: {match.group(0)}")
+#-----------------------------------
+# All patterns in ONE pass over the text (see extractor.py)
+# every match comes back as Span(kind, start, end, text)
+from extractor import Extractor
+
+extractor=Extractor({"phone": r"\d{3}-\d{3}-\d{4}", "email": pattern_email})
+for span in extractor.extract(stringText):
+    print(f"Found {span.kind} at {span.start}-{span.end}: {span.text}")
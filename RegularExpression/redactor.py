@@ -0,0 +1,150 @@
+# Parallel, streaming redaction
+#
+# re1.py does  re.sub(pattern, "[hide PHONE]", stringText)  on a string
+# that is already in memory, on one core.  Redactor takes a file or a
+# binary stream and a set of  pattern -> placeholder  rules and:
+#  - cuts the input into chunks; every chunk is sent with some bytes of
+#    the previous chunk (for look-behinds / \b) and `max_match` bytes of
+#    the next one, so a match crossing the seam is still seen
+#  - a chunk only redacts matches that START inside it; if its last match
+#    runs into the next chunk, that next chunk is redone from the end of
+#    the match, so nothing is missed or replaced twice
+#  - chunks are redacted on a process pool and written out in order
+#  - reports hits per rule, bytes and bytes/s
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from extractor import compile_patterns
+
+CONTEXT = 64  # bytes of the previous chunk sent along for look-behinds
+
+
+def _rule_items(rules):
+    return tuple((f"r{i}", pattern) for i, pattern in enumerate(rules))
+
+
+def _redact_chunk(patterns, placeholders, flags, data, left, own_len, skip=0):
+    """Redact the matches starting in data[left:left + own_len].
+
+    Scanning starts at left + skip.  Returns (output, hits per rule, overrun)
+    where overrun is how far the last match ran past the chunk.
+    """
+    regex, kinds = compile_patterns(patterns, True, flags)  # cached per process
+    index = {i: int(name[1:]) for i, name in kinds.items()}
+    own_end = left + own_len
+    out = []
+    hits = [0] * len(placeholders)
+    last = left + skip
+    for m in regex.finditer(data, last):
+        start, end = m.span()
+        if start >= own_end:
+            break
+        rule = index[m.lastindex]
+        out.append(data[last:start])
+        out.append(placeholders[rule])
+        hits[rule] += 1
+        last = end
+    if last <= own_end:
+        out.append(data[last:own_end])
+        overrun = 0
+    else:
+        overrun = last - own_end
+    return b"".join(out), hits, overrun
+
+
+class Redactor:
+    def __init__(self, rules, flags=0, chunk_size=4 * 1024 * 1024, max_match=4096,
+                 workers=None):
+        """rules: {regex pattern: placeholder}, tried in this order."""
+        if not rules:
+            raise ValueError("need at least one rule")
+        self.patterns = _rule_items(rules)
+        self.rules = list(rules)
+        self.placeholders = tuple(
+            p.encode() if isinstance(p, str) else p for p in rules.values()
+        )
+        self.flags = flags
+        self.chunk_size = chunk_size
+        self.max_match = max_match
+        self.workers = workers or os.cpu_count() or 1
+        compile_patterns(self.patterns, True, flags)  # fail early on bad patterns
+
+    def redact_text(self, text):
+        """In-memory version for str, same result as chained re.sub calls
+        when the rules do not overlap."""
+        data = text.encode()
+        out, _, _ = _redact_chunk(self.patterns, self.placeholders, self.flags,
+                                  data, 0, len(data))
+        return out.decode()
+
+    def _chunks(self, stream):
+        """Yield (data, left, own_len) with context before and look-ahead after."""
+        lookahead = self.max_match + 64
+        prev_tail = b""
+        current = stream.read(self.chunk_size)
+        while current:
+            nxt = stream.read(self.chunk_size)
+            # make sure there is enough look-ahead even with small reads
+            while nxt and len(nxt) < lookahead:
+                more = stream.read(self.chunk_size)
+                if not more:
+                    break
+                nxt += more
+            yield prev_tail + current + nxt[:lookahead], len(prev_tail), len(current)
+            prev_tail = current[-CONTEXT:]
+            current = nxt
+
+    def redact_stream(self, src, dst):
+        """Redact binary stream src into binary stream dst; returns stats."""
+        started = time.perf_counter()
+        hits = [0] * len(self.placeholders)
+        bytes_in = 0
+        args = (self.patterns, self.placeholders, self.flags)
+
+        def finish(result, data, left, own_len, overrun):
+            out, chunk_hits, new_overrun = result
+            if overrun:
+                if overrun >= own_len:
+                    # a single match swallowed this whole chunk
+                    return overrun - own_len
+                # previous chunk's match ran into this one: redo from its end
+                out, chunk_hits, new_overrun = _redact_chunk(*args, data, left, own_len, overrun)
+            dst.write(out)
+            for i, n in enumerate(chunk_hits):
+                hits[i] += n
+            return new_overrun
+
+        overrun = 0
+        if self.workers == 1:
+            for data, left, own_len in self._chunks(src):
+                bytes_in += own_len
+                result = _redact_chunk(*args, data, left, own_len, overrun)
+                # the chunk was already scanned from `overrun`
+                overrun = finish(result, data, left, own_len, 0)
+        else:
+            with ProcessPoolExecutor(max_workers=self.workers) as pool:
+                pending = deque()
+                for data, left, own_len in self._chunks(src):
+                    bytes_in += own_len
+                    pending.append((pool.submit(_redact_chunk, *args, data, left, own_len),
+                                    data, left, own_len))
+                    while len(pending) >= 2 * self.workers:
+                        future, *chunk = pending.popleft()
+                        overrun = finish(future.result(), *chunk, overrun)
+                while pending:
+                    future, *chunk = pending.popleft()
+                    overrun = finish(future.result(), *chunk, overrun)
+
+        elapsed = time.perf_counter() - started
+        return {
+            "hits": {rule: n for rule, n in zip(self.rules, hits)},
+            "bytes": bytes_in,
+            "seconds": elapsed,
+            "bytes_per_s": bytes_in / elapsed if elapsed else 0.0,
+        }
+
+    def redact_file(self, src_path, dst_path):
+        with open(src_path, "rb") as src, open(dst_path, "wb") as dst:
+            return self.redact_stream(src, dst)
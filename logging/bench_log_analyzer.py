@@ -0,0 +1,67 @@
+# Benchmark: lines per second (per core) of log_analyzer on a generated log
+# run from this folder:  python bench_log_analyzer.py [n_lines]
+import os
+import random
+import re
+import sys
+import tempfile
+import time
+
+from log_analyzer import LogStats, analyze_files
+
+MESSAGES = [
+    ("INFO", "Starting to process file: users{}.txt"),
+    ("DEBUG", "Opening file: users{}.txt"),
+    ("INFO", "Successfully processed users{}.txt"),
+    ("WARNING", "Empty filename provided, using default"),
+    ("ERROR", "File not found: users{}.txt"),
+    ("CRITICAL", "Unexpected error processing users{}.txt: boom"),
+]
+
+
+def make_log(n_lines):
+    rng = random.Random(0)
+    path = os.path.join(tempfile.mkdtemp(), "app.log")
+    with open(path, "w") as f:
+        for i in range(n_lines):
+            level, msg = rng.choice(MESSAGES)
+            minute, second = divmod(i // 50, 60)
+            f.write(f"2026-01-01 {minute // 60 % 24:02d}:{minute % 60:02d}:{second:02d},{i % 1000:03d}"
+                    f" - __main__ - {level} - {msg.format(rng.randrange(20))}\n")
+    return path
+
+
+REGEX = re.compile(rb"^(\S+ \S+) - (.*?) - ([A-Z]+) - (.*?)\n?$")
+
+
+def regex_only(path):
+    # reference: the same work with a regex on every line
+    stats = LogStats()
+    with open(path, "rb") as f:
+        for line in f:
+            m = REGEX.match(line)
+            stats.levels[m.group(3)] += 1
+            stats.messages[m.group(4)] += 1
+    return stats
+
+
+def timed(name, fn, n_lines, cores):
+    start = time.perf_counter()
+    stats = fn()
+    elapsed = time.perf_counter() - start
+    print(f"{name:<24} {n_lines / elapsed:>12,.0f} lines/s  "
+          f"{n_lines / elapsed / cores:>12,.0f} lines/s/core")
+    return stats
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    path = make_log(n)
+    cpus = os.cpu_count() or 1
+    timed("regex on every line", lambda: regex_only(path), n, 1)
+    one = timed("split parser, 1 core", lambda: analyze_files([path], workers=1), n, 1)
+    many = timed(f"split parser, {cpus} cores",
+                 lambda: analyze_files([path], workers=cpus, range_size=8 * 2**20), n, cpus)
+    assert one.levels == many.levels and one.per_minute == many.per_minute
+    print()
+    print(one.report(top=5))
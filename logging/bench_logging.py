@@ -0,0 +1,74 @@
+# Benchmark: caller-side latency of logger.info() with a handler attached
+# directly (log1.py before) vs the queue based setup
+# run from this folder:  python bench_logging.py [n_calls]
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+from queue_logging import start_queue_logging
+
+FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+
+def file_handler(path):
+    handler = logging.FileHandler(path)
+    handler.setFormatter(logging.Formatter(FORMAT))
+    return handler
+
+
+def measure(logger, n):
+    clock = time.perf_counter_ns
+    samples = []
+    for i in range(n):
+        start = clock()
+        logger.info("processing file %s, record %d", "users.txt", i)
+        samples.append(clock() - start)
+    return samples
+
+
+def show(name, samples):
+    p = statistics.quantiles(samples, n=100)
+    print(f"{name:<30} p50 {p[49] / 1000:7.2f} us   p99 {p[98] / 1000:8.2f} us   "
+          f"mean {statistics.fmean(samples) / 1000:7.2f} us")
+
+
+def fresh_logger(name):
+    logger = logging.getLogger(name)
+    logger.setLevel(logging.DEBUG)
+    logger.propagate = False
+    return logger
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    out = tempfile.mkdtemp()
+
+    direct = fresh_logger("bench.direct")
+    direct.addHandler(file_handler(os.path.join(out, "direct.log")))
+    show("handler on caller thread", measure(direct, n))
+
+    for policy in ("block", "drop_oldest"):
+        queued = fresh_logger(f"bench.{policy}")
+        listener = start_queue_logging(queued, [file_handler(os.path.join(out, f"{policy}.log"))],
+                                       maxsize=n, policy=policy)
+        show(f"queue ({policy})", measure(queued, n))
+        listener.stop()
+        print("   ", listener.stats)
+
+    # disabled level: f-string is built anyway, %s args are not
+    quiet = fresh_logger("bench.quiet")
+    quiet.setLevel(logging.INFO)
+    user = "users.txt"
+    clock = time.perf_counter_ns
+    start = clock()
+    for _ in range(n):
+        quiet.debug(f"Opening file: {user}")
+    eager = (clock() - start) / n
+    start = clock()
+    for _ in range(n):
+        quiet.debug("Opening file: %s", user)
+    lazy = (clock() - start) / n
+    print(f"disabled debug: f-string {eager:.0f} ns/call, %s args {lazy:.0f} ns/call")
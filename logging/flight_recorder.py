@@ -0,0 +1,89 @@
+# Flight recorder for DEBUG context
+#
+# Writing DEBUG logs all the time is too expensive, but when something
+# fails the DEBUG lines before the failure are exactly what you want.
+# FlightRecorderHandler keeps the last `capacity` DEBUG / INFO records in
+# a preallocated ring buffer and writes nothing.  When an ERROR (or
+# CRITICAL, or any record with exc_info) arrives, the buffered history is
+# sent to the real handlers first, oldest first, followed by the error.
+# WARNING records are written straight away, but also after the history
+# buffered before them, so the output stays in chronological order.
+#
+#   recorder = install_flight_recorder(logger, capacity=1000)
+#
+# moves the handlers already on `logger` behind the recorder.  Records are
+# only formatted by the real handlers, so buffering costs no formatting.
+import logging
+
+
+class FlightRecorderHandler(logging.Handler):
+    def __init__(self, targets, capacity=1000, flush_level=logging.ERROR,
+                 passthrough_level=logging.WARNING):
+        super().__init__(logging.NOTSET)
+        if capacity < 1:
+            raise ValueError("capacity must be >= 1")
+        self.targets = list(targets)
+        self.capacity = capacity
+        self.flush_level = flush_level
+        self.passthrough_level = passthrough_level
+        self._buffer = [None] * capacity  # allocated once
+        self._next = 0  # slot for the next record
+        self._size = 0
+        self.stats = {"recorded": 0, "flushes": 0, "flushed_records": 0}
+
+    def emit(self, record):
+        # Handler.handle() already holds self.lock here
+        if (record.levelno >= self.flush_level or record.exc_info
+                or record.levelno >= self.passthrough_level):
+            # anything written now must come after the records before it
+            self._dump_history()
+            self._forward(record)
+        else:
+            self._buffer[self._next] = record
+            self._next = (self._next + 1) % self.capacity
+            if self._size < self.capacity:
+                self._size += 1
+            self.stats["recorded"] += 1
+
+    def _forward(self, record):
+        for target in self.targets:
+            if record.levelno >= target.level:
+                target.handle(record)
+
+    def _dump_history(self):
+        if not self._size:
+            return
+        start = (self._next - self._size) % self.capacity
+        for i in range(self._size):
+            slot = (start + i) % self.capacity
+            self._forward(self._buffer[slot])
+            self._buffer[slot] = None
+        self.stats["flushes"] += 1
+        self.stats["flushed_records"] += self._size
+        self._size = 0
+
+    def history(self):
+        """Buffered records, oldest first (does not clear them)."""
+        with self.lock:
+            start = (self._next - self._size) % self.capacity
+            return [self._buffer[(start + i) % self.capacity] for i in range(self._size)]
+
+    def dump(self):
+        """Send the buffered history to the real handlers now."""
+        with self.lock:
+            self._dump_history()
+
+    def flush(self):
+        for target in self.targets:
+            target.flush()
+
+
+def install_flight_recorder(logger, capacity=1000, flush_level=logging.ERROR,
+                            passthrough_level=logging.WARNING):
+    """Put a FlightRecorderHandler in front of the handlers of `logger`."""
+    targets = list(logger.handlers)
+    for handler in targets:
+        logger.removeHandler(handler)
+    recorder = FlightRecorderHandler(targets, capacity, flush_level, passthrough_level)
+    logger.addHandler(recorder)
+    return recorder
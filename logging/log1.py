@@ -1,4 +1,8 @@
 import logging 
+
+from flight_recorder import install_flight_recorder
+from queue_logging import start_queue_logging
+
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.DEBUG)
 
@@ -13,8 +17,14 @@ formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(messag
 # Add formatter to ch
 ch.setFormatter(formatter)
 
-# Add ch to logger
-logger.addHandler(ch)
+# Send records to ch through a queue: logger.info() only queues the record,
+# a background thread formats and writes them in batches (queue_logging.py)
+listener = start_queue_logging(logger, [ch], maxsize=10_000, policy="drop_oldest")
+
+# Flight recorder: DEBUG / INFO records are only kept in memory (last 1000)
+# and written out together with the next ERROR / CRITICAL, so the failure
+# comes with its context (flight_recorder.py)
+recorder = install_flight_recorder(logger, capacity=1000)
 def log_messages():
     logger.debug("This is a debug message")
     logger.info("This is an info message")
@@ -33,26 +43,28 @@ def process_user_data(filename):
     - Recording errors without crashing
     - Monitoring performance
     """
+    # %s arguments instead of f-strings: the message is only built when
+    # the record is really written, not for levels that are turned off
     try:
-        logger.info(f"Starting to process file: {filename}")
+        logger.info("Starting to process file: %s", filename)
         
         # Simulate file operations
         if not filename:
             logger.warning("Empty filename provided, using default")
             filename = "default.txt"
         
-        logger.debug(f"Opening file: {filename}")
+        logger.debug("Opening file: %s", filename)
         # with open(filename) as f:
         #     data = f.read()
         
-        logger.info(f"Successfully processed {filename}")
+        logger.info("Successfully processed %s", filename)
         return True
         
     except FileNotFoundError:
-        logger.error(f"File not found: {filename}", exc_info=True)
+        logger.error("File not found: %s", filename, exc_info=True)
         return False
     except Exception as e:
-        logger.critical(f"Unexpected error processing {filename}: {e}", exc_info=True)
+        logger.critical("Unexpected error processing %s: %s", filename, e, exc_info=True)
         return False
 
 # Call the example
@@ -0,0 +1,183 @@
+# Fast analytics for log files written with the log1.py formatter
+#
+#     '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+#     2026-01-01 12:00:00,123 - app - ERROR - File not found: users.txt
+#
+#  - parse_line() splits on " - " (cheap) and only falls back to a regex
+#    when the split does not give a sane asctime / level
+#  - LogStats holds per level counts, per minute totals / errors and the
+#    most common messages; two LogStats can be merged
+#  - analyze_files() cuts big files into byte ranges (on line boundaries)
+#    and runs them on a process pool, then merges the partial LogStats
+#  - follow_stats() keeps a LogStats up to date on a live file
+#
+# Lines that do not match (like traceback lines from exc_info) are
+# counted as "unparsed".  Work is done on bytes, text is decoded only for
+# the report.
+import os
+import re
+import sys
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+LEVELS = (b"DEBUG", b"INFO", b"WARNING", b"ERROR", b"CRITICAL")
+ERROR_LEVELS = frozenset((b"ERROR", b"CRITICAL"))
+_LEVEL_SET = frozenset(LEVELS)
+_LINE_RE = re.compile(
+    rb"^(\d{4}-\d\d-\d\d \d\d:\d\d:\d\d,\d{3}) - (.*?) - ([A-Z]+) - (.*?)\r?\n?$"
+)
+SEP = b" - "
+
+
+def parse_line(line):
+    """(asctime, name, level, message) as bytes, or None."""
+    parts = line.split(SEP, 3)
+    if len(parts) == 4 and parts[2] in _LEVEL_SET and len(parts[0]) == 23:
+        message = parts[3]
+        if message.endswith(b"\n"):
+            message = message[:-2] if message.endswith(b"\r\n") else message[:-1]
+        return parts[0], parts[1], parts[2], message
+    # slow path: a logger name with " - " in it, custom levels ...
+    m = _LINE_RE.match(line)
+    return m.groups() if m else None
+
+
+class LogStats:
+    def __init__(self, max_messages=100_000):
+        self.lines = 0
+        self.unparsed = 0
+        self.levels = Counter()
+        self.per_minute = {}  # b"YYYY-mm-dd HH:MM" -> [total, errors]
+        self.messages = Counter()
+        self.max_messages = max_messages
+
+    def add_line(self, line):
+        self.lines += 1
+        parsed = parse_line(line)
+        if parsed is None:
+            self.unparsed += 1
+            return
+        asctime, _, level, message = parsed
+        self.levels[level] += 1
+        minute = self.per_minute.get(asctime[:16])
+        if minute is None:
+            minute = self.per_minute[asctime[:16]] = [0, 0]
+        minute[0] += 1
+        if level in ERROR_LEVELS:
+            minute[1] += 1
+        self.messages[message] += 1
+        if len(self.messages) > 2 * self.max_messages:
+            self._prune()
+
+    def add_lines(self, lines):
+        for line in lines:
+            self.add_line(line)
+        return self
+
+    def _prune(self):
+        # keep memory bounded on huge inputs: the top messages survive,
+        # rare ones are forgotten (so counts of rare messages are a floor)
+        self.messages = Counter(dict(self.messages.most_common(self.max_messages)))
+
+    def merge(self, other):
+        self.lines += other.lines
+        self.unparsed += other.unparsed
+        self.levels.update(other.levels)
+        for minute, (total, errors) in other.per_minute.items():
+            mine = self.per_minute.setdefault(minute, [0, 0])
+            mine[0] += total
+            mine[1] += errors
+        self.messages.update(other.messages)
+        if len(self.messages) > 2 * self.max_messages:
+            self._prune()
+        return self
+
+    def error_rates(self):
+        """[(minute, total, errors, error_rate)] sorted by minute."""
+        return [
+            (minute.decode(), total, errors, errors / total)
+            for minute, (total, errors) in sorted(self.per_minute.items())
+        ]
+
+    def report(self, top=10):
+        out = [f"lines: {self.lines}  unparsed: {self.unparsed}"]
+        for level in LEVELS:
+            if self.levels[level]:
+                out.append(f"  {level.decode():<9} {self.levels[level]:>12}")
+        out.append("top messages:")
+        for message, count in self.messages.most_common(top):
+            out.append(f"  {count:>10}  {message.decode('utf-8', 'replace')[:100]}")
+        worst = sorted(self.error_rates(), key=lambda r: r[3], reverse=True)[:5]
+        out.append("highest error rate per minute:")
+        for minute, total, errors, rate in worst:
+            out.append(f"  {minute}  {errors}/{total} ({rate:.1%})")
+        return "\n".join(out)
+
+
+# ---------------- files and byte ranges ----------------------------------
+
+def analyze_range(path, start, end, max_messages=100_000):
+    """LogStats of the lines that START in [start, end) of the file."""
+    stats = LogStats(max_messages)
+    with open(path, "rb", buffering=1024 * 1024) as f:
+        pos = start
+        if start > 0:
+            # the line running over `start` belongs to the previous range
+            f.seek(start - 1)
+            pos = start - 1 + len(f.readline())
+        add = stats.add_line
+        for line in f:
+            if pos >= end:
+                break
+            pos += len(line)
+            add(line)
+    return stats
+
+
+def split_ranges(paths, range_size=64 * 1024 * 1024):
+    ranges = []
+    for path in paths:
+        size = os.path.getsize(path)
+        for start in range(0, max(size, 1), range_size):
+            ranges.append((path, start, min(start + range_size, size)))
+    return ranges
+
+
+def analyze_files(paths, workers=None, range_size=64 * 1024 * 1024, max_messages=100_000):
+    """Analyze many (big) files on a process pool; returns one LogStats."""
+    if isinstance(paths, (str, os.PathLike)):
+        paths = [paths]
+    workers = workers or os.cpu_count() or 1
+    ranges = split_ranges(paths, range_size)
+    total = LogStats(max_messages)
+    if workers == 1 or len(ranges) == 1:
+        for path, start, end in ranges:
+            total.merge(analyze_range(path, start, end, max_messages))
+        return total
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(analyze_range, p, s, e, max_messages) for p, s, e in ranges]
+        for future in futures:
+            total.merge(future.result())
+    return total
+
+
+def follow_stats(path, stats=None, from_start=True):
+    """Keep a LogStats up to date on a live file; yields it after every batch."""
+    # FileFollower lives in ../Generator/follower.py
+    generator_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Generator")
+    if generator_dir not in sys.path:
+        sys.path.append(generator_dir)
+    from follower import FileFollower
+
+    stats = stats or LogStats()
+    with FileFollower([path], from_start=from_start) as follower:
+        for _, lines in follower:
+            stats.add_lines(line.encode() for line in lines)
+            yield stats
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("usage: python log_analyzer.py FILE [FILE ...]")
+        sys.exit(1)
+    print(analyze_files(sys.argv[1:]).report())
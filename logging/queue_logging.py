@@ -0,0 +1,223 @@
+# Non-blocking logging through a queue
+#
+# With a StreamHandler attached straight to the logger, every
+# logger.info(...) formats the message and writes it on the caller's
+# thread.  Here the caller only appends the LogRecord to a bounded queue;
+# a background listener thread formats the records (lazily, only when
+# they are written) and writes them in batches, one flush per batch.
+#
+#   listener = start_queue_logging(logger, [console_handler, file_handler],
+#                                  maxsize=10_000, policy="drop_oldest")
+#   ...
+#   listener.stop()          # also done automatically at exit
+#   listener.stats           # {"queued": ..., "dropped": ..., ...}
+#
+# What happens when the queue is full (`policy`):
+#   "block"        the caller waits until there is room
+#   "drop_oldest"  the oldest queued record is thrown away
+#   "drop_debug"   DEBUG records are thrown away, others wait for room
+#
+# Note: because formatting is lazy the record's args are formatted later
+# on the listener thread; do not mutate objects you passed as log args.
+import atexit
+import logging
+import logging.handlers
+import threading
+from collections import deque
+
+POLICIES = ("block", "drop_oldest", "drop_debug")
+
+
+class BoundedQueueHandler(logging.Handler):
+    """Hot path handler: put the record on the queue, nothing else."""
+
+    def __init__(self, maxsize=10_000, policy="drop_oldest"):
+        super().__init__()
+        if policy not in POLICIES:
+            raise ValueError(f"policy must be one of {POLICIES}")
+        if maxsize < 1:
+            raise ValueError("maxsize must be >= 1")
+        self.maxsize = maxsize
+        self.policy = policy
+        # deque.append / popleft are thread safe, so the caller takes no lock
+        self.queue = deque()
+        self.stats = {"queued": 0, "dropped": 0, "dropped_debug": 0, "blocked": 0}
+        self.wakeup = threading.Event()
+        self.listener_idle = False
+        # producers blocked on a full queue wait here; the listener only
+        # takes the lock to notify when `blocked_waiters` says someone waits
+        self.not_full = threading.Condition(threading.Lock())
+        self.blocked_waiters = 0
+        # set by BatchQueueListener.stop(): from then on records are
+        # written on the caller's thread instead of queued
+        self.write_direct = None
+
+    def handle(self, record):
+        # skip Handler.handle(): no handler lock on the hot path
+        if self.filters and not self.filter(record):
+            return False
+        self.emit(record)
+        return True
+
+    def emit(self, record):
+        if self.write_direct is not None:
+            self.write_direct([record])
+            return
+        q = self.queue
+        if len(q) >= self.maxsize:
+            if self.policy == "drop_oldest":
+                try:
+                    q.popleft()
+                    self.stats["dropped"] += 1
+                except IndexError:
+                    pass
+            elif self.policy == "drop_debug" and record.levelno <= logging.DEBUG:
+                self.stats["dropped_debug"] += 1
+                return
+            else:
+                self.stats["blocked"] += 1
+                with self.not_full:
+                    # count ourselves before re-checking the length, so the
+                    # listener either sees the waiter or we see its popleft
+                    self.blocked_waiters += 1
+                    try:
+                        while len(q) >= self.maxsize and self.write_direct is None:
+                            self.wakeup.set()
+                            self.not_full.wait(0.1)
+                    finally:
+                        self.blocked_waiters -= 1
+                if self.write_direct is not None:
+                    # the listener stopped while we waited
+                    self.write_direct([record])
+                    return
+        q.append(record)
+        self.stats["queued"] += 1
+        if self.listener_idle:
+            self.wakeup.set()
+        if self.write_direct is not None:
+            # the listener stopped after the check at the top and may have
+            # drained the queue already: write what is left ourselves
+            self._drain_direct()
+
+    def _drain_direct(self):
+        batch = []
+        try:
+            while True:
+                batch.append(self.queue.popleft())
+        except IndexError:
+            pass
+        if batch:
+            self.write_direct(batch)
+
+
+class BatchQueueListener:
+    """Background thread writing queued records to the real handlers."""
+
+    def __init__(self, queue_handler, handlers, batch_size=512, idle_wait=0.05):
+        self.queue_handler = queue_handler
+        self.handlers = list(handlers)
+        self.batch_size = batch_size
+        self.idle_wait = idle_wait
+        self.stats = queue_handler.stats
+        self.stats.setdefault("written", 0)
+        self.stats.setdefault("batches", 0)
+        self._stop = False
+        self._thread = threading.Thread(target=self._run, name="log-listener", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        atexit.register(self.stop)
+        return self
+
+    def _next_batch(self):
+        q = self.queue_handler.queue
+        batch = []
+        try:
+            while len(batch) < self.batch_size:
+                batch.append(q.popleft())
+        except IndexError:
+            pass
+        qh = self.queue_handler
+        if batch and qh.blocked_waiters:
+            with qh.not_full:
+                qh.not_full.notify_all()
+        return batch
+
+    def _run(self):
+        qh = self.queue_handler
+        while True:
+            batch = self._next_batch()
+            if batch:
+                self.write_batch(batch)
+                continue
+            if self._stop:
+                return
+            qh.listener_idle = True
+            # a record queued between the check above and the flag is
+            # picked up at the latest after idle_wait
+            if not qh.queue:
+                qh.wakeup.wait(self.idle_wait)
+            qh.wakeup.clear()
+            qh.listener_idle = False
+
+    def write_batch(self, records):
+        for handler in self.handlers:
+            try:
+                if isinstance(handler, logging.StreamHandler) and handler.stream is not None:
+                    self._write_stream(handler, records)
+                else:
+                    for record in records:
+                        if record.levelno >= handler.level:
+                            handler.handle(record)
+            except Exception:
+                handler.handleError(records[-1])
+        self.stats["written"] += len(records)
+        self.stats["batches"] += 1
+
+    @staticmethod
+    def _write_stream(handler, records):
+        # StreamHandler / FileHandler / rotating handlers: write every
+        # record but flush once per batch
+        rotating = isinstance(handler, logging.handlers.BaseRotatingHandler)
+        with handler.lock:
+            for record in records:
+                if record.levelno < handler.level or not handler.filter(record):
+                    continue
+                if rotating and handler.shouldRollover(record):
+                    handler.doRollover()
+                handler.stream.write(handler.format(record) + handler.terminator)
+            handler.flush()
+
+    def stop(self):
+        """Write what is queued and stop the thread.
+
+        The queue handler stays usable: later records (logging during
+        interpreter exit, say) are written synchronously.
+        """
+        if self._stop:
+            return
+        self._stop = True
+        qh = self.queue_handler
+        qh.wakeup.set()
+        if self._thread.is_alive():
+            self._thread.join()
+        with qh.not_full:
+            qh.write_direct = self.write_batch
+            qh.not_full.notify_all()
+        # records queued after the thread's last look at the queue
+        while True:
+            batch = self._next_batch()
+            if not batch:
+                break
+            self.write_batch(batch)
+        for handler in self.handlers:
+            handler.flush()
+        atexit.unregister(self.stop)
+
+
+def start_queue_logging(logger, handlers, maxsize=10_000, policy="drop_oldest",
+                        batch_size=512):
+    """Route `logger` through a queue to `handlers`; returns the listener."""
+    queue_handler = BoundedQueueHandler(maxsize, policy)
+    logger.addHandler(queue_handler)
+    return BatchQueueListener(queue_handler, handlers, batch_size).start()
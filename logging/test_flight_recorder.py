@@ -0,0 +1,32 @@
+import io
+import logging
+
+from flight_recorder import install_flight_recorder
+
+
+def _recorded_logger(name):
+    out = io.StringIO()
+    logger = logging.getLogger(name)
+    logger.setLevel(logging.DEBUG)
+    logger.propagate = False
+    logger.addHandler(logging.StreamHandler(out))
+    return logger, out, install_flight_recorder(logger, capacity=10)
+
+
+def test_history_written_before_triggering_record():
+    logger, out, _ = _recorded_logger("test_flight_recorder.order")
+    logger.debug("d1")
+    logger.info("i1")
+    logger.warning("w1")
+    logger.debug("d2")
+    logger.error("e1")
+    logger.critical("c1")
+    assert out.getvalue().splitlines() == ["d1", "i1", "w1", "d2", "e1", "c1"]
+
+
+def test_debug_alone_is_not_written():
+    logger, out, recorder = _recorded_logger("test_flight_recorder.quiet")
+    logger.debug("d1")
+    logger.info("i1")
+    assert out.getvalue() == ""
+    assert [r.getMessage() for r in recorder.history()] == ["d1", "i1"]
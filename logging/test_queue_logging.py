@@ -0,0 +1,40 @@
+import io
+import logging
+import threading
+
+from queue_logging import start_queue_logging
+
+
+def _logger(name):
+    logger = logging.getLogger(name)
+    logger.setLevel(logging.DEBUG)
+    logger.propagate = False
+    return logger
+
+
+def test_logging_after_stop_is_written():
+    out = io.StringIO()
+    logger = _logger("test_queue_logging.after_stop")
+    listener = start_queue_logging(logger, [logging.StreamHandler(out)], maxsize=4, policy="block")
+    logger.info("before")
+    listener.stop()
+    # more records than the queue holds: must neither hang nor be lost
+    for i in range(10):
+        logger.info("after %d", i)
+    lines = out.getvalue().splitlines()
+    assert lines == ["before"] + [f"after {i}" for i in range(10)]
+
+
+def test_blocked_producer_released_by_stop():
+    out = io.StringIO()
+    logger = _logger("test_queue_logging.blocked")
+    listener = start_queue_logging(logger, [logging.StreamHandler(out)], maxsize=1, policy="block")
+    threads = [threading.Thread(target=lambda k=k: [logger.info("t%d %d", k, i) for i in range(200)])
+               for k in range(4)]
+    for t in threads:
+        t.start()
+    listener.stop()
+    for t in threads:
+        t.join(5)
+        assert not t.is_alive()
+    assert len(out.getvalue().splitlines()) == 800